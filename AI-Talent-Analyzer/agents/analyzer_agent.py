@@ -1,8 +1,11 @@
 from .base_agent import BaseAgent
 
+import logging
 import re
 from dateutil import parser
 
+logger = logging.getLogger("AI_Recruiter.agents.analyzer")
+
 def extract_years_from_text(text: str) -> float:
     """
     Rule based calculation for years of experience to avoid hallucination 
@@ -22,7 +25,7 @@ def extract_years_from_text(text: str) -> float:
                 s = parser.parse(start)
                 e = parser.parse(end)
                 diff = (e.year - s.year) * 12 + (e.month - s.month)
-                print('diff: ',diff)
+                logger.debug("diff: %s", diff)
                 if 0 < diff < 600:  # sanity check
                     total_months += diff
             except:
@@ -48,7 +51,7 @@ class AnalyzerAgent(BaseAgent):
         )
 
     async def run(self, messages):
-        print("Analyzer: Analyzing candidate profile")
+        self.logger.info("Analyzer: Analyzing candidate profile")
 
         extracted_data = eval(messages[-1]["content"])
 
@@ -1,15 +1,55 @@
+import asyncio
 import json
-from openai import OpenAI
+import logging
+import os
+import threading
+import time
+import weakref
+from openai import OpenAI, AsyncOpenAI
+from utils.tracing import span
+
+# Overridable so the pipeline can run against another Ollama host or the benchmark's fake server
+OLLAMA_BASE_URL = os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434/v1")
+OLLAMA_MODEL = os.environ.get("OLLAMA_MODEL", "llama3.2")
+
+
+_clients_lock = threading.Lock()
+_sync_client = None
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_llm_client():
+    """The process-wide OpenAI client for Ollama (thread-safe, pools its connections)"""
+    global _sync_client
+    with _clients_lock:
+        if _sync_client is None:
+            _sync_client = OpenAI(base_url=OLLAMA_BASE_URL, api_key="ollama")
+        return _sync_client
+
+
+def get_async_llm_client():
+    """AsyncOpenAI's connections are tied to an event loop, so one client per running loop"""
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            client = _async_clients[loop] = AsyncOpenAI(base_url=OLLAMA_BASE_URL, api_key="ollama")
+        return client
 
 
 class BaseAgent:
     def __init__(self, name, instructions):
         self.name = name
         self.instructions = instructions
-        self.ollama_client = OpenAI(
-            base_url="http://localhost:11434/v1",
-            api_key="ollama", 
-        )
+        self.logger = logging.getLogger(f"AI_Recruiter.agents.{name.lower()}")
+
+    @property
+    def ollama_client(self):
+        return get_llm_client()
+
+    @property
+    def async_ollama_client(self):
+        return get_async_llm_client()
 
     async def run(self, messages):
         """To be overridden by child/sub-classes"""
@@ -18,20 +58,66 @@ class BaseAgent:
     def _query_ollama(self, prompt):
         """Query Ollama model with the given prompt"""
         try:
-            response = self.ollama_client.chat.completions.create(
-                model="llama3.2", 
+            # no completion cache yet, so cache_hit is always False
+            with span("llm.query", agent=self.name, model=OLLAMA_MODEL,
+                      prompt_chars=len(prompt), cache_hit=False) as s:
+                response = self.ollama_client.chat.completions.create(
+                    model=OLLAMA_MODEL, 
+                    messages=[
+                        {"role": "system", "content": self.instructions},
+                        {"role": "user", "content": prompt},
+                    ],
+                    temperature=0.7,
+                    max_tokens=2000,
+                )
+                usage = getattr(response, "usage", None)
+                s.set(
+                    prompt_tokens=getattr(usage, "prompt_tokens", None),
+                    completion_tokens=getattr(usage, "completion_tokens", None),
+                )
+                return response.choices[0].message.content
+        except Exception as e:
+            self.logger.error(f"Error querying Ollama: {str(e)}")
+            raise
+
+    async def _stream_ollama(self, prompt):
+        """Async iterator over completion tokens as Ollama generates them"""
+        try:
+            stream = await self.async_ollama_client.chat.completions.create(
+                model=OLLAMA_MODEL,
                 messages=[
                     {"role": "system", "content": self.instructions},
                     {"role": "user", "content": prompt},
                 ],
                 temperature=0.7,
                 max_tokens=2000,
+                stream=True,
             )
-            return response.choices[0].message.content
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                token = chunk.choices[0].delta.content
+                if token:
+                    yield token
         except Exception as e:
-            print(f"Error querying Ollama: {str(e)}")
+            self.logger.error(f"Error streaming from Ollama: {str(e)}")
             raise
 
+    async def _query_ollama_streaming(self, prompt, on_token):
+        """Stream the completion to on_token(token) and return the full text"""
+        parts = []
+        with span("llm.stream", agent=self.name, model=OLLAMA_MODEL,
+                  prompt_chars=len(prompt), cache_hit=False) as s:
+            started = time.perf_counter()
+            async for token in self._stream_ollama(prompt):
+                if not parts:
+                    s.set(first_token_ms=round((time.perf_counter() - started) * 1000, 3))
+                parts.append(token)
+                on_token(token)
+            # streamed chunks carry no usage block; each chunk is roughly one token
+            s.set(completion_tokens=len(parts))
+        return "".join(parts)
+
     def _parse_json_safely(self, text):
         """Safely parse JSON"""
         try:
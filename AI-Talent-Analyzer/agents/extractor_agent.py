@@ -1,7 +1,9 @@
+import os
 import re
 import json
 from pdfminer.high_level import extract_text
 from .base_agent import BaseAgent
+from utils.tracing import span
 
 
 class ExtractorAgent(BaseAgent):
@@ -44,7 +46,7 @@ class ExtractorAgent(BaseAgent):
     async def run(self, messages):
         """process a resume and extract info"""
 
-        print("Extractor: Processing Resume")
+        self.logger.info("Extractor: Processing Resume")
 
         resume_data = messages[-1]["content"]
 
@@ -52,7 +54,9 @@ class ExtractorAgent(BaseAgent):
             resume_data = json.loads(resume_data)
 
         if resume_data.get("file_path"):
-            raw_text = extract_text(resume_data["file_path"])
+            with span("pdf.extract", file=os.path.basename(resume_data["file_path"])) as s:
+                raw_text = extract_text(resume_data["file_path"])
+                s.set(chars=len(raw_text))
         else:
             raw_text = resume_data.get("text", "")
 
@@ -1,13 +1,24 @@
 import json
 import re
 import sqlite3
-from difflib import SequenceMatcher
+import numpy as np
 from .base_agent import BaseAgent
+from db.candidate_index import CandidateIndex, fuzzy_similarity, normalize_level
 from db.database import JobDatabase
+from db.results_store import ResultsStore
+from utils.tracing import span
+
+
+# hybrid scores below this are not reported as matches
+MIN_MATCH_SCORE = 40
 
 
 class MatcherAgent(BaseAgent):
-    def __init__(self):
+    def __init__(self, db=None, catalog=None, candidate_index=None):
+        """
+        catalog: optional JobCatalog snapshot of db that search_jobs reads instead of SQL
+        candidate_index: CandidateIndex to rank stored candidates with (built lazily when omitted)
+        """
         super().__init__(
             name="Matcher",
             instructions="""Match candidate profiles with job positions.
@@ -17,7 +28,9 @@ class MatcherAgent(BaseAgent):
             - keyword overlap
             Return detailed match scores with reasons."""
         )
-        self.db = JobDatabase()
+        self.db = db or JobDatabase()
+        self.catalog = catalog
+        self._candidate_index = candidate_index
 
     def extract_json_block(self, text):
         """Extract first valid JSON dict/list from messy LLM output."""
@@ -90,7 +103,7 @@ class MatcherAgent(BaseAgent):
 
     # Fuzzy Similarity
     def fuzzy_similarity(self, a, b):
-        return SequenceMatcher(None, a.lower(), b.lower()).ratio()
+        return fuzzy_similarity(a, b)
 
     # Hybrid Score
     def hybrid_score(self, llm_func, candidate_skills, job_requirements):
@@ -131,18 +144,18 @@ class MatcherAgent(BaseAgent):
         return final_score, int(llm_norm * 100), int(fuzzy_norm * 100), llm_reason
 
     async def run(self, messages):
-        print("Matcher: Matching Resume with available jobs")
+        self.logger.info("Matcher: Matching Resume with available jobs")
         raw = messages[-1].get("content", "{}")
 
         try:
             data = self._parse_json_safely(raw)
         except:
-            print("Could not parse input to matcher")
+            self.logger.warning("Could not parse input to matcher")
             return {"matched_jobs": []}
 
         skills_analysis = data.get("skills_analysis")
         if not skills_analysis:
-            print("No skills_analysis found.")
+            self.logger.warning("No skills_analysis found.")
             return {"matched_jobs": []}
 
         # Normalize skills
@@ -156,9 +169,11 @@ class MatcherAgent(BaseAgent):
         level = (raw_level or "Mid-level")
         level = str(level).strip().capitalize()
 
-        jobs = self.search_jobs(candidate_skills, level)
-        print("The experience level is: ")
-        print(skills_analysis.get("experience_level", "No level found, going to look for mid level jobs"))
+        jobs, level_filter = self._search_jobs(candidate_skills, level)
+        self.logger.info(
+            "The experience level is: %s",
+            skills_analysis.get("experience_level", "No level found, going to look for mid level jobs"),
+        )
 
         all_matches = []
 
@@ -169,37 +184,43 @@ class MatcherAgent(BaseAgent):
                 self._query_ollama, candidate_skills, reqs
             )
 
-            if final_score >= 40:
-                all_matches.append({
-                    "title": job["title"],
-                    "company": job["company"],
-                    "match_score": final_score,
-                    "llm_score": llm_s,
-                    "fuzzy_score": fuzzy_s,
-                    "reason": reason,
-                    "location": job["location"],
-                    "requirements": job["requirements"]
-                })
+            if final_score >= MIN_MATCH_SCORE:
+                all_matches.append(self._match_entry(job, final_score, llm_s, fuzzy_s, reason))
 
         all_matches.sort(key=lambda x: x["match_score"], reverse=True)
 
         return {
             "matched_jobs": all_matches,
-            "count": len(all_matches)
+            "count": len(all_matches),
+            # the level search_jobs actually filtered on (None: the no-level fallback);
+            # rematch_jobs pairs new jobs with this candidate the same way
+            "level_filter": level_filter,
+        }
+
+    def _match_entry(self, job, final_score, llm_s, fuzzy_s, reason):
+        return {
+            "job_id": job["id"],
+            "title": job["title"],
+            "company": job["company"],
+            "match_score": final_score,
+            "llm_score": llm_s,
+            "fuzzy_score": fuzzy_s,
+            "reason": reason,
+            "location": job["location"],
+            "requirements": job["requirements"]
         }
 
     def search_jobs(self, skills, experience_level):
-        lvl = (experience_level or "").strip().lower()
-        if "junior" in lvl:
-            lvl_norm = "Junior"
-        elif "mid" in lvl:
-            lvl_norm = "Mid-level"
-        elif "senior" in lvl:
-            lvl_norm = "Senior"
-        else:
-            lvl_norm = None
+        return self._search_jobs(skills, experience_level)[0]
+
+    def _search_jobs(self, skills, experience_level):
+        """(jobs, level filter used), None when it fell back to every level"""
+        lvl_norm = normalize_level(experience_level)
 
         def run_query(with_level):
+            if self.catalog is not None:
+                return self.catalog.search(skills, lvl_norm if with_level else None)
+
             base = "SELECT * FROM jobs"
             params = []
             where = []
@@ -219,11 +240,13 @@ class MatcherAgent(BaseAgent):
             if where:
                 base += " WHERE " + " AND ".join(where)
 
-            with sqlite3.connect(self.db.db_path) as conn:
+            with span("db.query", op="search_jobs", with_level=bool(with_level and lvl_norm),
+                      skills=len(skills)) as s, sqlite3.connect(self.db.db_path) as conn:
                 conn.row_factory = sqlite3.Row
                 cur = conn.cursor()
                 cur.execute(base, params)
                 rows = cur.fetchall()
+                s.set(rows=len(rows))
 
             return [
                 {
@@ -241,9 +264,114 @@ class MatcherAgent(BaseAgent):
                 for row in rows
             ]
 
-        jobs = run_query(with_level=bool(lvl_norm))
+        if not lvl_norm:
+            return run_query(with_level=False), None
+
+        jobs = run_query(with_level=True)
         if jobs:
-            return jobs
+            return jobs, lvl_norm
+
+        self.logger.info("No jobs found with level filter. Retrying without level...")
+        return run_query(with_level=False), None
 
-        print("No jobs found with level filter. Retrying without level...")
-        return run_query(with_level=False)
+    @property
+    def candidate_index(self):
+        if self._candidate_index is None:
+            self._candidate_index = CandidateIndex(ResultsStore())
+        return self._candidate_index
+
+    def rank_candidates_for_job(self, job_id, k=10, shortlist=None, use_llm=True):
+        """
+        Rank previously analyzed candidates against one job, without re-running
+        extraction or analysis. Cascade: fuzzy + keyword scores for every indexed
+        candidate, then the LLM score (as in hybrid_score) only for the best
+        `shortlist` (default 3k) of them.
+        """
+
+        job = self.db.get_job(job_id)
+        if job is None:
+            raise ValueError(f"Unknown job id: {job_id}")
+        index = self.candidate_index
+        index.refresh()
+
+        reqs = [r.lower() for r in job["requirements"]]
+        rows, fuzzy, keyword = index.prescore(reqs, job["experience_level"])
+        if len(rows) == 0:
+            return []
+
+        # stage 1: rank on the cheap signals; the LLM term (80% of the score) is added below
+        cheap = 0.10 * fuzzy + 0.10 * keyword
+        shortlist = len(rows) if not use_llm else min(len(rows), shortlist or 3 * k)
+        top = np.argsort(-cheap, kind="stable")[:shortlist]
+
+        ranked = []
+        for i in top:
+            llm_norm, reason = self._llm_norm(index.skills_of(rows[i]), reqs) if use_llm else (0.0, None)
+            final_norm = 0.80 * llm_norm + cheap[i]
+            ranked.append({
+                "analysis_id": index.analysis_ids[rows[i]],
+                "match_score": int(final_norm * 100),
+                "llm_score": int(llm_norm * 100) if use_llm else None,
+                "fuzzy_score": int(fuzzy[i] * 100),
+                "keyword_score": int(keyword[i] * 100),
+                "reason": reason,
+            })
+
+        ranked.sort(key=lambda x: x["match_score"], reverse=True)
+        return ranked[:k]
+
+    def _llm_norm(self, candidate_skills, reqs):
+        """hybrid_score's LLM term, 0-1"""
+        raw_llm_score, reason = self.llm_match_score(self._query_ollama, candidate_skills, reqs)
+        llm_norm = raw_llm_score / 100.0 if raw_llm_score > 1 else raw_llm_score
+        return max(0.0, min(llm_norm, 1.0)), reason
+
+    def rematch_jobs(self, changes, use_llm=True):
+        """
+        Bring stored matches up to date with catalog changes ({job_id: "insert" |
+        "update" | "delete"}, see JobDatabase.changes_since). Only the affected
+        candidate-job pairs are touched: deleted and updated jobs are dropped from the
+        analyses that matched them, and inserted/updated jobs are scored with
+        hybrid_score against the latest analysis of each candidate whose original
+        search_jobs call would have returned them: same level filter, or any level for
+        candidates whose search fell back to every level (see CandidateIndex.match_levels).
+        A fallback candidate stays "any level" even if a new job at their own level
+        would now end the fallback, so it can also gain matches at other levels that a
+        full re-run would skip. Returns counters for the run.
+        """
+
+        index = self.candidate_index
+        index.refresh()
+        store = index.store
+        stats = {"jobs": len(changes), "pairs_scored": 0, "llm_calls": 0, "matches_added": 0,
+                 "matches_removed": 0, "analyses_updated": 0}
+
+        # analysis_id -> (job ids to drop, new match entries)
+        deltas = {}
+        for analysis_id, job_ids in store.analyses_matching_jobs(changes).items():
+            deltas.setdefault(analysis_id, (set(), []))[0].update(job_ids)
+            stats["matches_removed"] += len(job_ids)
+
+        for job_id, op in changes.items():
+            if op == "delete":
+                continue
+            job = self.db.get_job(job_id)
+            if job is None:
+                continue
+            reqs = [r.lower() for r in job["requirements"]]
+            rows, fuzzy, keyword = index.prescore(reqs, job["experience_level"], strict_level=True)
+            for row, fuzzy_norm, keyword_norm in zip(rows, fuzzy, keyword):
+                llm_norm, reason = self._llm_norm(index.skills_of(row), reqs) if use_llm else (0.0, None)
+                stats["pairs_scored"] += 1
+                stats["llm_calls"] += int(use_llm)
+                final_score = int((0.80 * llm_norm + 0.10 * fuzzy_norm + 0.10 * keyword_norm) * 100)
+                if final_score < MIN_MATCH_SCORE:
+                    continue
+                entry = self._match_entry(job, final_score, int(llm_norm * 100), int(fuzzy_norm * 100), reason)
+                deltas.setdefault(index.analysis_ids[row], (set(), []))[1].append(entry)
+                stats["matches_added"] += 1
+
+        for analysis_id, (removed, upserts) in deltas.items():
+            if store.apply_match_delta(analysis_id, removed, upserts):
+                stats["analyses_updated"] += 1
+        return stats
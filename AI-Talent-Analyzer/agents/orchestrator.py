@@ -6,11 +6,18 @@ from .screener_agent import ScreenerAgent
 from .recommender_agent import RecommenderAgent
 import streamlit as st
 import json
+import os
+from functools import partial
+from utils.tracing import span, start_trace
 
 status = st.empty()
 
 class OrchestratorAgent(BaseAgent):
-    def __init__(self, status_box, progress_bar):
+    def __init__(self, status_box, progress_bar, on_token=None, agents=None):
+        """
+        on_token(stage, token), if given, receives streamed LLM output per stage
+        agents: dict of ready stage agents to reuse (see agents.registry); built fresh when omitted
+        """
         super().__init__(
             name="Orchestrator",
             instructions="""Coordinate the recruitment workflow and delegate tasks to specialized agents.
@@ -19,92 +26,114 @@ class OrchestratorAgent(BaseAgent):
         )
         self.status_box = status_box
         self.progress_bar = progress_bar
-        self._setup_agents()
+        self.on_token = on_token
+        self._setup_agents(agents)
 
-    def _setup_agents(self):
+    def _setup_agents(self, agents=None):
+        if agents is not None:
+            for name in ("extractor", "analyzer", "matcher", "screener", "recommender"):
+                setattr(self, name, agents[name])
+            return
         self.extractor = ExtractorAgent()
         self.analyzer = AnalyzerAgent()
         self.matcher = MatcherAgent()
         self.screener = ScreenerAgent()
         self.recommender = RecommenderAgent()
 
+    def _stage_stream(self, stage):
+        if self.on_token is None:
+            return None
+        return partial(self.on_token, stage)
+
     async def run(self, messages):
         prompt = messages[-1]["content"]
         response = self._query_ollama(prompt)
         return self._parse_json_safely(response)
 
     async def process_application(self, resume_data):
-        print("Orchestrator: Starting application process")
+        self.logger.info("Orchestrator: Starting application process")
 
         workflow_context = {
             "resume_data": resume_data,
             "status": "initiated",
             "current_stage": "extraction",
         }
+        source = os.path.basename(resume_data.get("file_path") or "") or "text"
 
-        try:
-            self.status_box.write("Processing...")
-            self.progress_bar.progress(10)
-            # Extract resume information
-            extracted_data = await self.extractor.run(
-                [{"role": "user", "content": json.dumps(resume_data)}]
-            )
-            workflow_context.update(
-                {"extracted_data": extracted_data, "current_stage": "analysis"}
-            )
-            print("Extractor completed")
-            self.status_box.write("Extractor Completed. Starting Analyzer...")
-            self.progress_bar.progress(20)
+        with start_trace("process_application", source=source) as trace:
+            try:
+                self.status_box.write("Processing...")
+                self.progress_bar.progress(10)
+                # Extract resume information
+                with span("stage.extraction"):
+                    extracted_data = await self.extractor.run(
+                        [{"role": "user", "content": json.dumps(resume_data)}]
+                    )
+                workflow_context.update(
+                    {"extracted_data": extracted_data, "current_stage": "analysis"}
+                )
+                self.logger.info("Extractor completed")
+                self.status_box.write("Extractor Completed. Starting Analyzer...")
+                self.progress_bar.progress(20)
 
-            # Analyze candidate profile
-            analysis_results = await self.analyzer.run(
-                [{"role": "user", "content": json.dumps(extracted_data)}]
-            )
-            workflow_context.update(
-                {"analysis_results": analysis_results, "current_stage": "matching"}
-            )
-            print("Analyzer completed")
-            self.status_box.write("Analyzer completed. Starting Matcher...")
-            self.progress_bar.progress(40)
+                # Analyze candidate profile
+                with span("stage.analysis"):
+                    analysis_results = await self.analyzer.run(
+                        [{"role": "user", "content": json.dumps(extracted_data)}]
+                    )
+                workflow_context.update(
+                    {"analysis_results": analysis_results, "current_stage": "matching"}
+                )
+                self.logger.info("Analyzer completed")
+                self.status_box.write("Analyzer completed. Starting Matcher...")
+                self.progress_bar.progress(40)
 
-            # Match with jobs
-            job_matches = await self.matcher.run(
-                [{"role": "user", "content": json.dumps(analysis_results)}]
-            )
-            workflow_context.update(
-                {"job_matches": job_matches, "current_stage": "screening"}
-            )
-            print("Matcher completed")
-            self.status_box.write("Matcher completed. Started Screener...")
-            self.progress_bar.progress(60)
+                # Match with jobs
+                with span("stage.matching"):
+                    job_matches = await self.matcher.run(
+                        [{"role": "user", "content": json.dumps(analysis_results)}]
+                    )
+                workflow_context.update(
+                    {"job_matches": job_matches, "current_stage": "screening"}
+                )
+                self.logger.info("Matcher completed")
+                self.status_box.write("Matcher completed. Started Screener...")
+                self.progress_bar.progress(60)
 
-            # Screen candidate
-            screening_results = await self.screener.run(
-                [{"role": "user", "content": json.dumps(workflow_context)}]
-            )
-            workflow_context.update(
-                {
-                    "screening_results": screening_results,
-                    "current_stage": "recommendation",
-                }
-            )
-            print("Screener completed")
-            self.status_box.write("Screener completed. Started Recommender...")
-            self.progress_bar.progress(80)
+                # Screen candidate
+                with span("stage.screening"):
+                    screening_results = await self.screener.run(
+                        [{"role": "user", "content": json.dumps(workflow_context)}],
+                        on_token=self._stage_stream("screening"),
+                    )
+                workflow_context.update(
+                    {
+                        "screening_results": screening_results,
+                        "current_stage": "recommendation",
+                    }
+                )
+                self.logger.info("Screener completed")
+                self.status_box.write("Screener completed. Started Recommender...")
+                self.progress_bar.progress(80)
 
-            # Generate recommendations
-            final_recommendation = await self.recommender.run(
-                [{"role": "user", "content": json.dumps(workflow_context)}]
-            )
-            workflow_context.update(
-                {"final_recommendation": final_recommendation, "status": "completed"}
-            )
-            print("Recommender completed")
-            self.status_box.write("Recommender completed. Generating report...")
-            self.progress_bar.progress(95)
+                # Generate recommendations
+                with span("stage.recommendation"):
+                    final_recommendation = await self.recommender.run(
+                        [{"role": "user", "content": json.dumps(workflow_context)}],
+                        on_token=self._stage_stream("recommendation"),
+                    )
+                workflow_context.update(
+                    {"final_recommendation": final_recommendation, "status": "completed"}
+                )
+                self.logger.info("Recommender completed")
+                self.status_box.write("Recommender completed. Generating report...")
+                self.progress_bar.progress(95)
 
-            return workflow_context
+                return workflow_context
 
-        except Exception as e:
-            workflow_context.update({"status": "failed", "error": str(e)})
-            raise
\ No newline at end of file
+            except Exception as e:
+                workflow_context.update({"status": "failed", "error": str(e)})
+                raise
+            finally:
+                workflow_context["trace"] = {"trace_id": trace.trace_id, "stages": trace.summary()}
+                self.logger.info("Pipeline trace for %s\n%s", source, trace.format_summary())
@@ -1,8 +1,11 @@
+import json
+
 from .base_agent import BaseAgent
+from utils.prompt_context import ContextCompactor, DEFAULT_TOKEN_BUDGET, format_prompt_stats
 
 
 class RecommenderAgent(BaseAgent):
-    def __init__(self):
+    def __init__(self, prompt_token_budget=DEFAULT_TOKEN_BUDGET):
         super().__init__(
             name="Recommender",
             instructions="""
@@ -23,11 +26,17 @@ class RecommenderAgent(BaseAgent):
             """
 
         )
+        self.compactor = ContextCompactor(token_budget=prompt_token_budget)
 
-    async def run(self, messages):
-        print("Recommender: Generating final recommendations")
+    async def run(self, messages, on_token=None):
+        """on_token(token), if given, receives the recommendation as it streams"""
+        self.logger.info("Recommender: Generating final recommendations")
 
-        workflow_context = eval(messages[-1]["content"])
+        raw = messages[-1]["content"]
+        try:
+            workflow_context = json.loads(raw)
+        except ValueError:
+            workflow_context = eval(raw)
 
         skills_conf = workflow_context["analysis_results"]["confidence_score"]  # 0-1
         best_job_match = max(
@@ -43,7 +52,7 @@ class RecommenderAgent(BaseAgent):
             (screening_score * 0.2)         
         )
         final_confidence = round(final_confidence, 2)
-        print(final_confidence)
+        self.logger.debug("final confidence: %s", final_confidence)
 
         if final_confidence >= 85:
             confidence_label = "high"
@@ -52,11 +61,19 @@ class RecommenderAgent(BaseAgent):
         else:
             confidence_label = "low"
 
-        recommendation = self._query_ollama(str(workflow_context))
+        prompt, prompt_stats = self.compactor.render(
+            workflow_context, original=str(workflow_context)
+        )
+        self.logger.info(f"Recommender: {format_prompt_stats(prompt_stats)}")
+        if on_token is None:
+            recommendation = self._query_ollama(prompt)
+        else:
+            recommendation = await self._query_ollama_streaming(prompt, on_token)
 
         return {
             "final_recommendation": recommendation,
             "recommendation_timestamp": "2025-03-14",
             "confidence_level": confidence_label,
-            "confidence_score": final_confidence
+            "confidence_score": final_confidence,
+            "prompt_stats": prompt_stats,
         }
@@ -0,0 +1,107 @@
+import logging
+import os
+import threading
+import time
+
+from db.candidate_index import CandidateIndex
+from db.database import JobDatabase
+from db.job_catalog import JobCatalog
+from db.results_store import ResultsStore
+from utils.role_profiles import load_role_resolver
+
+from .analyzer_agent import AnalyzerAgent
+from .base_agent import get_llm_client
+from .extractor_agent import ExtractorAgent
+from .matcher_agent import MatcherAgent
+from .orchestrator import OrchestratorAgent
+from .recommender_agent import RecommenderAgent
+from .screener_agent import ScreenerAgent
+
+logger = logging.getLogger("AI_Recruiter.registry")
+
+
+class AgentRegistry:
+    """
+    Process-wide set of warm, stateless stage agents and the resources they share
+    (LLM client, job DB, job catalog snapshot, candidate skill index).
+
+    The agents keep no per-request state, so every job reuses the same instances;
+    only the OrchestratorAgent, which holds the job's progress sinks, is built per
+    request, and that is cheap.
+    """
+
+    def __init__(self):
+        self._agents = None
+        self._lock = threading.Lock()
+
+    def agents(self):
+        """The shared stage agents, built on first use"""
+        if self._agents is None:
+            with self._lock:
+                if self._agents is None:
+                    db = JobDatabase()
+                    matcher = MatcherAgent(
+                        db=db, catalog=JobCatalog(db), candidate_index=CandidateIndex(ResultsStore())
+                    )
+                    self._agents = {
+                        "extractor": ExtractorAgent(),
+                        "analyzer": AnalyzerAgent(),
+                        "matcher": matcher,
+                        "screener": ScreenerAgent(),
+                        "recommender": RecommenderAgent(),
+                    }
+        return self._agents
+
+    @property
+    def matcher(self):
+        return self.agents()["matcher"]
+
+    def orchestrator(self, status_box, progress_bar, on_token=None):
+        return OrchestratorAgent(status_box, progress_bar, on_token=on_token, agents=self.agents())
+
+    def warm_up(self, ping_llm=None):
+        """
+        Build everything a request needs before the first one arrives; returns the
+        time each step took (ms). ping_llm (default $WARM_UP_PING_LLM) also opens
+        the first connection to the LLM server; a failed ping is only logged.
+        """
+        if ping_llm is None:
+            ping_llm = os.getenv("WARM_UP_PING_LLM", "1") != "0"
+
+        timings = {}
+
+        def step(name, fn):
+            start = time.perf_counter()
+            fn()
+            timings[name] = round((time.perf_counter() - start) * 1000, 1)
+
+        step("llm_client", get_llm_client)
+        step("role_profiles", load_role_resolver)
+        step("agents", self.agents)
+        step("job_catalog", self.matcher.catalog.refresh)
+        step("candidate_index", self.matcher.candidate_index.refresh)
+        if ping_llm:
+            try:
+                step("llm_ping", lambda: get_llm_client().models.list())
+            except Exception as e:
+                logger.warning(f"LLM server not reachable during warm-up: {str(e)}")
+
+        logger.info(
+            f"Warm-up done: {len(self.matcher.catalog)} jobs, "
+            f"{len(self.matcher.candidate_index)} indexed candidates, "
+            + ", ".join(f"{k} {v} ms" for k, v in timings.items())
+        )
+        return timings
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """The AgentRegistry of this process"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = AgentRegistry()
+        return _registry
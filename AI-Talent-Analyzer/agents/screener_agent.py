@@ -1,9 +1,85 @@
 from .base_agent import BaseAgent
+from utils.role_profiles import load_role_resolver, NEUTRAL_ROLE_SCORE
+from utils.prompt_context import ContextCompactor, DEFAULT_TOKEN_BUDGET, format_prompt_stats
 import json
+import numpy as np
+
+SCREENER_WEIGHTS = {
+    "best_match": 0.30,
+    "analyzer_confidence": 0.25,
+    "education": 0.15,
+    "experience": 0.10,
+    "role": 0.20,
+}
+
+# education level -> score (0: unknown, 1: bachelor, 2: master/phd)
+EDUCATION_LEVEL_SCORES = np.array([80, 80, 100])
+
+
+def education_level(edu):
+    """Education level code for the screener; the last degree listed wins"""
+    level = 0
+    if isinstance(edu, list) and edu:
+        for e in edu:
+            deg = str(e.get("degree", "")).lower()
+            if any(k in deg for k in ["phd", "master"]):
+                level = 2
+            elif "bachelor" in deg:
+                level = 1
+    return level
+
+
+def compute_screener_scores(best_match, analyzer_confidence, education_levels, years,
+                            role_must_ratio, role_good_ratio, weights=None):
+    """
+    Vectorized screener scoring for N candidates.
+
+    Every argument is a length-N array-like. Role hit ratios are NaN for candidates
+    whose role did not resolve to a profile (they get the neutral role score).
+    Returns a dict of length-N NumPy arrays.
+    """
+    w = {**SCREENER_WEIGHTS, **(weights or {})}
+
+    best_match = np.asarray(best_match, dtype=np.float64)
+    analyzer_conf = np.asarray(analyzer_confidence, dtype=np.float64)
+    levels = np.clip(np.asarray(education_levels, dtype=np.int64), 0, 2)
+    years = np.nan_to_num(np.asarray(years, dtype=np.float64))
+    must_ratio = np.asarray(role_must_ratio, dtype=np.float64)
+    good_ratio = np.asarray(role_good_ratio, dtype=np.float64)
+
+    # a. experience fit score (0-100)
+    exp_fit = np.where(years >= 3, 100, np.where(years >= 1, 60, 30))
+
+    # b. education score (0-100)
+    education_score = EDUCATION_LEVEL_SCORES[levels]
+
+    # c. Role relevance (0-100)
+    role_score = np.where(
+        np.isnan(must_ratio),
+        NEUTRAL_ROLE_SCORE,
+        np.round(np.nan_to_num(must_ratio) * 70 + np.nan_to_num(good_ratio) * 30, 2),
+    )
+
+    # weighted score
+    final_score = (
+        best_match * w["best_match"] +
+        analyzer_conf * 100 * w["analyzer_confidence"] +
+        education_score * w["education"] +
+        exp_fit * w["experience"] +
+        role_score * w["role"]
+    )
+
+    return {
+        "final_score": np.round(final_score, 2),
+        "experience_fit": exp_fit,
+        "education_score": education_score,
+        "role_score": role_score,
+        "analyzer_confidence": np.round(analyzer_conf * 100, 2),
+    }
 
 
 class ScreenerAgent(BaseAgent):
-    def __init__(self):
+    def __init__(self, prompt_token_budget=DEFAULT_TOKEN_BUDGET):
         super().__init__(
             name="Screener",
             instructions="""Screen candidates based on:
@@ -15,60 +91,16 @@ class ScreenerAgent(BaseAgent):
                 Provide comprehensive screening reports.
             """,
         )
+        self.role_resolver = load_role_resolver()
+        self.weights = dict(SCREENER_WEIGHTS)
+        self.compactor = ContextCompactor(token_budget=prompt_token_budget)
 
     def compute_role_specific_score(self, role, skills):
+        """Role relevance (0-100) for a job title, resolved against the role profiles"""
+        return self.role_resolver.score(role, skills)
 
-        role = (role or "").lower()
-        s = set([x.lower() for x in skills])
-
-        ROLE_TABLE = {
-            "robotics": {
-                "must": ["c++", "ros", "ros2", "linux", "opencv", "robotics", "slam"],
-                "good": ["pytorch", "kalman", "ekf", "pid", "motion planning"],
-            },
-            "machine learning": {
-                "must": ["python", "pytorch", "tensorflow", "machine learning"],
-                "good": ["huggingface", "mlops", "docker", "aws"],
-            },
-            "cv engineer": {
-                "must": ["opencv", "pytorch", "computer vision", "image processing"],
-                "good": ["yolo", "segmentation", "detection"],
-            },
-            "nlp": {
-                "must": ["nlp", "transformers", "huggingface", "python"],
-                "good": ["lora", "openai api"],
-            },
-            "backend": {
-                "must": ["python", "sql", "docker", "rest", "apis"],
-                "good": ["aws", "redis", "kafka"],
-            },
-            "embedded": {
-                "must": ["c", "c++", "embedded", "linux", "microcontroller"],
-                "good": ["uart", "spi", "i2c", "rtos"],
-            },
-            "devops": {
-                "must": ["docker", "kubernetes", "linux", "ci/cd"],
-                "good": ["aws", "terraform"],
-            },
-        }
-
-        # No role mapped -> neutral score
-        if role not in ROLE_TABLE:
-            return 60.0
-
-        must = ROLE_TABLE[role]["must"]
-        good = ROLE_TABLE[role]["good"]
-
-        must_hits = sum(1 for m in must if m in s)
-        good_hits = sum(1 for g in good if g in s)
-
-        must_score = (must_hits / len(must)) * 70
-        good_score = (good_hits / len(must)) * 30
-
-        return round(must_score + good_score, 2)
-
-    def compute_screener_score(self, context):
-        """Computes all scores and returns final screener summary"""
+    def extract_screening_features(self, context):
+        """Pull the per-candidate screening features out of a workflow context"""
 
         analysis = context.get("analysis_results", {})
         if isinstance(analysis, str):
@@ -76,68 +108,78 @@ class ScreenerAgent(BaseAgent):
                 analysis = json.loads(analysis)
             except:
                 analysis = {}
-                print("No analysis result extracted")
+                self.logger.warning("No analysis result extracted")
 
         skills_analysis = analysis.get("skills_analysis", {})
         skills = skills_analysis.get("technical_skills", [])
-        years = skills_analysis.get("years_of_experience", 0)
         edu = skills_analysis.get("education", [])
-        exp_level = skills_analysis.get("experience_level", "Mid-level")
         analyzer_conf = analysis.get("confidence_score", 0)
 
         job_matches = context.get("job_matches", {}).get("matched_jobs", [])
         best_match = job_matches[0]["match_score"] if job_matches else 0
         role = job_matches[0]["title"] if job_matches else "general"
 
-        # a. experience fit score (0-100)
-        years = None
-        try:
-            years = context["analysis_results"]["skills_analysis"].get("years_of_experience")
-        except:
-            years = None
-
+        years = skills_analysis.get("years_of_experience")
         # normalize to convert None or invalid types to 0
         if not isinstance(years, (int, float)):
             years = 0
 
-        exp_fit = 100 if years >= 3 else (60 if years >= 1 else 30)
-
-        # b. education score (0-100)
-        education_score = 80
-        if isinstance(edu, list) and edu:
-            for e in edu:
-                deg = str(e.get("degree", "")).lower()
-                if any(k in deg for k in ["phd", "master"]):
-                    education_score = 100
-                elif "bachelor" in deg:
-                    education_score = 80
-
-        # c. Role relevance (0-100)
-        role_score = self.compute_role_specific_score(role, skills)
-
-        # weighted score
-        final_score = (
-            best_match * 0.30 +
-            analyzer_conf * 100 * 0.25 +
-            education_score * 0.15 +
-            exp_fit * 0.10 +
-            role_score * 0.20
+        must_ratio, good_ratio = self.role_resolver.hit_ratios(role, skills)
+
+        return {
+            "best_match": best_match,
+            "analyzer_confidence": analyzer_conf,
+            "education_level": education_level(edu),
+            "years": years,
+            "role_must_ratio": must_ratio,
+            "role_good_ratio": good_ratio,
+            "computed_role": role,
+        }
+
+    def compute_screener_scores(self, best_match, analyzer_confidence, education_levels,
+                                years, role_must_ratio, role_good_ratio):
+        """Columnar screening of N candidates with this agent's weights"""
+        return compute_screener_scores(
+            best_match, analyzer_confidence, education_levels, years,
+            role_must_ratio, role_good_ratio, weights=self.weights,
         )
 
-        final_score = round(final_score, 2)
+    def compute_screener_score(self, context):
+        """Computes all scores and returns final screener summary"""
+
+        features = self.extract_screening_features(context)
+        scores = self.compute_screener_scores(
+            [features["best_match"]],
+            [features["analyzer_confidence"]],
+            [features["education_level"]],
+            [features["years"]],
+            [features["role_must_ratio"]],
+            [features["role_good_ratio"]],
+        )
 
         return {
-            "final_score": final_score,
-            "experience_fit": exp_fit,
-            "education_score": education_score,
-            "role_score": role_score,
-            "analyzer_confidence": round(analyzer_conf * 100, 2),
-            "best_job_match": best_match,
-            "computed_role": role,
+            "final_score": scores["final_score"][0].item(),
+            "experience_fit": scores["experience_fit"][0].item(),
+            "education_score": scores["education_score"][0].item(),
+            "role_score": scores["role_score"][0].item(),
+            "analyzer_confidence": scores["analyzer_confidence"][0].item(),
+            "best_job_match": features["best_match"],
+            "computed_role": features["computed_role"],
         }
     
     # llm summary
-    def generate_llm_summary(self, context, role):
+    def build_summary_prompt(self, context, role, score_blob=None):
+        return self.build_summary_prompt_with_stats(context, role, score_blob)[0]
+
+    def build_summary_prompt_with_stats(self, context, role, score_blob=None):
+        """(prompt, compaction stats); no per-request state is kept on the agent, so one instance can serve concurrent jobs"""
+        if score_blob is not None:
+            context = {**context, "screening_results": {"screening_score": score_blob}}
+        candidate_digest, stats = self.compactor.render(
+            context, original=json.dumps(context, indent=2)
+        )
+        self.logger.info(f"Screener: {format_prompt_stats(stats)}")
+
         summary_prompt = f"""
             You are a senior recruiter.
 
@@ -146,7 +188,7 @@ class ScreenerAgent(BaseAgent):
             ROLE: {role}
 
             Candidate context:
-            {json.dumps(context, indent=2)}
+            {candidate_digest}
 
             Write:
             - 3-5 strengths
@@ -156,10 +198,14 @@ class ScreenerAgent(BaseAgent):
             No JSON. Just clean text.
         """
 
-        return self._query_ollama(summary_prompt)
+        return summary_prompt, stats
+
+    def generate_llm_summary(self, context, role, score_blob=None):
+        return self._query_ollama(self.build_summary_prompt(context, role, score_blob))
 
-    async def run(self, messages):
-        print("👥 Screener: Conducting initial screening")
+    async def run(self, messages, on_token=None):
+        """on_token(token), if given, receives the LLM summary as it streams"""
+        self.logger.info("👥 Screener: Conducting initial screening")
 
         raw = messages[-1]["content"]
 
@@ -171,11 +217,16 @@ class ScreenerAgent(BaseAgent):
         score_blob = self.compute_screener_score(context)
 
         role = score_blob.get("computed_role", "general")
-        llm_summary = self.generate_llm_summary(context, role)
+        prompt, prompt_stats = self.build_summary_prompt_with_stats(context, role, score_blob)
+        if on_token is None:
+            llm_summary = self._query_ollama(prompt)
+        else:
+            llm_summary = await self._query_ollama_streaming(prompt, on_token)
 
         return {
             # "screening_report": llm_summary,    
             "screening_score": score_blob,
             "screening_summary": llm_summary,
+            "prompt_stats": prompt_stats,
             "screening_timestamp": "2024-03-14",
         }
@@ -0,0 +1,213 @@
+"""
+HTTP API for the analyzer pipeline (ASGI, Starlette):
+
+    uvicorn api:app --host 0.0.0.0 --port 8000
+
+    POST /resumes                      multipart "file" (PDF) or JSON {"text": ...} -> 202 {"id", ...}
+    GET  /resumes/{id}                 status, progress and streamed stage output
+    GET  /resumes/{id}/result          the finished result (202 while pending)
+    GET  /analyses/{analysis_id}       a stored result, after the in-memory job is gone
+    GET  /search-jobs?skills=a,b&level=Senior&limit=20
+    GET  /health
+
+Submissions go to the same JobQueue/pipeline as the Streamlit app. When
+API_MAX_PENDING resumes are already queued or running, POST /resumes answers
+429 with Retry-After; more than API_MAX_CONCURRENT_REQUESTS requests in flight
+are also turned away with 429.
+"""
+
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from utils.job_queue import COMPLETED, FAILED, JobQueue, QueueFull
+from utils.logger import setup_logger
+from utils.pipeline import get_results_store, process_resume, save_upload, warm_up
+from utils.tracing import configure_tracing
+
+logger = setup_logger()
+configure_tracing()
+
+MAX_UPLOAD_BYTES = int(os.getenv("API_MAX_UPLOAD_MB", "10")) * 1024 * 1024
+RETRY_AFTER_SECONDS = os.getenv("API_RETRY_AFTER_SECONDS", "30")
+
+
+class ResultResponse(JSONResponse):
+    """Pipeline results can hold values the stdlib encoder rejects (numpy scalars, dates)"""
+
+    def render(self, content):
+        return json.dumps(content, default=str, ensure_ascii=False).encode("utf-8")
+
+
+def error(status, message, **headers):
+    return JSONResponse({"error": message}, status_code=status, headers=headers or None)
+
+
+class ConcurrencyLimit:
+    """ASGI middleware: answer 429 instead of queueing once `limit` requests are in flight"""
+
+    def __init__(self, app, limit):
+        self.app = app
+        self.limit = limit
+        self.active = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if self.active >= self.limit:
+            response = error(429, "Too many concurrent requests", **{"Retry-After": "1"})
+            await response(scope, receive, send)
+            return
+        self.active += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.active -= 1
+
+
+async def submit_resume(request):
+    queue = request.app.state.queue
+    if queue.max_pending is not None and queue.pending() >= queue.max_pending:
+        # reject before reading the upload
+        return error(429, "Analysis queue is full", **{"Retry-After": RETRY_AFTER_SECONDS})
+
+    payload = {"submission_timestamp": datetime.now().isoformat()}
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form(max_files=1, max_fields=10, max_part_size=MAX_UPLOAD_BYTES)
+        upload = form.get("file")
+        if upload is None or not hasattr(upload, "read"):
+            return error(400, "Expected a 'file' field with the PDF resume")
+        data = await upload.read()
+        if len(data) > MAX_UPLOAD_BYTES:
+            return error(413, f"Resume larger than {MAX_UPLOAD_BYTES // (1024 * 1024)} MB")
+        if not data.startswith(b"%PDF"):
+            return error(415, "Only PDF resumes are supported")
+        payload["file_path"] = await run_in_threadpool(save_upload, data, upload.filename or "resume.pdf")
+    elif content_type.startswith("application/json"):
+        try:
+            body = await request.json()
+        except ValueError:
+            return error(400, "Invalid JSON body")
+        if not isinstance(body, dict) or not str(body.get("text") or "").strip():
+            return error(400, "Expected a JSON body with a non-empty 'text'")
+        payload["text"] = body["text"]
+    else:
+        return error(415, "Send multipart/form-data with a 'file', or JSON with 'text'")
+
+    try:
+        job_id = queue.submit(payload)
+    except QueueFull:
+        if payload.get("file_path"):
+            os.remove(payload["file_path"])
+        return error(429, "Analysis queue is full", **{"Retry-After": RETRY_AFTER_SECONDS})
+
+    return JSONResponse(
+        {
+            "id": job_id,
+            "status": "queued",
+            "status_url": str(request.url_for("resume_status", job_id=job_id)),
+            "result_url": str(request.url_for("resume_result", job_id=job_id)),
+        },
+        status_code=202,
+    )
+
+
+async def resume_status(request):
+    job = request.app.state.queue.get(request.path_params["job_id"])
+    if job is None:
+        return error(404, "Unknown or expired id")
+    job.pop("result")
+    return JSONResponse(job)
+
+
+async def resume_result(request):
+    job = request.app.state.queue.get(request.path_params["job_id"])
+    if job is None:
+        return error(404, "Unknown or expired id")
+    if job["status"] == COMPLETED:
+        return ResultResponse(job["result"])
+    if job["status"] == FAILED:
+        result = job["result"] or {}
+        return JSONResponse(
+            {"error": job["error"] or "Unknown error", "stage": result.get("current_stage")},
+            status_code=422,
+        )
+    return JSONResponse({"id": job["id"], "status": job["status"], "progress": job["progress"]}, status_code=202)
+
+
+async def stored_analysis(request):
+    result = await run_in_threadpool(
+        get_results_store().get, request.path_params["analysis_id"], include_raw_text=False
+    )
+    if result is None:
+        return error(404, "Unknown analysis id")
+    return ResultResponse(result)
+
+
+async def search_jobs(request):
+    skills = [s.strip().lower() for s in request.query_params.get("skills", "").split(",") if s.strip()]
+    level = request.query_params.get("level")
+    try:
+        limit = min(int(request.query_params.get("limit", "20")), 200)
+    except ValueError:
+        return error(400, "limit must be an integer")
+
+    jobs = await run_in_threadpool(request.app.state.matcher.search_jobs, skills, level)
+    return JSONResponse({"count": len(jobs), "jobs": jobs[:limit]})
+
+
+async def health(request):
+    queue = request.app.state.queue
+    return JSONResponse({"pending": queue.pending(), "max_pending": queue.max_pending, "workers": queue.workers})
+
+
+def create_app(workers=None, max_pending=None, max_concurrent_requests=None):
+    workers = workers or int(os.getenv("ANALYZER_WORKERS", "2"))
+    max_pending = max_pending or int(os.getenv("API_MAX_PENDING", str(workers * 25)))
+    max_concurrent_requests = max_concurrent_requests or int(os.getenv("API_MAX_CONCURRENT_REQUESTS", "64"))
+
+    @asynccontextmanager
+    async def lifespan(app):
+        from agents.registry import get_registry
+
+        # shared agents, catalog and indexes are built before the first request is accepted
+        await asyncio.to_thread(warm_up)
+        app.state.queue = JobQueue(process_resume, workers=workers, max_pending=max_pending)
+        app.state.matcher = get_registry().matcher
+        logger.info(f"API ready: {workers} workers, max {max_pending} pending resumes")
+        try:
+            yield
+        finally:
+            await asyncio.to_thread(app.state.queue.shutdown)
+
+    app = Starlette(
+        routes=[
+            Route("/resumes", submit_resume, methods=["POST"]),
+            Route("/resumes/{job_id}", resume_status, methods=["GET"], name="resume_status"),
+            Route("/resumes/{job_id}/result", resume_result, methods=["GET"], name="resume_result"),
+            Route("/analyses/{analysis_id:int}", stored_analysis, methods=["GET"]),
+            Route("/search-jobs", search_jobs, methods=["GET"]),
+            Route("/health", health, methods=["GET"]),
+        ],
+        lifespan=lifespan,
+    )
+    app.add_middleware(ConcurrencyLimit, limit=max_concurrent_requests)
+    return app
+
+
+app = create_app()
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host=os.getenv("API_HOST", "127.0.0.1"), port=int(os.getenv("API_PORT", "8000")))
@@ -1,11 +1,12 @@
 import streamlit as st
-import asyncio
 import os
+import time
 from datetime import datetime
-from pathlib import Path
 from streamlit_option_menu import option_menu
-from agents.orchestrator import OrchestratorAgent
+from utils.job_queue import JobQueue, QUEUED, RUNNING, COMPLETED
+from utils.pipeline import process_resume, save_upload, warm_up
 from utils.logger import setup_logger
+from utils.tracing import configure_tracing
 
 st.set_page_config(
     page_title="Talent Analyzer Engine",
@@ -15,6 +16,7 @@ st.set_page_config(
 )
 
 logger = setup_logger()
+configure_tracing()
 
 st.markdown(
     """
@@ -42,41 +44,134 @@ st.markdown(
 )
 
 
-async def process_resume(file_path, status_box, progress_bar) :
-    upload_msg = st.empty()
-    upload_msg.info("Resume uploaded successfully! Processing...")
-    await asyncio.sleep(10)
-    upload_msg.empty()
-    try:
-        orchestrator = OrchestratorAgent(status_box, progress_bar)
-        resume_data = {
-            "file_path": file_path,
-            "submission_timestamp": datetime.now().isoformat(),
-        }
-        return await orchestrator.process_application(resume_data)
-    except Exception as e:
-        logger.error(f"Error processing resume: {str(e)}")
-        raise
+STREAM_TITLES = {
+    "screening": "📋 Screening Summary",
+    "recommendation": "🎓 Final Recommendation",
+}
 
+POLL_INTERVAL_SECONDS = 1.0
 
-def save_uploaded_file(uploaded_file):
-    """Save uploaded file and return the file path"""
-    try:
-        save_dir = Path("uploads")
-        save_dir.mkdir(exist_ok=True)
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        file_path = save_dir / f"resume_{timestamp}_{uploaded_file.name}"
+@st.cache_resource
+def get_job_queue():
+    """One background worker service shared by every session of this server"""
+    warm_up()
+    return JobQueue(process_resume, workers=int(os.getenv("ANALYZER_WORKERS", "2")))
 
-        with open(file_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
 
-        return str(file_path)
+def save_uploaded_file(uploaded_file):
+    """Save uploaded file and return the file path"""
+    try:
+        return save_upload(uploaded_file.getbuffer(), uploaded_file.name)
     except Exception as e:
         st.error(f"Error saving file: {str(e)}")
         raise
 
 
+def submit_upload(uploaded_file):
+    """Enqueue an upload once per session and return its job id"""
+    upload_key = getattr(uploaded_file, "file_id", None) or f"{uploaded_file.name}:{uploaded_file.size}"
+    jobs = st.session_state.setdefault("jobs", {})
+
+    if upload_key not in jobs:
+        with st.spinner("Saving uploaded file..."):
+            file_path = save_uploaded_file(uploaded_file)
+        jobs[upload_key] = get_job_queue().submit(
+            {
+                "file_path": file_path,
+                "submission_timestamp": datetime.now().isoformat(),
+            }
+        )
+
+    return jobs[upload_key]
+
+
+def render_progress(job):
+    st.progress(job["progress"] or 0)
+    if job["status"] == QUEUED:
+        st.info("Resume uploaded successfully! Waiting for a free worker...")
+    else:
+        st.text(job["message"])
+
+    for stage, title in STREAM_TITLES.items():
+        text = job["streams"].get(stage)
+        if text:
+            st.markdown(f"**{title}**\n\n{text}▌")
+
+
+def render_results(result):
+    st.progress(100)
+    st.text("Analysis complete!")
+
+    tab1, tab2, tab3, tab4 = st.tabs(
+        [
+            "🧠 Analysis",
+            "💼 Job Matches",
+            "📋 Screening",
+            "🎓 Recommendation",
+        ]
+    )
+
+    with tab1:
+        st.subheader("Skills Analysis")
+        st.write(result["analysis_results"]["skills_analysis"])
+        st.metric(
+            "Confidence Score",
+            f"{result['analysis_results']['confidence_score']:.0%}",
+        )
+
+    with tab2:
+        st.subheader("Matched Positions")
+
+        matches = result["job_matches"]["matched_jobs"]
+        if not matches:
+            st.warning("No suitable positions found.")
+
+        seen_titles = set()
+        for job in matches:
+            if job["title"] in seen_titles:
+                continue
+            seen_titles.add(job["title"])
+
+            with st.container():
+                col1, col2, col3 = st.columns([2, 1, 1])
+
+                with col1:
+                    st.write(f"**{job['title']}**")
+                with col2:
+                    st.write(f"Match: {job.get('match_score', 'N/A')}%")
+                with col3:
+                    st.write(f"📍 {job.get('location', 'N/A')}")
+
+            with st.expander("View job details"):
+                st.json(job)
+            st.divider()
+
+    with tab3:
+        st.subheader("Screening Results")
+        st.metric(
+            "Screening Score",
+            f"{result['screening_results']['screening_score']['final_score']}%",
+        )
+        st.write(result["screening_results"]["screening_score"])
+        st.write(result["screening_results"]["screening_summary"])
+
+    with tab4:
+        st.subheader("Final Recommendation")
+        st.info(
+            result["final_recommendation"]["final_recommendation"],
+            icon="💡",
+        )
+
+    if result.get("trace"):
+        with st.expander("⏱️ Pipeline timings"):
+            st.dataframe(result["trace"]["stages"], hide_index=True)
+            st.caption(f"Trace id: {result['trace']['trace_id']}")
+
+    if result.get("analysis_id"):
+        st.success(f"Results saved as analysis #{result['analysis_id']}")
+
+
 def main():
     with st.sidebar:
         st.title("AI Talent Analyzer ✨")
@@ -99,113 +194,34 @@ def main():
         )
 
         if uploaded_file:
+            poll = False
             try:
-                with st.spinner("Saving uploaded file..."):
-                    file_path = save_uploaded_file(uploaded_file)
-
-                progress_bar = st.progress(0)
-                status_box = st.empty()
-
-                try:
-
-                    result = asyncio.run(process_resume(file_path, status_box, progress_bar))
-                    if result["status"] == "completed":
-                        progress_bar.progress(100)
-                        status_box.text("Analysis complete!")
-
-                        tab1, tab2, tab3, tab4 = st.tabs(
-                            [
-                                "🧠 Analysis",
-                                "💼 Job Matches",
-                                "📋 Screening",
-                                "🎓 Recommendation",
-                            ]
-                        )
-
-                        with tab1:
-                            st.subheader("Skills Analysis")
-                            st.write(result["analysis_results"]["skills_analysis"])
-                            st.metric(
-                                "Confidence Score",
-                                f"{result['analysis_results']['confidence_score']:.0%}",
-                            )
-  
-                        with tab2:
-                            st.subheader("Matched Positions")
-
-                            matches = result["job_matches"]["matched_jobs"]
-                            if not matches:
-                                st.warning("No suitable positions found.")
-
-                            seen_titles = set()
-                            for job in matches:
-                                if job["title"] in seen_titles:
-                                    continue
-                                seen_titles.add(job["title"])
-
-                                with st.container():
-                                    col1, col2, col3 = st.columns([2, 1, 1])
-
-                                    with col1:
-                                        st.write(f"**{job['title']}**")
-                                    with col2:
-                                        st.write(f"Match: {job.get('match_score', 'N/A')}%")
-                                    with col3:
-                                        st.write(f"📍 {job.get('location', 'N/A')}")
-
-                                with st.expander("View job details"):
-                                    st.json(job)
-                                st.divider()
-
-                        with tab3:
-                            st.subheader("Screening Results")
-                            st.metric(
-                                "Screening Score",
-                                f"{result['screening_results']['screening_score']['final_score']}%",
-                            )
-                            st.write(result["screening_results"]["screening_score"])
-                            st.write(result["screening_results"]["screening_summary"])
-                        
-
-                        with tab4:
-                            st.subheader("Final Recommendation")
-                            st.info(
-                                result["final_recommendation"]["final_recommendation"],
-                                icon="💡",
-                            )
-
-                        output_dir = Path("results")
-                        output_dir.mkdir(exist_ok=True)
-                        output_file = (
-                            output_dir
-                            / f"analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-                        )
-
-                        with open(output_file, "w") as f:
-                            f.write(str(result))
-
-                        st.success(f"Results saved to: {output_file}")
-
-                    else:
-                        st.error(
-                            f"Process failed at stage: {result.get('current_stage', 'N/A')}\n"
-                            f"Error: {result.get('error', 'Unknown error')}"
-                        )
-
-                except Exception as e:
-                    st.error(f"Error processing resume: {str(e)}")
-                    logger.error(f"Processing error: {str(e)}", exc_info=True)
-
-                finally:
-                    try:
-                        os.remove(file_path)
-                    except Exception as e:
-                        logger.error(f"Error removing temporary file: {str(e)}")
+                job_id = submit_upload(uploaded_file)
+                job = get_job_queue().get(job_id)
+
+                if job is None:
+                    st.error("This analysis is no longer available. Please upload the resume again.")
+                    st.session_state["jobs"].clear()
+                elif job["status"] in (QUEUED, RUNNING):
+                    render_progress(job)
+                    poll = True
+                elif job["status"] == COMPLETED:
+                    render_results(job["result"])
+                else:
+                    result = job["result"] or {}
+                    st.error(
+                        f"Process failed at stage: {result.get('current_stage', 'N/A')}\n"
+                        f"Error: {job.get('error') or 'Unknown error'}"
+                    )
 
             except Exception as e:
                 st.error(f"Error handling file upload: {str(e)}")
                 logger.error(f"Upload error: {str(e)}", exc_info=True)
 
+            if poll:
+                time.sleep(POLL_INTERVAL_SECONDS)
+                st.rerun()
+
     elif selected == "About":
         st.write("""
             ### **👽 About Multi-Agent Talent Analyzer Engine**
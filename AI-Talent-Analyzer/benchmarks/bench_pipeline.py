@@ -0,0 +1,268 @@
+"""
+End-to-end benchmark of OrchestratorAgent.process_application against the fake
+Ollama server, over synthetic resumes and job catalogs of configurable size.
+
+Reports per-stage latency (p50/p95/mean), LLM calls and tokens per stage, and
+throughput for each catalog size:
+
+    python -m benchmarks.bench_pipeline --jobs 100 1000 10000 --resumes 20
+    python -m benchmarks.bench_pipeline --jobs 100000 --prefill-ms 0 --ms-per-token 0 --json run.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.fake_ollama import FakeOllamaServer, TemplatedResponder  # noqa: E402
+
+STAGES = ["extraction", "analysis", "matching", "screening", "recommendation"]
+AGENT_STAGES = {
+    "extractor": "extraction",
+    "analyzer": "analysis",
+    "matcher": "matching",
+    "screener": "screening",
+    "recommender": "recommendation",
+}
+LEVELS = ["Junior", "Mid-level", "Senior"]
+LOCATIONS = ["Remote", "Pittsburgh, PA", "Boston, MA", "San Francisco, CA", "New York, NY", "Austin, TX"]
+ROLE_TITLES = {
+    "robotics": "Robotics Engineer",
+    "machine learning": "Machine Learning Engineer",
+    "cv engineer": "Computer Vision Engineer",
+    "nlp": "NLP Engineer",
+    "backend": "Backend Engineer",
+    "embedded": "Embedded Software Engineer",
+    "devops": "DevOps Engineer",
+}
+
+
+class NullProgress:
+    """Stands in for the Streamlit status box and progress bar"""
+
+    def write(self, message):
+        pass
+
+    def progress(self, value):
+        pass
+
+
+def load_profiles():
+    with open(Path(__file__).parent.parent / "data" / "role_profiles.json") as f:
+        return json.load(f)
+
+
+def synthetic_jobs(n, profiles, seed=0):
+    rng = random.Random(seed)
+    roles = sorted(profiles)
+    jobs = []
+    for i in range(n):
+        role = rng.choice(roles)
+        profile = profiles[role]
+        level = rng.choice(LEVELS)
+        must = rng.sample(profile["must"], min(len(profile["must"]), rng.randint(2, 4)))
+        good = rng.sample(profile["good"], min(len(profile["good"]), rng.randint(0, 2)))
+        jobs.append({
+            "title": f"{'' if level == 'Mid-level' else level + ' '}{ROLE_TITLES.get(role, role.title())}",
+            "company": f"Company {i % 997}",
+            "location": rng.choice(LOCATIONS),
+            "type": "Full-time",
+            "experience_level": level,
+            "salary_range": f"${rng.randint(80, 150)},000 - ${rng.randint(160, 250)},000",
+            "description": f"Work on {role} systems with a small team.",
+            "requirements": must + good + [f"{rng.randint(1, 6)}+ years experience"],
+            "benefits": ["Health insurance"],
+        })
+    return jobs
+
+
+def synthetic_resume(i, profiles, seed=0):
+    rng = random.Random(seed * 100003 + i)
+    roles = rng.sample(sorted(profiles), 2)
+    skills = sorted({s for r in roles for s in rng.sample(profiles[r]["must"] + profiles[r]["good"], 4)})
+    start = rng.randint(2012, 2019)
+    return "\n".join([
+        f"Candidate Number {i}",
+        f"candidate{i}@example.com | +1 412 555 {1000 + i % 9000} | Pittsburgh",
+        "",
+        "EXPERIENCE",
+        f"Software Engineer, Acme Robotics   Jan {start} – Mar {start + 2}",
+        f"- Built {roles[0]} pipelines using {', '.join(skills[:3])}",
+        f"Senior Engineer, Beta Labs   Apr {start + 2} – Dec {start + 5}",
+        f"- Led {roles[1]} projects with {', '.join(skills[3:])}",
+        "",
+        "EDUCATION",
+        "Master of Science in Computer Science, State University, 2012",
+        "",
+        "SKILLS",
+        ", ".join(skills),
+    ])
+
+
+def percentiles(samples):
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "mean": 0.0}
+    values = np.asarray(samples) * 1000
+    return {
+        "p50": round(float(np.percentile(values, 50)), 2),
+        "p95": round(float(np.percentile(values, 95)), 2),
+        "mean": round(float(values.mean()), 2),
+    }
+
+
+def instrument(orchestrator, timings):
+    """Wrap each agent's run() to record its latency under the stage name"""
+
+    for attr, stage in AGENT_STAGES.items():
+        agent = getattr(orchestrator, attr)
+        original = agent.run
+
+        async def timed(*args, _original=original, _stage=stage, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await _original(*args, **kwargs)
+            finally:
+                timings[_stage].append(time.perf_counter() - start)
+
+        agent.run = timed
+
+
+def run_catalog(n_jobs, args, server, profiles):
+    from agents.orchestrator import OrchestratorAgent
+    from db.database import JobDatabase
+
+    with tempfile.TemporaryDirectory(prefix="bench_jobs_") as tmp:
+        db_path = os.path.join(tmp, "jobs.sqlite")
+        start = time.perf_counter()
+        JobDatabase(db_path).add_jobs(synthetic_jobs(n_jobs, profiles, args.seed))
+        seed_seconds = time.perf_counter() - start
+        os.environ["JOBS_DB_PATH"] = db_path
+
+        resumes = [synthetic_resume(i, profiles, args.seed) for i in range(args.resumes)]
+        timings = {stage: [] for stage in STAGES}
+        totals, failures = [], []
+        server.reset_stats()
+
+        def process(text):
+            orchestrator = OrchestratorAgent(NullProgress(), NullProgress())
+            instrument(orchestrator, timings)
+            started = time.perf_counter()
+            try:
+                asyncio.run(orchestrator.process_application({"text": text}))
+                totals.append(time.perf_counter() - started)
+            except Exception as e:
+                failures.append(str(e))
+
+        started = time.perf_counter()
+        quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+        with quiet, ThreadPoolExecutor(max_workers=args.workers) as pool:
+            list(pool.map(process, resumes))
+        wall = time.perf_counter() - started
+        os.environ.pop("JOBS_DB_PATH", None)
+
+    llm = server.stats()
+    done = max(1, len(totals))
+    return {
+        "jobs": n_jobs,
+        "resumes": args.resumes,
+        "failed": len(failures),
+        "errors": sorted(set(failures))[:5],
+        "seed_catalog_s": round(seed_seconds, 3),
+        "wall_s": round(wall, 3),
+        "resumes_per_min": round(len(totals) / wall * 60, 2) if wall else 0.0,
+        "latency_ms": {
+            **{stage: percentiles(timings[stage]) for stage in STAGES},
+            "total": percentiles(totals),
+        },
+        "llm": {
+            stage: {
+                **{k: (round(v, 3) if isinstance(v, float) else v) for k, v in llm.get(stage, {}).items()},
+                "calls_per_resume": round(llm.get(stage, {}).get("calls", 0) / done, 2),
+            }
+            for stage in STAGES
+        },
+    }
+
+
+def print_report(result):
+    print(f"\n{result['jobs']} jobs, {result['resumes']} resumes: {result['wall_s']}s wall, "
+          f"{result['resumes_per_min']} resumes/min, {result['failed']} failed")
+    print(f"  {'stage':<16}{'p50 ms':>10}{'p95 ms':>10}{'calls':>8}{'calls/res':>11}"
+          f"{'prompt tok':>12}{'compl tok':>11}{'queue s':>9}")
+    for stage in STAGES + ["total"]:
+        lat = result["latency_ms"][stage]
+        llm = result["llm"].get(stage, {})
+        print(f"  {stage:<16}{lat['p50']:>10.1f}{lat['p95']:>10.1f}{llm.get('calls', 0):>8}"
+              f"{llm.get('calls_per_resume', 0):>11}{llm.get('prompt_tokens', 0):>12}"
+              f"{llm.get('completion_tokens', 0):>11}{llm.get('queue_wait_s', 0):>9}")
+    for error in result["errors"]:
+        print(f"  error: {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[100, 1000], help="catalog sizes to run")
+    parser.add_argument("--resumes", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=2, help="resumes processed concurrently")
+    parser.add_argument("--prefill-ms", type=float, default=20.0)
+    parser.add_argument("--ms-per-token", type=float, default=1.0)
+    parser.add_argument("--max-concurrency", type=int, default=1, help="requests the fake LLM serves at once")
+    parser.add_argument("--completion-words", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--verbose", action="store_true", help="keep the agents' console output")
+    args = parser.parse_args()
+    if args.verbose:
+        logging.basicConfig(level=logging.INFO, format="%(name)s: %(message)s")
+
+    server = FakeOllamaServer(
+        prefill_ms=args.prefill_ms,
+        ms_per_token=args.ms_per_token,
+        max_concurrency=args.max_concurrency,
+        responder=TemplatedResponder(args.completion_words),
+    ).start()
+    os.environ["OLLAMA_BASE_URL"] = server.base_url
+
+    from agents.orchestrator import OrchestratorAgent
+
+    # group LLM calls by the calling agent's system prompt; the probe's matcher opens a
+    # throwaway job DB so the bundled db/jobs.sqlite is never touched
+    with tempfile.TemporaryDirectory(prefix="bench_probe_") as tmp:
+        os.environ["JOBS_DB_PATH"] = os.path.join(tmp, "jobs.sqlite")
+        probe = OrchestratorAgent(NullProgress(), NullProgress())
+        os.environ.pop("JOBS_DB_PATH", None)
+    server.labels.update({getattr(probe, a).instructions: s for a, s in AGENT_STAGES.items()})
+
+    profiles = load_profiles()
+    results = {
+        "config": {k: v for k, v in vars(args).items() if k not in ("json", "verbose")},
+        "runs": [],
+    }
+    try:
+        for n_jobs in args.jobs:
+            result = run_catalog(n_jobs, args, server, profiles)
+            results["runs"].append(result)
+            print_report(result)
+    finally:
+        server.stop()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
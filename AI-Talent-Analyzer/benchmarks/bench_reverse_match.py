@@ -0,0 +1,152 @@
+"""
+Benchmark of reverse matching (MatcherAgent.rank_candidates_for_job) over a
+results store of synthetic analyzed candidates, against the fake Ollama server.
+
+Reports candidate-index build time, per-job prescoring and end-to-end ranking
+latency (with the LLM shortlist), next to the per-candidate hybrid_score loop
+the forward matcher would need, measured on a sample and extrapolated:
+
+    python -m benchmarks.bench_reverse_match --candidates 50000 --jobs 5
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.bench_pipeline import LEVELS, load_profiles, synthetic_jobs  # noqa: E402
+from benchmarks.fake_ollama import FakeOllamaServer, TemplatedResponder  # noqa: E402
+
+
+def synthetic_analyses(n, profiles, seed=0):
+    """Stored-result shaped dicts: contact info, raw text and an analyzer skills block"""
+
+    rng = random.Random(seed)
+    roles = sorted(profiles)
+    for i in range(n):
+        picked = rng.sample(roles, 2)
+        skills = sorted({s for r in picked for s in rng.sample(profiles[r]["must"] + profiles[r]["good"], 4)})
+        yield {
+            "status": "completed",
+            "extracted_data": {
+                "raw_text": f"Candidate {i}\n{', '.join(skills)}",
+                "contact_info": {"name": f"Candidate {i}", "email": f"candidate{i}@example.com"},
+            },
+            "analysis_results": {
+                "skills_analysis": {
+                    "technical_skills": skills,
+                    "experience_level": rng.choice(LEVELS),
+                    "years_of_experience": rng.randint(1, 12),
+                },
+                "confidence_score": 0.8,
+            },
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=50000)
+    parser.add_argument("--jobs", type=int, default=5, help="postings to rank candidates for")
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--prefill-ms", type=float, default=20.0)
+    parser.add_argument("--ms-per-token", type=float, default=1.0)
+    parser.add_argument("--naive-sample", type=int, default=500,
+                        help="candidates scored with hybrid_score's loop (no LLM) to extrapolate from")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    server = FakeOllamaServer(
+        prefill_ms=args.prefill_ms, ms_per_token=args.ms_per_token, responder=TemplatedResponder(),
+    ).start()
+    os.environ["OLLAMA_BASE_URL"] = server.base_url
+    profiles = load_profiles()
+
+    with tempfile.TemporaryDirectory(prefix="bench_reverse_") as tmp:
+        os.environ["JOBS_DB_PATH"] = os.path.join(tmp, "jobs.sqlite")
+        os.environ["RESULTS_DB_PATH"] = os.path.join(tmp, "results.sqlite")
+
+        from agents.matcher_agent import MatcherAgent
+        from db.database import JobDatabase
+        from db.results_store import ResultsStore
+
+        jobs = synthetic_jobs(args.jobs, profiles, args.seed)
+        JobDatabase().add_jobs(jobs)
+        store = ResultsStore()
+        start = time.perf_counter()
+        analyses = list(synthetic_analyses(args.candidates, profiles, args.seed))
+        for i in range(0, len(analyses), 5000):
+            store.save_many(analyses[i : i + 5000])
+        seed_seconds = time.perf_counter() - start
+
+        matcher = MatcherAgent()
+        start = time.perf_counter()
+        matcher.candidate_index.refresh()
+        build_seconds = time.perf_counter() - start
+
+        prescore, cheap_rank, full_rank, naive = [], [], [], []
+        for job_id in range(1, args.jobs + 1):
+            job = matcher.db.get_job(job_id)
+            reqs = [r.lower() for r in job["requirements"]]
+
+            start = time.perf_counter()
+            rows, _, _ = matcher.candidate_index.prescore(reqs, job["experience_level"])
+            prescore.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            matcher.rank_candidates_for_job(job_id, args.k, use_llm=False)
+            cheap_rank.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            matcher.rank_candidates_for_job(job_id, args.k)
+            full_rank.append(time.perf_counter() - start)
+
+            sample = analyses[: args.naive_sample]
+            start = time.perf_counter()
+            for analysis in sample:
+                skills = [s.lower() for s in analysis["analysis_results"]["skills_analysis"]["technical_skills"]]
+                matcher.hybrid_score(lambda prompt: '{"match_score": 0, "reason": ""}', skills, reqs)
+            naive.append((time.perf_counter() - start) / max(1, len(sample)) * len(rows))
+
+    llm = server.stats()
+    server.stop()
+
+    def ms(samples):
+        return round(float(np.mean(samples)) * 1000, 2)
+
+    results = {
+        "config": {k: v for k, v in vars(args).items() if k != "json"},
+        "seed_store_s": round(seed_seconds, 2),
+        "index_build_ms": round(build_seconds * 1000, 2),
+        "indexed_candidates": len(matcher.candidate_index),
+        "vocabulary": len(matcher.candidate_index.skills),
+        "prescore_ms": ms(prescore),
+        "rank_no_llm_ms": ms(cheap_rank),
+        "rank_with_llm_ms": ms(full_rank),
+        "llm_calls_per_job": round(sum(s["calls"] for s in llm.values()) / max(1, args.jobs), 1),
+        "naive_loop_no_llm_ms": ms(naive),
+    }
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    print(f"{results['indexed_candidates']} candidates, {results['vocabulary']} distinct skills, "
+          f"{args.jobs} jobs (k={args.k})")
+    print(f"  index build          {results['index_build_ms']:>10.1f} ms")
+    print(f"  prescore per job     {results['prescore_ms']:>10.1f} ms")
+    print(f"  rank, no LLM         {results['rank_no_llm_ms']:>10.1f} ms")
+    print(f"  rank, LLM shortlist  {results['rank_with_llm_ms']:>10.1f} ms  "
+          f"({results['llm_calls_per_job']} LLM calls/job)")
+    print(f"  per-candidate loop   {results['naive_loop_no_llm_ms']:>10.1f} ms  (extrapolated, no LLM)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Per-request setup cost of the pipeline: how long it takes to get an
+orchestrator ready for one resume, and what that adds to end-to-end latency
+when the LLM itself is instant (fake server at zero latency).
+
+    python -m benchmarks.bench_setup --requests 50 --resumes 20
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.bench_pipeline import NullProgress, load_profiles, synthetic_jobs, synthetic_resume  # noqa: E402
+from benchmarks.fake_ollama import FakeOllamaServer  # noqa: E402
+
+
+class Progress(NullProgress):
+    def on_token(self, stage, token):
+        pass
+
+
+def summarize(samples):
+    values = np.asarray(samples) * 1000
+    return {
+        "p50": round(float(np.percentile(values, 50)), 3),
+        "p95": round(float(np.percentile(values, 95)), 3),
+        "mean": round(float(values.mean()), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50, help="orchestrators built for the setup timing")
+    parser.add_argument("--resumes", type=int, default=20, help="resumes run end to end through the job queue")
+    parser.add_argument("--jobs", type=int, default=200, help="job catalog size")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    server = FakeOllamaServer(prefill_ms=0, ms_per_token=0).start()
+    profiles = load_profiles()
+
+    with tempfile.TemporaryDirectory(prefix="bench_setup_") as tmp:
+        os.environ.update({
+            "OLLAMA_BASE_URL": server.base_url,
+            "JOBS_DB_PATH": os.path.join(tmp, "jobs.sqlite"),
+            "RESULTS_DB_PATH": os.path.join(tmp, "results.sqlite"),
+        })
+        from db.database import JobDatabase
+        from utils import pipeline
+        from utils.job_queue import COMPLETED, FAILED, JobQueue
+
+        JobDatabase().add_jobs(synthetic_jobs(args.jobs, profiles))
+
+        warm_up_seconds = None
+        if hasattr(pipeline, "warm_up"):
+            start = time.perf_counter()
+            pipeline.warm_up()
+            warm_up_seconds = time.perf_counter() - start
+
+        def build(progress):
+            if hasattr(pipeline, "build_orchestrator"):
+                return pipeline.build_orchestrator(progress)
+            from agents.orchestrator import OrchestratorAgent
+
+            return OrchestratorAgent(progress, progress, on_token=progress.on_token)
+
+        setup = []
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            build(Progress())
+            setup.append(time.perf_counter() - start)
+
+        queue = JobQueue(pipeline.process_resume, workers=1)
+        latencies = []
+        for i in range(args.resumes):
+            start = time.perf_counter()
+            job_id = queue.submit({"text": synthetic_resume(i, profiles)})
+            while queue.get(job_id)["status"] not in (COMPLETED, FAILED):
+                time.sleep(0.001)
+            latencies.append(time.perf_counter() - start)
+        queue.shutdown()
+
+    server.stop()
+    results = {
+        "config": {k: v for k, v in vars(args).items() if k != "json"},
+        "warm_up_ms": round(warm_up_seconds * 1000, 1) if warm_up_seconds is not None else None,
+        "setup_ms": summarize(setup),
+        "first_resume_ms": round(latencies[0] * 1000, 1),
+        "resume_ms": summarize(latencies[1:] or latencies),
+    }
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    print(f"warm-up:            {results['warm_up_ms'] if results['warm_up_ms'] is not None else 'n/a'} ms")
+    print(f"setup per request:  p50 {results['setup_ms']['p50']} ms, p95 {results['setup_ms']['p95']} ms")
+    print(f"first resume:       {results['first_resume_ms']} ms")
+    print(f"resume (zero-latency LLM): p50 {results['resume_ms']['p50']} ms, p95 {results['resume_ms']['p95']} ms")
+
+
+if __name__ == "__main__":
+    main()
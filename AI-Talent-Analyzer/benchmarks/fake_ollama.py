@@ -0,0 +1,268 @@
+"""
+Local stand-in for Ollama's OpenAI-compatible /v1/chat/completions endpoint.
+
+Latency is modelled as prefill + per-token generation time, and at most
+`max_concurrency` requests are served at once (1 mimics a single-GPU/CPU Ollama;
+the rest wait in line). Responses are templated from the prompt so every agent
+gets output it can parse:
+
+- analyzer prompts  -> skills JSON built from the skills found in the resume text
+- matcher prompts   -> {"match_score": ..., "reason": ...}
+- anything else     -> prose of `completion_words` words
+
+Run standalone and point the app at it:
+    python -m benchmarks.fake_ollama --port 11435 --ms-per-token 20
+    OLLAMA_BASE_URL=http://127.0.0.1:11435/v1 streamlit run app.py
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+CHARS_PER_TOKEN = 4
+ROLE_PROFILES_PATH = Path(__file__).parent.parent / "data" / "role_profiles.json"
+
+
+def estimate_tokens(text):
+    return max(1, (len(text or "") + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN)
+
+
+def load_skill_vocabulary():
+    with open(ROLE_PROFILES_PATH) as f:
+        profiles = json.load(f)
+    return sorted({s for p in profiles.values() for s in p.get("must", []) + p.get("good", [])})
+
+
+def _stable_int(text, modulo):
+    return int(hashlib.md5(text.encode()).hexdigest()[:8], 16) % modulo
+
+
+class TemplatedResponder:
+    """Builds a plausible reply for each agent from the prompt alone (deterministic)"""
+
+    def __init__(self, completion_words=120, skills=None):
+        self.completion_words = completion_words
+        self.skills = skills or load_skill_vocabulary()
+        self._skill_patterns = [
+            (s, re.compile(r"(?<![\w+#])" + re.escape(s) + r"(?![\w+#])", re.IGNORECASE))
+            for s in self.skills
+        ]
+
+    def __call__(self, system, prompt):
+        if '"technical_skills"' in prompt:
+            return self.analysis(prompt)
+        if '"match_score"' in prompt:
+            return json.dumps({
+                "match_score": 40 + _stable_int(prompt, 60),
+                "reason": "Skills overlap with the core requirements",
+            })
+        return self.prose(prompt)
+
+    def analysis(self, prompt):
+        resume = prompt.split("Raw resume text:", 1)[-1]
+        found = [s for s, pattern in self._skill_patterns if pattern.search(resume)]
+        return json.dumps({
+            "technical_skills": found,
+            "years_of_experience": 4,
+            "education": [{"degree": "Masters", "field": "Computer Science",
+                           "institution": "State University", "year": "2020"}],
+            "experience_level": "Mid-level",
+            "key_achievements": ["Shipped a production system"],
+            "domain_expertise": ["software engineering"],
+        })
+
+    def prose(self, prompt):
+        words = ["candidate", "shows", "strong", "alignment", "with", "the", "role", "and",
+                 "should", "proceed", "to", "a", "technical", "interview", "focused", "on"]
+        offset = _stable_int(prompt, len(words))
+        return " ".join(words[(offset + i) % len(words)] for i in range(self.completion_words)) + "."
+
+
+class FakeOllamaServer:
+    """
+    Threaded HTTP server; use as a context manager or call start()/stop().
+    `labels` maps a system prompt (an agent's instructions) to a name used to
+    group the call statistics.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, prefill_ms=50.0, ms_per_token=5.0,
+                 max_concurrency=1, responder=None, labels=None):
+        self.prefill_ms = prefill_ms
+        self.ms_per_token = ms_per_token
+        self.max_concurrency = max_concurrency
+        self.responder = responder or TemplatedResponder()
+        self.labels = dict(labels or {})
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stats(self):
+        """Per-label counters: calls, prompt/completion tokens, queue wait and service time"""
+        with self._lock:
+            return {label: dict(s) for label, s in self._stats.items()}
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats = {}
+
+    def _record(self, label, prompt_tokens, completion_tokens, wait, service):
+        with self._lock:
+            s = self._stats.setdefault(label, {
+                "calls": 0, "prompt_tokens": 0, "completion_tokens": 0,
+                "queue_wait_s": 0.0, "service_s": 0.0,
+            })
+            s["calls"] += 1
+            s["prompt_tokens"] += prompt_tokens
+            s["completion_tokens"] += completion_tokens
+            s["queue_wait_s"] += wait
+            s["service_s"] += service
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body go out in separate writes; with Nagle on, keep-alive
+            # clients wait ~40 ms for a delayed ACK on every request
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, status, payload):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path.rstrip("/") == "/stats":
+                    self._send_json(200, server.stats())
+                elif self.path.rstrip("/") == "/v1/models":
+                    self._send_json(200, {"object": "list", "data": [{"id": "fake", "object": "model"}]})
+                else:
+                    self._send_json(404, {"error": "not found"})
+
+            def do_POST(self):
+                if self.path.rstrip("/") != "/v1/chat/completions":
+                    self._send_json(404, {"error": "not found"})
+                    return
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                server._serve(self, request)
+
+        return Handler
+
+    def _serve(self, handler, request):
+        messages = request.get("messages", [])
+        system = next((m["content"] for m in messages if m.get("role") == "system"), "")
+        prompt = messages[-1]["content"] if messages else ""
+        label = self.labels.get(system, "unlabeled")
+        model = request.get("model", "fake")
+
+        queued = time.perf_counter()
+        with self._slots:
+            started = time.perf_counter()
+            text = self.responder(system, prompt)
+            prompt_tokens = estimate_tokens(system) + estimate_tokens(prompt)
+            completion_tokens = estimate_tokens(text)
+            time.sleep(self.prefill_ms / 1000)
+            if request.get("stream"):
+                self._stream(handler, model, text)
+            else:
+                time.sleep(completion_tokens * self.ms_per_token / 1000)
+                handler._send_json(200, {
+                    "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": text}}],
+                    "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                              "total_tokens": prompt_tokens + completion_tokens},
+                })
+            finished = time.perf_counter()
+        self._record(label, prompt_tokens, completion_tokens, started - queued, finished - started)
+
+    def _stream(self, handler, model, text):
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Connection", "close")
+        handler.end_headers()
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        pieces = [text[i : i + CHARS_PER_TOKEN] for i in range(0, len(text), CHARS_PER_TOKEN)]
+        for i, piece in enumerate(pieces + [None]):
+            delta = {"content": piece} if piece is not None else {}
+            if i == 0:
+                delta["role"] = "assistant"
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta,
+                             "finish_reason": None if piece is not None else "stop"}],
+            }
+            handler.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            handler.wfile.flush()
+            if piece is not None:
+                time.sleep(self.ms_per_token / 1000)
+        handler.wfile.write(b"data: [DONE]\n\n")
+        handler.wfile.flush()
+        handler.close_connection = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Ollama OpenAI-compatible server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--prefill-ms", type=float, default=50.0)
+    parser.add_argument("--ms-per-token", type=float, default=5.0)
+    parser.add_argument("--max-concurrency", type=int, default=1)
+    parser.add_argument("--completion-words", type=int, default=120)
+    args = parser.parse_args()
+
+    server = FakeOllamaServer(
+        args.host, args.port, args.prefill_ms, args.ms_per_token, args.max_concurrency,
+        responder=TemplatedResponder(args.completion_words),
+    )
+    print(f"Fake Ollama listening on {server.base_url} (stats at /stats)")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
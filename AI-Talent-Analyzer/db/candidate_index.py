@@ -0,0 +1,139 @@
+import threading
+from difflib import SequenceMatcher
+
+import numpy as np
+
+
+class CandidateIndex:
+    """
+    In-memory index of previously analyzed candidates for reverse matching.
+
+    Skills are interned to integer ids and each candidate is a run of ids in one
+    flat array (CSR layout). Scoring a job then costs one fuzzy comparison per
+    distinct skill in the vocabulary, not one per candidate skill, and the
+    per-candidate fuzzy/keyword scores are numpy bincounts. Only the latest
+    analysis of each candidate (same resume text, or same email) is kept.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.vocab = {}
+        self.skills = []
+        self.analysis_ids = []
+        self.levels = []
+        self.match_levels = []  # level filter of each analysis's forward job search (None: any)
+        self._skill_lists = []
+        self._row_of_key = {}
+        self._active = []
+        self._watermark = 0
+        self._lock = threading.Lock()
+        self._arrays = None
+
+    def __len__(self):
+        return sum(self._active)
+
+    def refresh(self):
+        """Pull analyses saved since the last refresh; returns how many were added"""
+
+        with self._lock:
+            rows = self.store.candidate_skill_rows(after_id=self._watermark)
+            grouped = {}
+            for analysis_id, key, level, level_filter, skill in rows:
+                entry = grouped.setdefault(analysis_id, (key, level, level_filter, []))
+                if skill:
+                    entry[3].append(self._intern(skill))
+
+            for analysis_id, (key, level, level_filter, skill_ids) in grouped.items():
+                previous = self._row_of_key.get(key)
+                if previous is not None:
+                    self._active[previous] = False
+                self._row_of_key[key] = len(self.analysis_ids)
+                self.analysis_ids.append(analysis_id)
+                self.levels.append(normalize_level(level))
+                self.match_levels.append(normalize_level(level_filter))
+                self._skill_lists.append(np.asarray(skill_ids, dtype=np.int32))
+                self._active.append(True)
+                self._watermark = max(self._watermark, analysis_id)
+
+            if grouped:
+                self._arrays = None
+            return len(grouped)
+
+    def skills_of(self, row):
+        return [self.skills[i] for i in self._skill_lists[row]]
+
+    def _intern(self, skill):
+        skill_id = self.vocab.get(skill)
+        if skill_id is None:
+            skill_id = self.vocab[skill] = len(self.skills)
+            self.skills.append(skill)
+        return skill_id
+
+    def _build_arrays(self):
+        lengths = np.asarray([len(s) for s in self._skill_lists], dtype=np.int64)
+        flat = np.concatenate(self._skill_lists) if self._skill_lists else np.zeros(0, dtype=np.int32)
+        self._arrays = {
+            "flat": flat,
+            "owner": np.repeat(np.arange(len(self._skill_lists)), lengths),
+            "active": np.asarray(self._active, dtype=bool),
+        }
+        return self._arrays
+
+    def prescore(self, requirements, experience_level=None, strict_level=False):
+        """
+        Fuzzy and keyword scores (0-1) against the job's requirements, as
+        MatcherAgent.hybrid_score defines them, for the candidates MatcherAgent.search_jobs
+        would pair with this job: some skill appears in a requirement, and the same
+        experience level unless nobody has it. With strict_level, only candidates whose
+        own job search filtered on this level, or on none (the fallback), are kept, so
+        new jobs are paired as that search would have. Returns (rows, fuzzy_norm, keyword_norm).
+        """
+
+        with self._lock:
+            arrays = self._arrays or self._build_arrays()
+            reqs = [r.lower() for r in requirements]
+            n = len(self.analysis_ids)
+
+            best = np.asarray(
+                [max([fuzzy_similarity(skill, r) for r in reqs] or [0]) for skill in self.skills],
+                dtype=np.float64,
+            )
+            fuzzy = np.bincount(arrays["owner"], weights=best[arrays["flat"]], minlength=n)
+            fuzzy = np.clip(fuzzy / max(1, len(reqs)), 0.0, 1.0)
+
+            req_set = set(reqs)
+            exact = np.zeros(len(self.skills), dtype=np.float64)
+            for r in req_set:
+                if r in self.vocab:
+                    exact[self.vocab[r]] = 1.0
+            keyword = np.bincount(arrays["owner"], weights=exact[arrays["flat"]], minlength=n)
+            keyword = keyword / max(1, len(req_set))
+
+            # the reverse of search_jobs' "requirements LIKE %skill%" filter
+            mentioned = np.asarray([any(skill in r for r in reqs) for skill in self.skills], dtype=np.float64)
+            overlap = np.bincount(arrays["owner"], weights=mentioned[arrays["flat"]], minlength=n)
+            rows = np.flatnonzero(arrays["active"] & (overlap > 0))
+            level = normalize_level(experience_level)
+            if level and strict_level:
+                rows = rows[np.asarray([self.match_levels[i] in (level, None) for i in rows], dtype=bool)]
+            elif level:
+                same_level = np.asarray([self.levels[i] == level for i in rows], dtype=bool)
+                if same_level.any():
+                    rows = rows[same_level]
+            return rows, fuzzy[rows], keyword[rows]
+
+
+def fuzzy_similarity(a, b):
+    return SequenceMatcher(None, a.lower(), b.lower()).ratio()
+
+
+def normalize_level(level):
+    """Map free-form experience levels onto the job catalog's Junior / Mid-level / Senior"""
+    lvl = (level or "").strip().lower()
+    if "junior" in lvl:
+        return "Junior"
+    if "mid" in lvl:
+        return "Mid-level"
+    if "senior" in lvl:
+        return "Senior"
+    return None
@@ -4,11 +4,14 @@ from typing import Dict, List, Any
 import json
 import os
 
+from utils.tracing import span
+
 
 class JobDatabase:
-    def __init__(self):
+    def __init__(self, db_path=None):
+        """db_path defaults to $JOBS_DB_PATH, then the bundled db/jobs.sqlite"""
         current_dir = Path(__file__).parent
-        self.db_path = current_dir / "jobs.sqlite"
+        self.db_path = Path(db_path or os.environ.get("JOBS_DB_PATH") or current_dir / "jobs.sqlite")
         self.schema_path = current_dir / "schema.sql"
         self._init_db()
 
@@ -33,7 +36,7 @@ class JobDatabase:
         ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
         """
 
-        with sqlite3.connect(self.db_path) as conn:
+        with span("db.query", op="add_job"), sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 query,
@@ -51,15 +54,95 @@ class JobDatabase:
             )
             return cursor.lastrowid
 
+    def add_jobs(self, jobs):
+        """Bulk-insert jobs in one transaction; returns the number inserted"""
+
+        query = """
+        INSERT INTO jobs (
+            title, company, location, type, experience_level,
+            salary_range, description, requirements, benefits
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        rows = [
+            (
+                job["title"],
+                job["company"],
+                job["location"],
+                job["type"],
+                job["experience_level"],
+                job.get("salary_range"),
+                job["description"],
+                json.dumps(job["requirements"]),
+                json.dumps(job.get("benefits", [])),
+            )
+            for job in jobs
+        ]
+        with span("db.query", op="add_jobs", rows=len(rows)), sqlite3.connect(self.db_path) as conn:
+            conn.executemany(query, rows)
+        return len(rows)
+
+    def update_job(self, job_id, job_data):
+        """Update the given fields of a job; returns True if the job exists"""
+
+        columns = ["title", "company", "location", "type", "experience_level",
+                   "salary_range", "description", "requirements", "benefits"]
+        fields = {k: v for k, v in job_data.items() if k in columns}
+        for key in ("requirements", "benefits"):
+            if key in fields:
+                fields[key] = json.dumps(fields[key])
+        if not fields:
+            return self.get_job(job_id) is not None
+
+        query = f"""
+        UPDATE jobs SET {", ".join(f"{k} = ?" for k in fields)}, updated_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+        """
+        with span("db.query", op="update_job"), sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(query, list(fields.values()) + [job_id])
+            return cursor.rowcount > 0
+
+    def delete_job(self, job_id):
+        with span("db.query", op="delete_job"), sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+            return cursor.rowcount > 0
+
+    def changes_since(self, watermark=0):
+        """
+        Catalog changes after a watermark, collapsed to the last operation per job.
+        Returns ({job_id: "insert" | "update" | "delete"}, new_watermark).
+        """
+
+        query = "SELECT seq, job_id, op FROM job_changes WHERE seq > ? ORDER BY seq"
+        with span("db.query", op="changes_since") as s, sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(query, (watermark,)).fetchall()
+            s.set(rows=len(rows))
+
+        changes = {}
+        for seq, job_id, op in rows:
+            if op == "update" and changes.get(job_id) == "insert":
+                continue
+            if op == "delete" and changes.get(job_id) == "insert":
+                # added and removed within the window: nothing to re-match
+                changes.pop(job_id)
+                continue
+            changes[job_id] = op
+        return changes, (rows[-1][0] if rows else watermark)
+
+    def latest_change(self):
+        """Current watermark of the change log"""
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM job_changes").fetchone()[0]
+
     def get_all_jobs(self):
         """Retrieve all jobs from db"""
         query = "SELECT * FROM jobs ORDER BY created_at DESC"
 
-        with sqlite3.connect(self.db_path) as conn:
+        with span("db.query", op="get_all_jobs") as s, sqlite3.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute(query)
             rows = cursor.fetchall()
+            s.set(rows=len(rows))
 
             return [
                 {
@@ -78,6 +161,28 @@ class JobDatabase:
                 for row in rows
             ]
 
+    def get_job(self, job_id):
+        """A single job by id, or None"""
+        with span("db.query", op="get_job"), sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+
+        if row is None:
+            return None
+        return {
+            "id": row["id"],
+            "title": row["title"],
+            "company": row["company"],
+            "location": row["location"],
+            "type": row["type"],
+            "experience_level": row["experience_level"],
+            "salary_range": row["salary_range"],
+            "description": row["description"],
+            "requirements": json.loads(row["requirements"]),
+            "benefits": json.loads(row["benefits"]) if row["benefits"] else [],
+            "created_at": row["created_at"],
+        }
+
     def search_jobs(self, skills, experience_level):
         """Search jobs based on skills and experience level"""
         
@@ -96,11 +201,12 @@ class JobDatabase:
         query += " OR ".join(query_conditions) + ")"
 
         try:
-            with sqlite3.connect(self.db.db_path) as conn:
+            with span("db.query", op="search_jobs", skills=len(skills)) as s, sqlite3.connect(self.db.db_path) as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.cursor()
                 cursor.execute(query, params)
                 rows = cursor.fetchall()
+                s.set(rows=len(rows))
 
                 return [
                     {
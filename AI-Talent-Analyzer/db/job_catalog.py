@@ -0,0 +1,56 @@
+import json
+import threading
+
+from utils.tracing import span
+
+
+class JobCatalog:
+    """
+    In-memory snapshot of the jobs table for MatcherAgent.search_jobs.
+
+    The snapshot is reloaded only when the job_changes log has moved since it was
+    taken, so a search costs one tiny indexed query plus a scan in memory instead
+    of a LIKE query over the whole table.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        # (jobs, haystacks), replaced as a whole so a concurrent search never mixes versions
+        self._snapshot = ((), ())
+        self._watermark = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._snapshot[0])
+
+    def refresh(self):
+        """Reload if the catalog changed; returns True when it did"""
+        watermark = self.db.latest_change()
+        if watermark == self._watermark:
+            return False
+        with self._lock:
+            if watermark == self._watermark:
+                return False
+            jobs = sorted(self.db.get_all_jobs(), key=lambda job: job["id"])
+            for job in jobs:
+                job.pop("created_at", None)
+            # what search_jobs' "requirements LIKE %skill%" matches against
+            haystacks = tuple(json.dumps(job["requirements"]).lower() for job in jobs)
+            self._snapshot = (tuple(jobs), haystacks)
+            self._watermark = watermark
+        return True
+
+    def search(self, skills, experience_level=None):
+        """Jobs (in id order) at experience_level, if given, whose requirements mention any skill"""
+        self.refresh()
+        needles = [s.lower() for s in skills]
+        jobs, haystacks = self._snapshot
+        with span("catalog.search", skills=len(needles), jobs=len(jobs)) as s:
+            found = [
+                dict(job)
+                for job, haystack in zip(jobs, haystacks)
+                if (experience_level is None or job["experience_level"] == experience_level)
+                and (not needles or any(n in haystack for n in needles))
+            ]
+            s.set(rows=len(found))
+        return found
@@ -0,0 +1,65 @@
+"""
+Incrementally re-match stored analyses after job catalog changes (e.g. a nightly
+import). Reads the job_changes log after the last watermark, re-scores only the
+affected candidate-job pairs, then advances the watermark:
+
+    python db/rematch_jobs.py              # changes since the last run
+    python db/rematch_jobs.py --since 0    # replay the whole change log
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from agents.matcher_agent import MatcherAgent  # noqa: E402
+
+WATERMARK_KEY = "rematch_job_watermark"
+
+
+def rematch_since(matcher=None, since=None, use_llm=True):
+    """
+    Apply the catalog changes after `since` (default: the stored watermark) and
+    store the new watermark. On the very first run there is nothing to compare
+    against, so the watermark is just initialised to the current end of the log.
+    """
+    matcher = matcher or MatcherAgent()
+    store = matcher.candidate_index.store
+
+    if since is None:
+        since = store.get_meta(WATERMARK_KEY)
+    if since is None:
+        watermark = matcher.db.latest_change()
+        store.set_meta(WATERMARK_KEY, watermark)
+        return {"watermark": watermark, "initialised": True}
+
+    start = time.perf_counter()
+    changes, watermark = matcher.db.changes_since(since)
+    stats = matcher.rematch_jobs(changes, use_llm=use_llm) if changes else {"jobs": 0}
+    store.set_meta(WATERMARK_KEY, watermark)
+    stats.update({
+        "since": since,
+        "watermark": watermark,
+        "inserted": sum(1 for op in changes.values() if op == "insert"),
+        "updated": sum(1 for op in changes.values() if op == "update"),
+        "deleted": sum(1 for op in changes.values() if op == "delete"),
+        "seconds": round(time.perf_counter() - start, 3),
+    })
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--since", type=int, help="change-log sequence to start after (default: stored watermark)")
+    parser.add_argument("--no-llm", action="store_true", help="score with the fuzzy/keyword terms only")
+    args = parser.parse_args()
+
+    stats = rematch_since(since=args.since, use_llm=not args.no_llm)
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
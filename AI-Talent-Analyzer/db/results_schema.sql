@@ -0,0 +1,63 @@
+-- Raw resume text, stored once per distinct content
+CREATE TABLE IF NOT EXISTS documents (
+    hash TEXT PRIMARY KEY,
+    raw_text TEXT NOT NULL,
+    chars INTEGER NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    candidate_name TEXT,
+    email TEXT,
+    phone TEXT,
+    location TEXT,
+    experience_level TEXT,
+    years_of_experience REAL,
+    confidence_score REAL,
+    screening_score REAL,
+    recommendation_confidence TEXT,
+    top_match_job_id INTEGER,
+    top_match_score INTEGER,
+    match_count INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    source_file TEXT,
+    document_hash TEXT REFERENCES documents(hash),
+    trace_id TEXT,
+    submitted_at DATETIME,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    result TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS matches (
+    analysis_id INTEGER NOT NULL REFERENCES analyses(id) ON DELETE CASCADE,
+    job_id INTEGER,
+    rank INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    company TEXT,
+    location TEXT,
+    match_score INTEGER NOT NULL,
+    llm_score INTEGER,
+    fuzzy_score INTEGER,
+    reason TEXT,
+    PRIMARY KEY (analysis_id, rank)
+);
+
+-- Normalized technical skills per analysis, for the reverse-matching candidate index
+CREATE TABLE IF NOT EXISTS candidate_skills (
+    analysis_id INTEGER NOT NULL REFERENCES analyses(id) ON DELETE CASCADE,
+    skill TEXT NOT NULL,
+    PRIMARY KEY (analysis_id, skill)
+);
+
+CREATE INDEX IF NOT EXISTS idx_analyses_created_at ON analyses(created_at);
+CREATE INDEX IF NOT EXISTS idx_analyses_email ON analyses(email);
+CREATE INDEX IF NOT EXISTS idx_analyses_screening_score ON analyses(screening_score);
+CREATE INDEX IF NOT EXISTS idx_analyses_document_hash ON analyses(document_hash);
+CREATE INDEX IF NOT EXISTS idx_matches_job_score ON matches(job_id, match_score DESC);
+CREATE INDEX IF NOT EXISTS idx_candidate_skills_skill ON candidate_skills(skill);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
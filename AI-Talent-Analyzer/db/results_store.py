@@ -0,0 +1,383 @@
+import argparse
+import ast
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.tracing import span  # noqa: E402
+
+
+class ResultsStore:
+    """
+    SQLite store for finished pipeline results.
+
+    One row per analysis with the candidate, scores and top match as columns, one
+    row per matched job (indexed by job and score), and the raw resume text kept
+    once per content hash. The rest of the workflow context is stored as JSON so
+    get() can rebuild the full result.
+    """
+
+    def __init__(self, db_path=None):
+        """db_path defaults to $RESULTS_DB_PATH, then db/results.sqlite"""
+        current_dir = Path(__file__).parent
+        self.db_path = Path(db_path or os.environ.get("RESULTS_DB_PATH") or current_dir / "results.sqlite")
+        self.schema_path = current_dir / "results_schema.sql"
+        self._init_db()
+
+    def _init_db(self):
+        with open(self.schema_path) as f:
+            schema = f.read()
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(schema)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def save(self, result):
+        """Persist a workflow context returned by OrchestratorAgent; returns the analysis id"""
+        return self.save_many([result])[0]
+
+    def save_many(self, results):
+        """Persist several results in one transaction; returns their analysis ids"""
+
+        with span("db.query", op="save_results", results=len(results)), self._connect() as conn:
+            return [self._insert(conn, result) for result in results]
+
+    def _insert(self, conn, result):
+        result = json.loads(json.dumps(result, default=str))
+        extracted = result.get("extracted_data") or {}
+        raw_text = extracted.pop("raw_text", None)
+        document_hash = hashlib.sha256(raw_text.encode()).hexdigest() if raw_text is not None else None
+        if document_hash:
+            extracted["raw_text_hash"] = document_hash
+
+        contact = extracted.get("contact_info") or {}
+        analysis = result.get("analysis_results") or {}
+        skills = analysis.get("skills_analysis") or {}
+        screening = (result.get("screening_results") or {}).get("screening_score") or {}
+        recommendation = result.get("final_recommendation") or {}
+        matches = (result.get("job_matches") or {}).get("matched_jobs") or []
+        resume_data = result.get("resume_data") or {}
+        top = matches[0] if matches else {}
+
+        row = {
+            "candidate_name": contact.get("name"),
+            "email": contact.get("email"),
+            "phone": contact.get("phone"),
+            "location": contact.get("location"),
+            "experience_level": skills.get("experience_level") if isinstance(skills, dict) else None,
+            "years_of_experience": _number(skills.get("years_of_experience")) if isinstance(skills, dict) else None,
+            "confidence_score": _number(analysis.get("confidence_score")),
+            "screening_score": _number(screening.get("final_score")),
+            "recommendation_confidence": recommendation.get("confidence_level"),
+            "top_match_job_id": top.get("job_id"),
+            "top_match_score": top.get("match_score"),
+            "match_count": len(matches),
+            "status": result.get("status", "completed"),
+            "source_file": os.path.basename(resume_data.get("file_path") or "") or None,
+            "document_hash": document_hash,
+            "trace_id": (result.get("trace") or {}).get("trace_id"),
+            "submitted_at": resume_data.get("submission_timestamp"),
+            "result": json.dumps(result),
+        }
+
+        if raw_text is not None:
+            conn.execute(
+                "INSERT OR IGNORE INTO documents (hash, raw_text, chars) VALUES (?, ?, ?)",
+                (document_hash, raw_text, len(raw_text)),
+            )
+        cursor = conn.execute(
+            f"INSERT INTO analyses ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+            list(row.values()),
+        )
+        analysis_id = cursor.lastrowid
+        conn.executemany(
+            "INSERT OR IGNORE INTO candidate_skills (analysis_id, skill) VALUES (?, ?)",
+            [(analysis_id, skill) for skill in _skills(skills)],
+        )
+        self._insert_matches(conn, analysis_id, matches)
+        return analysis_id
+
+    def _insert_matches(self, conn, analysis_id, matches):
+        conn.executemany(
+            """
+            INSERT INTO matches (
+                analysis_id, job_id, rank, title, company, location,
+                match_score, llm_score, fuzzy_score, reason
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    analysis_id, m.get("job_id"), rank, m.get("title", ""), m.get("company"),
+                    m.get("location"), m.get("match_score", 0), m.get("llm_score"),
+                    m.get("fuzzy_score"), m.get("reason"),
+                )
+                for rank, m in enumerate(matches, 1)
+            ],
+        )
+
+    def analyses_matching_jobs(self, job_ids):
+        """{analysis_id: [job_id, ...]} for stored matches on any of these jobs"""
+
+        job_ids = list(job_ids)
+        found = {}
+        with self._connect() as conn:
+            for i in range(0, len(job_ids), 500):
+                chunk = job_ids[i : i + 500]
+                rows = conn.execute(
+                    f"SELECT analysis_id, job_id FROM matches WHERE job_id IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+                for analysis_id, job_id in rows:
+                    found.setdefault(analysis_id, []).append(job_id)
+        return found
+
+    def apply_match_delta(self, analysis_id, removed_job_ids=(), upserts=()):
+        """
+        Drop the matches on removed_job_ids, add/replace the `upserts` (match dicts
+        with a job_id), re-rank, and keep the summary columns and stored result in step
+        """
+
+        upserts = list(upserts)
+        drop = set(removed_job_ids) | {m["job_id"] for m in upserts}
+        with span("db.query", op="apply_match_delta"), self._connect() as conn:
+            row = conn.execute("SELECT result FROM analyses WHERE id = ?", (analysis_id,)).fetchone()
+            if row is None:
+                return False
+            result = json.loads(row["result"])
+            job_matches = result.get("job_matches") or {}
+            matches = [m for m in job_matches.get("matched_jobs") or [] if m.get("job_id") not in drop]
+            matches = sorted(matches + upserts, key=lambda m: m.get("match_score", 0), reverse=True)
+            job_matches.update({"matched_jobs": matches, "count": len(matches)})
+            result["job_matches"] = job_matches
+
+            conn.execute("DELETE FROM matches WHERE analysis_id = ?", (analysis_id,))
+            self._insert_matches(conn, analysis_id, matches)
+            top = matches[0] if matches else {}
+            conn.execute(
+                """
+                UPDATE analyses SET top_match_job_id = ?, top_match_score = ?, match_count = ?, result = ?
+                WHERE id = ?
+                """,
+                (top.get("job_id"), top.get("match_score"), len(matches), json.dumps(result), analysis_id),
+            )
+        return True
+
+    def get_meta(self, key, default=None):
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row["value"]) if row else default
+
+    def set_meta(self, key, value):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, json.dumps(value)),
+            )
+
+    def get(self, analysis_id, include_raw_text=True):
+        """The stored workflow context, with the raw resume text re-attached"""
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT result, document_hash FROM analyses WHERE id = ?", (analysis_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            result = json.loads(row["result"])
+            if include_raw_text and row["document_hash"]:
+                doc = conn.execute(
+                    "SELECT raw_text FROM documents WHERE hash = ?", (row["document_hash"],)
+                ).fetchone()
+                if doc is not None:
+                    result.setdefault("extracted_data", {})["raw_text"] = doc["raw_text"]
+        result["analysis_id"] = analysis_id
+        return result
+
+    def recent(self, limit=20):
+        """Latest analyses, newest first (summary columns only)"""
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {SUMMARY_COLUMNS} FROM analyses ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def find_candidates(self, email=None, min_screening_score=None, limit=50):
+        """Analyses filtered by email and/or minimum screening score, best first"""
+
+        where, params = [], []
+        if email:
+            where.append("email = ?")
+            params.append(email)
+        if min_screening_score is not None:
+            where.append("screening_score >= ?")
+            params.append(min_screening_score)
+        query = f"SELECT {SUMMARY_COLUMNS} FROM analyses"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY screening_score DESC, id DESC LIMIT ?"
+
+        with self._connect() as conn:
+            rows = conn.execute(query, params + [limit]).fetchall()
+        return [dict(r) for r in rows]
+
+    def top_candidates_for_job(self, job_id, k=10):
+        """
+        Best-scoring candidates matched to a job, one row per candidate. Only each
+        candidate's latest analysis counts (as in CandidateIndex): a re-uploaded resume
+        replaces the old one even if the old one scored higher or the new one didn't match.
+        """
+
+        # Walks idx_matches_job_score for the job; "a later analysis of the same
+        # candidate" (key COALESCE(document_hash, email, id)) is an index probe on
+        # document_hash or email per row.
+        query = f"""
+        SELECT m.match_score, m.llm_score, m.fuzzy_score, m.reason, m.rank,
+               {", ".join("a." + c for c in SUMMARY_COLUMNS.split(", "))}
+        FROM matches m JOIN analyses a ON a.id = m.analysis_id
+        WHERE m.job_id = ?
+          AND NOT EXISTS (
+              SELECT 1 FROM analyses b
+              WHERE b.document_hash = a.document_hash AND b.id > a.id
+          )
+          AND NOT EXISTS (
+              SELECT 1 FROM analyses b
+              WHERE a.document_hash IS NULL AND b.email = a.email
+                AND b.document_hash IS NULL AND b.id > a.id
+          )
+        ORDER BY m.match_score DESC, a.id DESC
+        LIMIT ?
+        """
+        with span("db.query", op="top_candidates_for_job", job_id=job_id), self._connect() as conn:
+            rows = conn.execute(query, (job_id, k)).fetchall()
+        return [dict(r) for r in rows]
+
+    def matches_for(self, analysis_id):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM matches WHERE analysis_id = ? ORDER BY rank", (analysis_id,)
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def candidate_skill_rows(self, after_id=0):
+        """
+        (analysis_id, candidate_key, experience_level, level_filter, skill) for analyses
+        with id > after_id, oldest first. candidate_key identifies the person across
+        re-uploads. level_filter is the level the matcher's job search filtered on (NULL
+        if it fell back to every level); analyses stored before it was recorded report
+        their experience level, defaulting to Mid-level like the matcher.
+        """
+
+        self.backfill_candidate_skills()
+        query = """
+        SELECT a.id AS analysis_id,
+               COALESCE(a.document_hash, a.email, CAST(a.id AS TEXT)) AS candidate_key,
+               a.experience_level,
+               CASE WHEN json_type(a.result, '$.job_matches.level_filter') IS NULL
+                    THEN COALESCE(a.experience_level, 'Mid-level')
+                    ELSE json_extract(a.result, '$.job_matches.level_filter') END AS level_filter,
+               s.skill
+        FROM analyses a LEFT JOIN candidate_skills s ON s.analysis_id = a.id
+        WHERE a.id > ? AND a.status = 'completed'
+        ORDER BY a.id
+        """
+        with self._connect() as conn:
+            return [tuple(r) for r in conn.execute(query, (after_id,))]
+
+    def backfill_candidate_skills(self):
+        """Fill candidate_skills for analyses saved before the table existed"""
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT id, result FROM analyses
+                WHERE id NOT IN (SELECT DISTINCT analysis_id FROM candidate_skills)
+                AND id > COALESCE((SELECT MAX(analysis_id) FROM candidate_skills), 0)
+                """
+            ).fetchall()
+            for row in rows:
+                skills = (json.loads(row["result"]).get("analysis_results") or {}).get("skills_analysis")
+                conn.executemany(
+                    "INSERT OR IGNORE INTO candidate_skills (analysis_id, skill) VALUES (?, ?)",
+                    [(row["id"], skill) for skill in _skills(skills)],
+                )
+        return len(rows)
+
+    def import_text_dumps(self, paths):
+        """Load legacy results/analysis_*.txt files (Python reprs, parsed without eval)"""
+
+        imported = []
+        for path in paths:
+            with open(path) as f:
+                text = f.read()
+            try:
+                result = ast.literal_eval(text)
+            except (ValueError, SyntaxError) as e:
+                print(f"Skipping {path}: {e}")
+                continue
+            imported.append(self.save(result))
+        return imported
+
+
+SUMMARY_COLUMNS = (
+    "id, candidate_name, email, location, experience_level, years_of_experience, "
+    "confidence_score, screening_score, recommendation_confidence, top_match_job_id, "
+    "top_match_score, match_count, status, source_file, document_hash, created_at"
+)
+
+
+def _skills(skills_analysis):
+    """Technical skills normalized the way MatcherAgent compares them"""
+    if not isinstance(skills_analysis, dict):
+        return []
+    skills = skills_analysis.get("technical_skills") or []
+    return sorted({str(s).lower().strip() for s in skills if str(s).strip()})
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query stored resume analyses")
+    parser.add_argument("--db", help="results database (default: $RESULTS_DB_PATH or db/results.sqlite)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    top = sub.add_parser("top-candidates", help="best candidates for a job id")
+    top.add_argument("job_id", type=int)
+    top.add_argument("-k", type=int, default=10)
+    recent = sub.add_parser("recent", help="latest analyses")
+    recent.add_argument("--limit", type=int, default=20)
+    show = sub.add_parser("show", help="full stored result as JSON")
+    show.add_argument("analysis_id", type=int)
+    dumps = sub.add_parser("import-dumps", help="import legacy results/analysis_*.txt files")
+    dumps.add_argument("paths", nargs="+")
+    args = parser.parse_args()
+
+    store = ResultsStore(args.db)
+    if args.command == "top-candidates":
+        rows = store.top_candidates_for_job(args.job_id, args.k)
+    elif args.command == "recent":
+        rows = store.recent(args.limit)
+    elif args.command == "show":
+        rows = store.get(args.analysis_id, include_raw_text=False)
+    else:
+        rows = {"imported": store.import_text_dumps(args.paths)}
+    print(json.dumps(rows, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
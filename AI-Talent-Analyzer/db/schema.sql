@@ -11,4 +11,27 @@ CREATE TABLE IF NOT EXISTS jobs (
     benefits TEXT,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
-);
\ No newline at end of file
+);
+
+-- Append-only log of catalog changes; seq is the watermark for incremental re-matching
+CREATE TABLE IF NOT EXISTS job_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id INTEGER NOT NULL,
+    op TEXT NOT NULL CHECK (op IN ('insert', 'update', 'delete')),
+    changed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TRIGGER IF NOT EXISTS jobs_after_insert AFTER INSERT ON jobs
+BEGIN
+    INSERT INTO job_changes (job_id, op) VALUES (NEW.id, 'insert');
+END;
+
+CREATE TRIGGER IF NOT EXISTS jobs_after_update AFTER UPDATE ON jobs
+BEGIN
+    INSERT INTO job_changes (job_id, op) VALUES (NEW.id, 'update');
+END;
+
+CREATE TRIGGER IF NOT EXISTS jobs_after_delete AFTER DELETE ON jobs
+BEGIN
+    INSERT INTO job_changes (job_id, op) VALUES (OLD.id, 'delete');
+END;
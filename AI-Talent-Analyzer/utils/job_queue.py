@@ -0,0 +1,176 @@
+import asyncio
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from utils.logger import request_context
+
+logger = logging.getLogger("AI_Recruiter.jobs")
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+class QueueFull(Exception):
+    """Raised by JobQueue.submit when max_pending jobs are already queued or running"""
+
+
+class JobProgress:
+    """
+    Progress sink handed to a running job.
+
+    Quacks like the Streamlit status box / progress bar the orchestrator expects
+    (write() and progress()) and collects streamed LLM tokens per stage.
+    """
+
+    def __init__(self, queue, job_id):
+        self._queue = queue
+        self.job_id = job_id
+
+    def write(self, message):
+        self._queue._update(self.job_id, message=str(message))
+
+    def text(self, message):
+        self.write(message)
+
+    def progress(self, value):
+        self._queue._update(self.job_id, progress=int(value))
+
+    def on_token(self, stage, token):
+        self._queue._append_stream(self.job_id, stage, token)
+
+
+class JobQueue:
+    """
+    In-process background worker service for resume pipeline jobs.
+
+    submit() returns a job id immediately; the handler runs on a worker thread with
+    its own long-lived event loop, so a Streamlit rerun never blocks on or restarts
+    a job. The UI polls get(job_id) for status, progress, streamed output and the
+    final result.
+    """
+
+    def __init__(self, handler, workers=2, keep_finished=500, max_pending=None):
+        """
+        handler: async callable (payload, JobProgress) -> result dict
+        max_pending: reject submissions (QueueFull) beyond this many queued + running jobs
+        """
+        self.handler = handler
+        self.workers = workers
+        self.keep_finished = keep_finished
+        self.max_pending = max_pending
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._loops = []
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job-worker")
+
+    def submit(self, payload):
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            if self.max_pending is not None and self._pending() >= self.max_pending:
+                raise QueueFull(f"{self.max_pending} jobs already pending")
+            self._jobs[job_id] = {
+                "id": job_id,
+                "status": QUEUED,
+                "message": "Queued",
+                "progress": 0,
+                "streams": {},
+                "result": None,
+                "error": None,
+                "submitted_at": datetime.now().isoformat(),
+                "started_at": None,
+                "finished_at": None,
+            }
+        self._executor.submit(self._execute, job_id, payload)
+        logger.info(f"Job {job_id} queued")
+        return job_id
+
+    def get(self, job_id):
+        """Snapshot of a job record, or None if unknown/pruned"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            snapshot = dict(job)
+            snapshot["streams"] = dict(job["streams"])
+            return snapshot
+
+    def pending(self):
+        """Number of jobs queued or running"""
+        with self._lock:
+            return self._pending()
+
+    def _pending(self):
+        return sum(1 for j in self._jobs.values() if j["status"] in (QUEUED, RUNNING))
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+        if wait:
+            # workers are gone: finish the loops' async generators (open LLM streams) and close them
+            for loop in self._loops:
+                loop.run_until_complete(loop.shutdown_asyncgens())
+                loop.close()
+            self._loops.clear()
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields)
+
+    def _append_stream(self, job_id, stage, token):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job["streams"][stage] = job["streams"].get(stage, "") + token
+
+    def _execute(self, job_id, payload):
+        self._update(job_id, status=RUNNING, message="Processing...", started_at=datetime.now().isoformat())
+        try:
+            with request_context(job_id):
+                result = self._worker_loop().run_until_complete(self.handler(payload, JobProgress(self, job_id)))
+            result = result or {}
+            status = COMPLETED if result.get("status", COMPLETED) == COMPLETED else FAILED
+            fields = {"progress": 100} if status == COMPLETED else {}
+            self._update(
+                job_id,
+                status=status,
+                result=result,
+                error=result.get("error"),
+                finished_at=datetime.now().isoformat(),
+                **fields,
+            )
+            logger.info(f"Job {job_id} {status}")
+        except Exception as e:
+            self._update(job_id, status=FAILED, error=str(e), finished_at=datetime.now().isoformat())
+            logger.error(f"Job {job_id} failed: {str(e)}", exc_info=True)
+        finally:
+            self._prune()
+
+    def _worker_loop(self):
+        """
+        One long-lived event loop per worker thread, so loop-bound resources (the
+        async LLM client and its connections) are reused across jobs
+        """
+        loop = getattr(self._local, "loop", None)
+        if loop is None or loop.is_closed():
+            loop = self._local.loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            with self._lock:
+                self._loops.append(loop)
+        return loop
+
+    def _prune(self):
+        """Forget the oldest finished jobs beyond keep_finished"""
+        with self._lock:
+            finished = [j for j in self._jobs.values() if j["status"] in (COMPLETED, FAILED)]
+            excess = len(finished) - self.keep_finished
+            if excess > 0:
+                finished.sort(key=lambda j: j["finished_at"] or "")
+                for job in finished[:excess]:
+                    del self._jobs[job["id"]]
@@ -1,22 +1,166 @@
+"""
+Application logging.
+
+Records are handed to a queue on the calling thread (QueueHandler) and written
+by a background QueueListener, so agents and request handlers never block on
+file or console I/O. The log file is JSON lines, rotated by size or by time,
+and every record carries the request id set with request_context(). Levels
+can be set per module, e.g. LOG_LEVELS="httpx=WARNING,AI_Recruiter.agents=DEBUG".
+
+Environment:
+    LOG_DIR            directory for recruitment.log (default: logs)
+    LOG_LEVEL          root level (default: INFO)
+    LOG_LEVELS         comma-separated logger=LEVEL overrides
+    LOG_MAX_BYTES      rotate when the file reaches this size (default: 10 MB)
+    LOG_BACKUP_COUNT   rotated files to keep (default: 5)
+    LOG_ROTATE_WHEN    rotate on a schedule instead, e.g. "midnight" or "H"
+"""
+
+import atexit
+import contextlib
+import contextvars
+import json
 import logging
-from datetime import datetime
+import logging.handlers
 import os
+import queue
+import threading
+from datetime import datetime, timezone
 
+# third-party loggers that log every HTTP request at INFO
+DEFAULT_LEVELS = {
+    "httpx": "WARNING",
+    "httpcore": "WARNING",
+    "openai": "WARNING",
+    "urllib3": "WARNING",
+}
 
-def setup_logger():
-    """Setup application logging"""
-    log_dir = "logs"
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
+_request_id = contextvars.ContextVar("request_id", default=None)
+_listeners = []
+_setup_lock = threading.Lock()
+
+# LogRecord attributes that are not user-supplied `extra` fields
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+
+def get_request_id():
+    return _request_id.get()
+
+
+@contextlib.contextmanager
+def request_context(request_id):
+    """Tag every record logged inside this block (and tasks started from it) with request_id"""
+    token = _request_id.set(request_id)
+    try:
+        yield request_id
+    finally:
+        _request_id.reset(token)
+
+
+class RequestIdFilter(logging.Filter):
+    def filter(self, record):
+        if getattr(record, "request_id", None) is None:
+            record.request_id = _request_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message, request id and any extras"""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+            "thread": record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str)
 
-    log_file = os.path.join(
-        log_dir, f"recruitment_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-    )
 
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[logging.FileHandler(log_file), logging.StreamHandler()],
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Keeps records structured: args merged and traceback pre-rendered, but fields intact"""
+
+    def prepare(self, record):
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def async_handler(*handlers):
+    """
+    A QueueHandler feeding `handlers` from a background listener thread. The
+    listener is stopped (and the queue drained) at interpreter exit.
+    """
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+    handler = _QueueHandler(log_queue)
+    handler.addFilter(RequestIdFilter())
+    return handler
+
+
+def rotating_file_handler(path):
+    """Size-based rotation by default; time-based when LOG_ROTATE_WHEN is set"""
+    backups = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+    when = os.getenv("LOG_ROTATE_WHEN")
+    if when:
+        return logging.handlers.TimedRotatingFileHandler(path, when=when, backupCount=backups, encoding="utf-8")
+    return logging.handlers.RotatingFileHandler(
+        path, maxBytes=int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024))),
+        backupCount=backups, encoding="utf-8",
     )
 
-    return logging.getLogger("AI_Recruiter")
\ No newline at end of file
+
+def parse_levels(spec):
+    """'httpx=WARNING,AI_Recruiter.agents=DEBUG' -> {'httpx': 'WARNING', ...}"""
+    levels = {}
+    for item in (spec or "").split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logger(log_dir=None, level=None, levels=None):
+    """
+    Setup application logging. Safe to call on every Streamlit rerun: the
+    handlers and listener thread are only installed once per process.
+    """
+    with _setup_lock:
+        root = logging.getLogger()
+        if not any(isinstance(h, _QueueHandler) for h in root.handlers):
+            log_dir = log_dir or os.getenv("LOG_DIR", "logs")
+            os.makedirs(log_dir, exist_ok=True)
+
+            file_handler = rotating_file_handler(os.path.join(log_dir, "recruitment.log"))
+            file_handler.setFormatter(JsonFormatter())
+            console = logging.StreamHandler()
+            console.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+
+            root.addHandler(async_handler(file_handler, console))
+            root.setLevel(level or os.getenv("LOG_LEVEL", "INFO").upper())
+
+            for name, lvl in {**DEFAULT_LEVELS, **parse_levels(os.getenv("LOG_LEVELS")), **(levels or {})}.items():
+                logging.getLogger(name).setLevel(lvl)
+
+    return logging.getLogger("AI_Recruiter")
+
+
+@atexit.register
+def _stop_listeners():
+    while _listeners:
+        _listeners.pop().stop()
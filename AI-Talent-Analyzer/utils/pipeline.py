@@ -0,0 +1,62 @@
+import logging
+import os
+import uuid
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+
+from agents.registry import get_registry
+from db.results_store import ResultsStore
+
+logger = logging.getLogger("AI_Recruiter.pipeline")
+
+UPLOAD_DIR = Path("uploads")
+
+
+@lru_cache(maxsize=None)
+def get_results_store():
+    """One results store per process"""
+    return ResultsStore()
+
+
+def warm_up():
+    """Build the shared agents and resources before the first request; returns step timings (ms)"""
+    return get_registry().warm_up()
+
+
+def build_orchestrator(progress):
+    """A per-request orchestrator over the process's shared, warm agents"""
+    return get_registry().orchestrator(progress, progress, on_token=progress.on_token)
+
+
+def save_upload(data, filename):
+    """Write an uploaded resume under uploads/ with a unique name and return its path"""
+    UPLOAD_DIR.mkdir(exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    file_path = UPLOAD_DIR / f"resume_{timestamp}_{uuid.uuid4().hex[:8]}_{os.path.basename(filename)}"
+    with open(file_path, "wb") as f:
+        f.write(data)
+    return str(file_path)
+
+
+async def process_resume(resume_data, progress):
+    """
+    Run the full pipeline for one queued submission (executes on a JobQueue worker
+    thread) and store the finished result. Uploaded files are removed afterwards.
+    """
+    file_path = resume_data.get("file_path")
+    try:
+        orchestrator = build_orchestrator(progress)
+        result = await orchestrator.process_application(resume_data)
+        if result["status"] == "completed":
+            result["analysis_id"] = get_results_store().save(result)
+        return result
+    except Exception as e:
+        logger.error(f"Error processing resume: {str(e)}")
+        raise
+    finally:
+        if file_path:
+            try:
+                os.remove(file_path)
+            except Exception as e:
+                logger.error(f"Error removing temporary file: {str(e)}")
@@ -0,0 +1,176 @@
+import json
+import logging
+
+logger = logging.getLogger("AI_Recruiter.prompt_context")
+
+# Rough chars-per-token ratio for llama-style tokenizers on English/JSON text
+CHARS_PER_TOKEN = 4
+
+DEFAULT_TOKEN_BUDGET = 1200
+
+
+def estimate_tokens(text):
+    """Cheap token estimate used for prompt budgeting (no tokenizer needed)"""
+    return (len(text or "") + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def truncate(text, limit):
+    text = " ".join(str(text or "").split())
+    return text if len(text) <= limit else text[: max(0, limit - 3)].rstrip() + "..."
+
+
+class ContextCompactor:
+    """
+    Builds a compact, bounded-size digest of the workflow context for LLM prompts.
+
+    The raw context carries the full resume text and every matched job's requirements;
+    the digest keeps only what the screener/recommender actually reason about and
+    shrinks itself step by step until it fits the token budget.
+    """
+
+    # Progressively tighter limits, tried in order until the digest fits the budget.
+    # Every list and string is capped at each level, so even the last one is bounded.
+    LEVELS = [
+        {"matches": 5, "skills": 40, "domains": 10, "education": 3, "achievements": 5, "chars": 200},
+        {"matches": 3, "skills": 25, "domains": 8, "education": 2, "achievements": 3, "chars": 120},
+        {"matches": 2, "skills": 15, "domains": 5, "education": 2, "achievements": 2, "chars": 80},
+        {"matches": 1, "skills": 10, "domains": 3, "education": 1, "achievements": 1, "chars": 60},
+        {"matches": 1, "skills": 5, "domains": 2, "education": 1, "achievements": 0, "chars": 40},
+    ]
+    ITEM_CHARS = 40  # one skill / domain / name
+    SCORE_FIELDS = 12  # scalar entries kept from a screening score blob
+
+    def __init__(self, token_budget=DEFAULT_TOKEN_BUDGET, top_n_matches=5):
+        self.token_budget = token_budget
+        self.top_n_matches = top_n_matches
+
+    def digest(self, context, level=None):
+        """Compact dict view of the workflow context at the given shrink level"""
+        limits = dict(level or self.LEVELS[0])
+        limits["matches"] = min(limits["matches"], self.top_n_matches)
+        chars = limits["chars"]
+        item_chars = min(chars, self.ITEM_CHARS)
+
+        extracted = context.get("extracted_data") or {}
+        analysis = context.get("analysis_results") or {}
+        if isinstance(analysis, str):
+            try:
+                analysis = json.loads(analysis)
+            except ValueError:
+                analysis = {}
+        skills_analysis = analysis.get("skills_analysis") or {}
+        contact = extracted.get("contact_info") or {}
+
+        education = skills_analysis.get("education") or []
+        if isinstance(education, dict):
+            education = [education]
+
+        digest = {
+            "candidate": {
+                "name": truncate(contact.get("name", "Not specified"), item_chars),
+                "location": truncate(contact.get("location", "Not specified"), item_chars),
+            },
+            "profile": {
+                "experience_level": skills_analysis.get("experience_level"),
+                "years_of_experience": skills_analysis.get("years_of_experience"),
+                "education": [
+                    truncate(
+                        " ".join(str(e.get(k, "")) for k in ("degree", "field") if e.get(k)),
+                        chars,
+                    )
+                    for e in [e for e in education if isinstance(e, dict)][: limits["education"]]
+                ],
+                "domain_expertise": [
+                    truncate(d, item_chars)
+                    for d in list(skills_analysis.get("domain_expertise") or [])[: limits["domains"]]
+                ],
+                "technical_skills": [
+                    truncate(t, item_chars)
+                    for t in list(skills_analysis.get("technical_skills") or [])[: limits["skills"]]
+                ],
+                "key_achievements": [
+                    truncate(a, chars)
+                    for a in list(skills_analysis.get("key_achievements") or [])[
+                        : limits["achievements"]
+                    ]
+                ],
+                "analyzer_confidence": analysis.get("confidence_score"),
+            },
+        }
+
+        matches = (context.get("job_matches") or {}).get("matched_jobs") or []
+        if matches:
+            digest["top_matches"] = [
+                {
+                    "title": truncate(m.get("title"), item_chars * 2),
+                    "company": truncate(m.get("company"), item_chars),
+                    "match_score": m.get("match_score"),
+                    "reason": truncate(m.get("reason"), chars),
+                }
+                for m in matches[: limits["matches"]]
+            ]
+            digest["total_matches"] = len(matches)
+
+        screening = context.get("screening_results") or {}
+        if screening:
+            digest["screening"] = {
+                "score": self._bounded_scores(screening.get("screening_score"), item_chars),
+                "summary": truncate(screening.get("screening_summary"), chars * 4),
+            }
+
+        return digest
+
+    def _bounded_scores(self, blob, item_chars):
+        """Scalar fields of a screening score blob, capped in count and string length"""
+        if not isinstance(blob, dict):
+            return truncate(blob, item_chars) if blob is not None else None
+        bounded = {}
+        for key, value in blob.items():
+            if len(bounded) >= self.SCORE_FIELDS:
+                break
+            if value is None or isinstance(value, (bool, int, float)):
+                bounded[str(key)[:item_chars]] = value
+            elif isinstance(value, str):
+                bounded[str(key)[:item_chars]] = truncate(value, item_chars)
+        return bounded
+
+    def render(self, context, original=None):
+        """
+        Return (prompt_text, stats) for the smallest shrink level that fits the budget.
+
+        `original` is the text that would have been sent without compaction; it is only
+        used to report the before/after prompt size. If even the tightest level is over
+        budget it is still returned (it is bounded, just larger than the budget), with
+        stats["over_budget"] set and a warning logged.
+        """
+        text = ""
+        for level in self.LEVELS:
+            text = json.dumps(self.digest(context, level), separators=(",", ":"), default=str)
+            if estimate_tokens(text) <= self.token_budget:
+                break
+
+        if original is None:
+            original = json.dumps(context, indent=2, default=str)
+
+        stats = {
+            "before_chars": len(original),
+            "after_chars": len(text),
+            "before_tokens": estimate_tokens(original),
+            "after_tokens": estimate_tokens(text),
+            "token_budget": self.token_budget,
+            "over_budget": estimate_tokens(text) > self.token_budget,
+        }
+        if stats["over_budget"]:
+            logger.warning(
+                f"Prompt digest is ~{stats['after_tokens']} tokens at the tightest level, "
+                f"over the {self.token_budget} token budget"
+            )
+        return text, stats
+
+
+def format_prompt_stats(stats):
+    return (
+        f"prompt compacted {stats['before_chars']} -> {stats['after_chars']} chars "
+        f"(~{stats['before_tokens']} -> ~{stats['after_tokens']} tokens, "
+        f"budget {stats['token_budget']}{', over budget' if stats.get('over_budget') else ''})"
+    )
@@ -0,0 +1,119 @@
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+
+from utils.skills import vocabulary
+
+ROLE_PROFILES_PATH = Path(__file__).parent.parent / "data" / "role_profiles.json"
+
+# Score given when a title does not resolve to any known role profile
+NEUTRAL_ROLE_SCORE = 60.0
+
+
+def tokenize_title(title):
+    """Split a job title into lowercase word tokens ("C++"/"CI/CD" stay intact)"""
+    return re.findall(r"[a-z0-9+#/]+", (title or "").lower().replace("-", " "))
+
+
+class RoleProfile:
+    """One role with its must/good skills compiled into skill-id sets"""
+
+    def __init__(self, name, must, good, keywords):
+        self.name = name
+        self.must = frozenset(vocabulary.skill_id(s) for s in must)
+        self.good = frozenset(vocabulary.skill_id(s) for s in good)
+        self.keywords = [name] + [k for k in keywords if k != name]
+
+    def hit_ratios(self, skill_ids):
+        """Fraction of must-have and nice-to-have skills covered by skill_ids"""
+        must_ratio = len(self.must & skill_ids) / len(self.must) if self.must else 0.0
+        good_ratio = len(self.good & skill_ids) / len(self.good) if self.good else 0.0
+        return must_ratio, good_ratio
+
+    def score(self, skill_ids):
+        """Role relevance (0-100): 70 points for must-have skills, 30 for nice-to-have"""
+        must_ratio, good_ratio = self.hit_ratios(skill_ids)
+        return round(must_ratio * 70 + good_ratio * 30, 2)
+
+
+class RoleResolver:
+    """Token index over role keywords that maps free-form job titles to role profiles"""
+
+    def __init__(self, profiles):
+        self.profiles = {p.name: p for p in profiles}
+
+        # first token -> [(keyword tokens, role name)]
+        self._index = {}
+        for profile in profiles:
+            for keyword in profile.keywords:
+                tokens = tuple(tokenize_title(keyword))
+                if tokens:
+                    self._index.setdefault(tokens[0], []).append((tokens, profile.name))
+
+        self.resolve = lru_cache(maxsize=4096)(self._resolve)
+
+    def _resolve(self, title):
+        """Return the best matching role profiles for a title (ties are all returned)"""
+        tokens = tokenize_title(title)
+        hits = {}
+
+        for i, token in enumerate(tokens):
+            for kw_tokens, role in self._index.get(token, ()):
+                if tuple(tokens[i : i + len(kw_tokens)]) == kw_tokens:
+                    hits.setdefault(role, set()).add(kw_tokens)
+
+        if not hits:
+            return ()
+
+        best = max(len(kws) for kws in hits.values())
+        return tuple(self.profiles[r] for r, kws in hits.items() if len(kws) == best)
+
+    def best_profile(self, title, skills):
+        """Highest scoring profile for the title and skills, or None if unresolved"""
+        return self._best(title, skills)[0]
+
+    def _best(self, title, skills):
+        """
+        (best profile or None, candidate skill ids). Uses vocabulary.lookup() so
+        candidate skills are never interned: unknown skills can't hit a profile anyway,
+        and the shared vocabulary must not grow with every resume.
+        """
+        profiles = self.resolve(title or "")
+        if not profiles:
+            return None, frozenset()
+
+        skill_ids = vocabulary.lookup(skills)
+        return max(profiles, key=lambda p: p.score(skill_ids)), skill_ids
+
+    def hit_ratios(self, title, skills):
+        """(must, good) hit ratios for the best profile; NaN when the title is unresolved"""
+        profile, skill_ids = self._best(title, skills)
+        if profile is None:
+            return float("nan"), float("nan")
+        return profile.hit_ratios(skill_ids)
+
+    def score(self, title, skills):
+        """Best role score across the profiles the title resolves to"""
+        profile, skill_ids = self._best(title, skills)
+        if profile is None:
+            return NEUTRAL_ROLE_SCORE
+        return profile.score(skill_ids)
+
+
+@lru_cache(maxsize=None)
+def load_role_resolver(path=ROLE_PROFILES_PATH):
+    """Load role profiles from disk once per process and build the resolver"""
+    with open(path) as f:
+        table = json.load(f)
+
+    profiles = [
+        RoleProfile(
+            name=name,
+            must=spec.get("must", []),
+            good=spec.get("good", []),
+            keywords=spec.get("keywords", []),
+        )
+        for name, spec in table.items()
+    ]
+    return RoleResolver(profiles)
@@ -0,0 +1,51 @@
+import re
+import threading
+
+
+def normalize_skill(skill):
+    """Lowercase, strip and collapse whitespace so equal skills compare equal"""
+    return re.sub(r"\s+", " ", str(skill or "")).strip().lower()
+
+
+class SkillVocabulary:
+    """Process-wide mapping of normalized skill names to small integer ids"""
+
+    def __init__(self):
+        self._ids = {}
+        self._names = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._names)
+
+    def skill_id(self, skill):
+        """Return the id for a skill, assigning a new one on first sight"""
+        name = normalize_skill(skill)
+        sid = self._ids.get(name)
+        if sid is not None:
+            return sid
+
+        with self._lock:
+            sid = self._ids.get(name)
+            if sid is None:
+                sid = len(self._names)
+                self._names.append(name)
+                self._ids[name] = sid
+            return sid
+
+    def skill_ids(self, skills):
+        """Map an iterable of skill names to a frozenset of ids"""
+        return frozenset(self.skill_id(s) for s in skills or [] if normalize_skill(s))
+
+    def lookup(self, skills):
+        """Like skill_ids() but never grows the vocabulary (unknown skills are dropped)"""
+        ids = self._ids
+        return frozenset(
+            ids[name] for name in (normalize_skill(s) for s in skills or []) if name in ids
+        )
+
+    def name(self, sid):
+        return self._names[sid]
+
+
+vocabulary = SkillVocabulary()
@@ -0,0 +1,238 @@
+"""
+Lightweight tracing for the resume pipeline.
+
+    with start_trace("resume", source="cv.pdf") as trace:
+        with span("stage.analysis"):
+            with span("llm.query", prompt_chars=1200) as s:
+                ...
+                s.set(completion_tokens=180)
+    print(trace.format_summary())
+
+Every finished span is logged as one JSON line on the "AI_Recruiter.trace"
+logger and collected on the current trace, which is tracked per thread/task
+with contextvars. configure_tracing() adds a JSON-lines file for those logs
+and, optionally, an OpenTelemetry SDK exporter writing spans to a local file.
+"""
+
+import contextvars
+import json
+import logging
+import os
+import time
+import uuid
+from datetime import datetime
+
+from utils.logger import async_handler, get_request_id, rotating_file_handler
+
+logger = logging.getLogger("AI_Recruiter.trace")
+
+STAGES = ["extraction", "analysis", "matching", "screening", "recommendation"]
+
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+_current_span = contextvars.ContextVar("current_span", default=None)
+_otel_tracer = None
+
+
+class Span:
+    def __init__(self, name, trace, parent, attributes):
+        self.name = name
+        self.trace_id = trace.trace_id if trace else None
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        # stage spans are named "stage.<name>"; everything under them inherits the stage
+        if name.startswith("stage."):
+            self.stage = name.split(".", 1)[1]
+        else:
+            self.stage = parent.stage if parent else None
+        self.attributes = dict(attributes)
+        self.status = "ok"
+        self.start_time = time.time()
+        self.duration_ms = None
+        self._trace = trace
+        self._started = time.perf_counter()
+        self._tokens = None
+        self._otel_span = None
+        self._otel_context = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+        return self
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "request_id": get_request_id(),
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "stage": self.stage,
+            "start": datetime.fromtimestamp(self.start_time).isoformat(),
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+    def __enter__(self):
+        self._tokens = _current_span.set(self)
+        if _otel_tracer is not None:
+            self._otel_context = _otel_tracer.start_as_current_span(self.name)
+            self._otel_span = self._otel_context.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration_ms = round((time.perf_counter() - self._started) * 1000, 3)
+        if exc is not None:
+            self.status = "error"
+            self.attributes.setdefault("error", str(exc))
+        try:
+            _current_span.reset(self._tokens)
+        except ValueError:
+            # exited from another context (e.g. an async generator closed elsewhere)
+            _current_span.set(None)
+
+        if self._otel_span is not None:
+            self._otel_span.set_attributes(_otel_attributes(self))
+            self._otel_context.__exit__(exc_type, exc, tb)
+
+        if self._trace is not None:
+            self._trace.spans.append(self)
+        logger.info(json.dumps(self.to_dict(), default=str))
+        return False
+
+
+class Trace:
+    """All spans recorded while processing one resume"""
+
+    def __init__(self, name, **attributes):
+        self.trace_id = uuid.uuid4().hex
+        self.name = name
+        self.attributes = attributes
+        self.spans = []
+        self._root = None
+        self._token = None
+
+    def __enter__(self):
+        self._token = _current_trace.set(self)
+        self._root = Span(self.name, self, None, self.attributes).__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._root.__exit__(exc_type, exc, tb)
+        _current_trace.reset(self._token)
+        return False
+
+    @property
+    def duration_ms(self):
+        """Total time so far, or the final total once the trace has ended"""
+        if self._root is None:
+            return None
+        if self._root.duration_ms is None:
+            return round((time.perf_counter() - self._root._started) * 1000, 3)
+        return self._root.duration_ms
+
+    def summary(self):
+        """One row per stage: wall time, LLM calls/tokens/latency, DB queries and PDF extraction"""
+
+        rows = {}
+        for s in self.spans:
+            if s.stage is None:
+                continue
+            row = rows.setdefault(s.stage, {
+                "stage": s.stage, "ms": 0.0, "llm_calls": 0, "llm_ms": 0.0, "prompt_chars": 0,
+                "completion_tokens": 0, "cache_hits": 0, "db_queries": 0, "db_ms": 0.0,
+                "pdf_ms": 0.0, "errors": 0,
+            })
+            if s.name == f"stage.{s.stage}":
+                row["ms"] += s.duration_ms
+            elif s.name.startswith("llm."):
+                row["llm_calls"] += 1
+                row["llm_ms"] += s.duration_ms
+                row["prompt_chars"] += s.attributes.get("prompt_chars", 0)
+                row["completion_tokens"] += s.attributes.get("completion_tokens") or 0
+                row["cache_hits"] += int(bool(s.attributes.get("cache_hit")))
+            elif s.name.startswith("db."):
+                row["db_queries"] += 1
+                row["db_ms"] += s.duration_ms
+            elif s.name.startswith("pdf."):
+                row["pdf_ms"] += s.duration_ms
+            row["errors"] += int(s.status == "error")
+
+        order = {stage: i for i, stage in enumerate(STAGES)}
+        result = sorted(rows.values(), key=lambda r: order.get(r["stage"], len(order)))
+        for row in result:
+            for key in ("ms", "llm_ms", "db_ms", "pdf_ms"):
+                row[key] = round(row[key], 1)
+        return result
+
+    def format_summary(self):
+        rows = self.summary()
+        columns = [
+            ("stage", "stage", 16), ("ms", "ms", 10), ("llm_calls", "llm calls", 11),
+            ("llm_ms", "llm ms", 10), ("prompt_chars", "prompt chars", 14),
+            ("completion_tokens", "compl tok", 11), ("cache_hits", "cached", 8),
+            ("db_queries", "db q", 6), ("db_ms", "db ms", 8), ("pdf_ms", "pdf ms", 8),
+        ]
+        lines = [f"Trace {self.trace_id} ({self.duration_ms} ms)"]
+        lines.append("".join(f"{title:<{w}}" if key == "stage" else f"{title:>{w}}" for key, title, w in columns))
+        for row in rows:
+            lines.append("".join(
+                f"{row[key]:<{w}}" if key == "stage" else f"{row[key]:>{w}}" for key, _, w in columns
+            ))
+        return "\n".join(lines)
+
+
+def start_trace(name, **attributes):
+    return Trace(name, **attributes)
+
+
+def span(name, **attributes):
+    """Context manager timing a block as a child of the current span"""
+    return Span(name, _current_trace.get(), _current_span.get(), attributes)
+
+
+def current_trace():
+    return _current_trace.get()
+
+
+def _otel_attributes(s):
+    attributes = {"stage": s.stage or "", "status": s.status}
+    for key, value in s.attributes.items():
+        if value is None:
+            continue
+        attributes[key] = value if isinstance(value, (str, bool, int, float)) else str(value)
+    return attributes
+
+
+def configure_tracing(log_dir=None, otel_file=None):
+    """
+    Write span JSON lines to <log_dir or $LOG_DIR>/trace.jsonl (rotated like the
+    app log, written off-thread), and, when otel_file (or $TRACE_OTEL_FILE) is set,
+    also export OpenTelemetry spans to that file. Safe to call more than once.
+    """
+    global _otel_tracer
+
+    if not any(getattr(h, "_trace_jsonl", False) for h in logger.handlers):
+        log_dir = log_dir or os.getenv("LOG_DIR", "logs")
+        os.makedirs(log_dir, exist_ok=True)
+        file_handler = rotating_file_handler(os.path.join(log_dir, "trace.jsonl"))
+        file_handler.setFormatter(logging.Formatter("%(message)s"))
+        handler = async_handler(file_handler)
+        handler._trace_jsonl = True
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        # spans go to their own file rather than the console/app log
+        logger.propagate = False
+
+    otel_file = otel_file or os.environ.get("TRACE_OTEL_FILE")
+    if otel_file and _otel_tracer is None:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+
+        provider = TracerProvider(resource=Resource.create({"service.name": "ai-talent-analyzer"}))
+        exporter = ConsoleSpanExporter(
+            out=open(otel_file, "a"),
+            formatter=lambda s: s.to_json(indent=None) + os.linesep,
+        )
+        provider.add_span_processor(BatchSpanProcessor(exporter))
+        _otel_tracer = provider.get_tracer("ai_talent_analyzer")
@@ -0,0 +1,143 @@
+'''Answer cache in front of the RAG chain: exact tier on normalized text + semantic tier'''
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+
+def normalize_question(question):
+    '''Lowercase, collapse whitespace and drop trailing punctuation'''
+
+    text = re.sub(r"\s+", " ", question or "").strip().lower()
+    return text.rstrip("?!. ")
+
+
+class AnswerCache:
+    '''
+    Caches answers per corpus version.
+
+    - exact tier: normalized question text -> answer (one SQLite lookup)
+    - semantic tier: cosine similarity between the new question's embedding and
+      every cached question of the same corpus version; returns the closest
+      answer when the similarity is at least `threshold`
+
+    Entries from other corpus versions are dropped when the version changes, so
+    re-ingesting documents invalidates every cached answer. The app's version also
+    covers the answer settings (model, prompt, retrieval), see rag.answer_cache_version.
+    '''
+
+    def __init__(self, path, embeddings, corpus_version, threshold=0.93, max_entries=5000):
+        self.path = path
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.max_entries = max_entries
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS answers (
+                corpus_version TEXT NOT NULL,
+                question TEXT NOT NULL,
+                answer TEXT NOT NULL,
+                embedding BLOB,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (corpus_version, question)
+            )"""
+        )
+        self._conn.commit()
+        self.corpus_version = None
+        self.set_corpus_version(corpus_version)
+
+    def set_corpus_version(self, corpus_version):
+        '''Switch to a corpus version, deleting answers cached for any other version'''
+
+        with self._lock:
+            if corpus_version == self.corpus_version:
+                return
+            deleted = self._conn.execute(
+                "DELETE FROM answers WHERE corpus_version != ?", (corpus_version,)
+            ).rowcount
+            self._conn.commit()
+            self.corpus_version = corpus_version
+            self._load_matrix()
+        if deleted:
+            logging.info(f"Answer cache: invalidated {deleted} answers from older corpus versions")
+
+    def _load_matrix(self):
+        rows = self._conn.execute(
+            "SELECT question, answer, embedding FROM answers "
+            "WHERE corpus_version = ? AND embedding IS NOT NULL",
+            (self.corpus_version,),
+        ).fetchall()
+        self._answers = [(q, a) for q, a, _ in rows]
+        if rows:
+            self._matrix = np.vstack([np.frombuffer(e, dtype=np.float32) for _, _, e in rows])
+        else:
+            self._matrix = None
+
+    def _embed(self, question):
+        vec = np.asarray(self.embeddings.embed_query(question), dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def lookup(self, question):
+        '''Return (answer, tier, seconds) on a hit or (None, None, seconds) on a miss'''
+
+        start = time.perf_counter()
+        key = normalize_question(question)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT answer FROM answers WHERE corpus_version = ? AND question = ?",
+                (self.corpus_version, key),
+            ).fetchone()
+        if row:
+            return row[0], "exact", time.perf_counter() - start
+
+        with self._lock:
+            matrix, answers = self._matrix, self._answers
+        if matrix is not None:
+            sims = matrix @ self._embed(key)
+            best = int(np.argmax(sims))
+            if sims[best] >= self.threshold:
+                logging.info(
+                    f"Answer cache: semantic hit ({sims[best]:.3f}) on '{answers[best][0]}'"
+                )
+                return answers[best][1], "semantic", time.perf_counter() - start
+
+        return None, None, time.perf_counter() - start
+
+    def store(self, question, answer):
+        key = normalize_question(question)
+        vec = self._embed(key)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO answers "
+                "(corpus_version, question, answer, embedding, created_at) VALUES (?, ?, ?, ?, ?)",
+                (self.corpus_version, key, answer, vec.astype(np.float32).tobytes(), time.time()),
+            )
+            pruned = self._conn.execute(
+                "DELETE FROM answers WHERE rowid IN ("
+                "SELECT rowid FROM answers ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+            self._conn.commit()
+
+            if pruned:
+                self._load_matrix()
+                return
+            # keep the in-memory matrix in step without re-reading the table
+            existing = next((i for i, (q, _) in enumerate(self._answers) if q == key), None)
+            if existing is not None:
+                self._answers[existing] = (key, answer)
+                self._matrix[existing] = vec
+            else:
+                self._answers = self._answers + [(key, answer)]
+                row = vec[np.newaxis, :]
+                self._matrix = row if self._matrix is None else np.vstack([self._matrix, row])
@@ -0,0 +1,58 @@
+'''Answer stages shared by the app and the benchmarks: retrieve, rerank, stream the answer'''
+
+import logging
+import time
+
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+
+ANSWER_TEMPLATE = """Answer the question based ONLY on the following {context}
+    Question: {question}"""
+
+
+def format_docs(docs):
+    '''Join retrieved chunks into the prompt context'''
+
+    return "\n\n".join(doc.page_content for doc in docs)
+
+
+def create_answer_chain(llm):
+    '''Prompt -> LLM -> text, fed with an already retrieved context'''
+
+    prompt = ChatPromptTemplate.from_template(ANSWER_TEMPLATE)
+    return prompt | llm | StrOutputParser()
+
+
+def retrieve_context(retriever, question, reranker=None):
+    '''Retrieve (and rerank) the chunks for a question, returning (docs, per-stage timings)'''
+
+    docs, timings = retriever.retrieve_with_timings(question)
+    if reranker is not None:
+        docs, rerank_stats = reranker.rerank(question, docs)
+        timings.update(rerank_stats)
+    return docs, timings
+
+
+def stream_answer(answer_chain, docs, question, timings):
+    '''Yield answer tokens as the LLM produces them, recording first-token and generation time'''
+
+    start = time.perf_counter()
+    for token in answer_chain.stream({"context": format_docs(docs), "question": question}):
+        if "first_token" not in timings:
+            timings["first_token"] = time.perf_counter() - start
+        yield token
+    timings["generation"] = time.perf_counter() - start
+    timings.setdefault("first_token", timings["generation"])
+    logging.info(
+        "Question timings: expansion %.2fs, retrieval %.2fs, rerank %.2fs, first token %.2fs, generation %.2fs",
+        timings["expansion"], timings["retrieval"], timings.get("rerank", 0.0),
+        timings["first_token"], timings["generation"],
+    )
+
+
+def answer_question(retriever, answer_chain, question, reranker=None):
+    '''Retrieve, rerank, then generate, returning (answer, per-stage timings in seconds)'''
+
+    docs, timings = retrieve_context(retriever, question, reranker)
+    answer = "".join(stream_answer(answer_chain, docs, question, timings))
+    return answer, timings
@@ -0,0 +1,330 @@
+'''
+Offline RAG benchmark: ingestion throughput, per-stage query latency, memory and
+retrieval quality, using the app's ingestion/retrieval/rerank/answer stages with a
+deterministic stand-in LLM and embedder (no Ollama needed).
+
+    python bench_rag.py                              # bundled paper + eval_questions.json
+    python bench_rag.py --synthetic-docs 500         # synthetic corpus with planted facts
+    python bench_rag.py --json run.json --baseline previous.json
+'''
+
+import argparse
+import json
+import os
+import random
+import re
+import resource
+import shutil
+import tempfile
+import time
+from functools import partial
+
+import numpy as np
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.prompts import PromptTemplate
+
+from answering import create_answer_chain, stream_answer
+from bm25 import BM25Index, MirroredStore, tokenize
+from compare_chunkers import EVAL_QUESTIONS_PATH, load_eval_questions, squash
+from embeddings import HashEmbeddings
+from ingestion import IngestManifest, MANIFEST_NAME, discover_sources, load_and_chunk_pdf, sync_vector_store
+from quantized_store import QuantizedVectorStore
+from rerank import ContextReranker, LexicalScorer
+from retrieval import FusionRetriever, HybridRetriever
+
+STAGES = ("expansion", "retrieval", "rerank", "first_token", "generation", "total")
+EXPANSION_PROMPT = PromptTemplate.from_template(
+    "Generate different versions of the given user question, one per line.\nOriginal question: {question}"
+)
+
+
+class DeterministicChatModel(BaseChatModel):
+    '''
+    Stand-in chat model. Query-expansion prompts get a few word-level rephrasings;
+    answer prompts get the context sentence sharing the most words with the
+    question. `ms_per_token` simulates generation speed when streaming.
+    '''
+
+    ms_per_token: float = 0.0
+    n_rephrasings: int = 3
+
+    @property
+    def _llm_type(self):
+        return "deterministic-fake"
+
+    def _respond(self, prompt):
+        if "versions of the given user question" in prompt:
+            question = prompt.rsplit(":", 1)[-1].strip()
+            words = question.rstrip("?").split()
+            variants = [
+                " ".join(tokenize(question)),
+                " ".join(reversed(words)),
+                " ".join(words[len(words) // 2 :]),
+            ]
+            return "\n".join(variants[: self.n_rephrasings])
+
+        context, _, question = prompt.rpartition("Question:")
+        terms = set(tokenize(question))
+        sentences = [s for s in re.split(r"(?<=[.!?])\s+", context) if s.strip()] or [""]
+        return max(sentences, key=lambda s: len(terms & set(tokenize(s)))).strip()
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        text = self._respond(messages[-1].content)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        for token in re.findall(r"\S+\s*", self._respond(messages[-1].content)):
+            if self.ms_per_token:
+                time.sleep(self.ms_per_token / 1000)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+
+def load_and_chunk_text(path, chunking):
+    '''chunk_fn for synthetic .txt documents (one "page" per 3000 characters)'''
+
+    from langchain_core.documents import Document
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    with open(path) as f:
+        text = f.read()
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunking["chunk_size"], chunk_overlap=chunking["chunk_overlap"]
+    )
+    chunks = splitter.split_documents([Document(page_content=text, metadata={"source": path, "page": 0})])
+    return path, max(1, len(text) // 3000), chunks
+
+
+def synthetic_corpus(directory, n_docs, paragraphs=12, facts_per_doc=2, seed=0):
+    '''
+    Write n_docs text files of filler prose with planted facts, and return
+    questions whose answers are those facts.
+    '''
+
+    rng = random.Random(seed)
+    syllables = ["ka", "lo", "mi", "ra", "ten", "vor", "sil", "an", "dru", "pel", "qu", "zen", "or", "bi"]
+    vocabulary = sorted({"".join(rng.choices(syllables, k=rng.randint(2, 4))) for _ in range(3000)})
+    cities = [w.capitalize() for w in rng.sample(vocabulary, 200)]
+    questions = []
+    os.makedirs(directory, exist_ok=True)
+    for d in range(n_docs):
+        paras = [
+            " ".join(
+                (" ".join(rng.choices(vocabulary, k=rng.randint(8, 16))) + ".").capitalize()
+                for _ in range(rng.randint(3, 6))
+            )
+            for _ in range(paragraphs)
+        ]
+        for f in range(facts_per_doc):
+            project = f"{rng.choice(vocabulary)}{d}x{f}"
+            city = rng.choice(cities)
+            fact = f"Project {project} was founded in {city} by the {rng.choice(vocabulary)} team."
+            slot = rng.randrange(len(paras))
+            paras[slot] = f"{paras[slot]} {fact}"
+            questions.append(
+                {"question": f"Where was project {project} founded?",
+                 "answer": f"Project {project} was founded in {city}"}
+            )
+        with open(os.path.join(directory, f"doc_{d:05d}.txt"), "w") as fh:
+            fh.write("\n\n".join(paras))
+    return questions
+
+
+def peak_rss_mb():
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def percentiles(samples):
+    values = np.asarray(samples) * 1000
+    return {
+        "p50": round(float(np.percentile(values, 50)), 3),
+        "p95": round(float(np.percentile(values, 95)), 3),
+        "mean": round(float(values.mean()), 3),
+    }
+
+
+def relevance(docs, answer):
+    '''1-based ranks of the docs that contain the answer text'''
+
+    target = squash(answer)
+    return [rank for rank, d in enumerate(docs, 1) if target in squash(d.page_content)]
+
+
+def open_store(backend, directory, embeddings):
+    if backend == "chroma":
+        from langchain_community.vectorstores import Chroma
+
+        return Chroma(embedding_function=embeddings, collection_name="bench", persist_directory=directory)
+    return QuantizedVectorStore(embeddings, directory)
+
+
+def run(args):
+    workdir = tempfile.mkdtemp(prefix="bench_rag_")
+    try:
+        rss_start = peak_rss_mb()
+        chunking = {"splitter": args.splitter, "chunk_size": args.chunk_size, "chunk_overlap": args.chunk_overlap}
+        if args.synthetic_docs:
+            corpus_dir = os.path.join(workdir, "corpus")
+            questions = synthetic_corpus(corpus_dir, args.synthetic_docs)
+            questions = random.Random(1).sample(questions, min(args.questions, len(questions)))
+            sources = discover_sources(corpus_dir, patterns=("*.txt",))
+            chunk_fn = partial(load_and_chunk_text, chunking=chunking)
+            corpus = {"kind": "synthetic", "documents": len(sources)}
+        else:
+            eval_set = load_eval_questions()
+            document = os.path.join(os.path.dirname(EVAL_QUESTIONS_PATH), eval_set["document"])
+            questions = eval_set["questions"]
+            sources = [document]
+            chunk_fn = partial(load_and_chunk_pdf, chunking=chunking)
+            corpus = {"kind": "paper", "documents": 1, "path": eval_set["document"]}
+
+        embeddings = HashEmbeddings(dim=args.dim)
+        store_dir = os.path.join(workdir, "store")
+        vector_db = open_store(args.backend, store_dir, embeddings)
+        lexical_index = BM25Index()
+        manifest = IngestManifest(os.path.join(store_dir, MANIFEST_NAME), chunking)
+        summary = sync_vector_store(
+            MirroredStore(vector_db, lexical_index), sources, chunk_fn, manifest, workers=args.workers
+        )
+        rss_ingested = peak_rss_mb()
+
+        llm = DeterministicChatModel(ms_per_token=args.llm_ms_per_token)
+        base = vector_db.as_retriever(search_kwargs={"k": args.candidates})
+        if args.retriever == "hybrid":
+            retriever = HybridRetriever(
+                vector_retriever=base, lexical_index=lexical_index,
+                top_k=args.candidates, candidates=args.candidates,
+            )
+        else:
+            retriever = FusionRetriever(
+                base_retriever=base,
+                variant_retriever=vector_db.as_retriever(search_kwargs={"k": args.retrieval_k}),
+                llm=llm, query_prompt=EXPANSION_PROMPT,
+                expansion_mode=args.expansion, top_k=args.candidates,
+            )
+        reranker = ContextReranker(LexicalScorer(), top_n=args.top_n, token_budget=args.token_budget)
+        answer_chain = create_answer_chain(llm)
+
+        chunk_texts = [squash(text) for text, _ in lexical_index.docs.values()]
+        stage_samples = {stage: [] for stage in STAGES}
+        quality = {"candidates": [], "context": []}
+        context_tokens = []
+        skipped = 0
+        for item in questions:
+            start = time.perf_counter()
+            candidates, timings = retriever.retrieve_with_timings(item["question"])
+            docs, rerank_stats = reranker.rerank(item["question"], candidates)
+            timings.update(rerank_stats)
+            "".join(stream_answer(answer_chain, docs, item["question"], timings))
+            timings["total"] = time.perf_counter() - start
+            for stage in STAGES:
+                stage_samples[stage].append(timings.get(stage, 0.0))
+            context_tokens.append(timings["context_tokens_after"])
+
+            # relevant chunks: those in the store whose text contains the answer
+            answer = squash(item["answer"])
+            n_relevant = sum(1 for text in chunk_texts if answer in text)
+            if not n_relevant:
+                skipped += 1  # the splitter cut the answer across chunks
+                continue
+            for name, results in (("candidates", candidates), ("context", docs)):
+                ranks = relevance(results, item["answer"])
+                quality[name].append((bool(ranks), len(ranks) / n_relevant, 1.0 / ranks[0] if ranks else 0.0))
+
+        def summarize(rows, k):
+            if not rows:
+                return {}
+            hits, recalls, rr = zip(*rows)
+            return {f"hit@{k}": round(float(np.mean(hits)), 4),
+                    f"recall@{k}": round(float(np.mean(recalls)), 4),
+                    "mrr": round(float(np.mean(rr)), 4)}
+
+        results = {
+            "config": {k: v for k, v in vars(args).items() if k not in ("json", "baseline")},
+            "corpus": {**corpus, "chunks": len(lexical_index), "questions": len(questions),
+                       "questions_unlabeled": skipped},
+            "ingestion": {k: summary[k] for k in ("pages", "chunks_embedded", "seconds",
+                                                  "pages_per_sec", "chunks_per_sec")},
+            "latency_ms": {stage: percentiles(samples) for stage, samples in stage_samples.items()},
+            "quality": {
+                "candidates": summarize(quality["candidates"], args.candidates),
+                "context": summarize(quality["context"], args.top_n),
+                "context_tokens_mean": round(float(np.mean(context_tokens)), 1),
+            },
+            "memory_mb": {
+                "peak_rss_start": rss_start,
+                "peak_rss_after_ingestion": rss_ingested,
+                "peak_rss_end": peak_rss_mb(),
+            },
+        }
+        if isinstance(vector_db, QuantizedVectorStore):
+            results["memory_mb"]["vector_index"] = round(vector_db.footprint()["total"] / 1e6, 2)
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def flatten(data, prefix=""):
+    out = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            out.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            out[f"{prefix}{key}"] = value
+    return out
+
+
+def print_report(results, baseline=None):
+    flat = flatten({k: results[k] for k in ("ingestion", "latency_ms", "quality", "memory_mb")})
+    base = flatten({k: baseline.get(k, {}) for k in ("ingestion", "latency_ms", "quality", "memory_mb")}) \
+        if baseline else {}
+    corpus = results["corpus"]
+    print(f"{corpus['kind']} corpus: {corpus['documents']} documents, {corpus['chunks']} chunks, "
+          f"{corpus['questions']} questions ({corpus['questions_unlabeled']} without a labeled chunk)")
+    for key, value in flat.items():
+        line = f"  {key:<40}{value:>12}"
+        if key in base:
+            delta = value - base[key]
+            pct = f" ({delta / base[key] * 100:+.1f}%)" if base[key] else ""
+            line += f"   baseline {base[key]:>10}  delta {delta:+.4g}{pct}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--synthetic-docs", type=int, default=0, help="use a synthetic corpus of N documents")
+    parser.add_argument("--questions", type=int, default=100, help="questions sampled from a synthetic corpus")
+    parser.add_argument("--splitter", choices=["recursive", "structured"], default="recursive")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--chunk-overlap", type=int, default=300)
+    parser.add_argument("--backend", choices=["quantized", "chroma"], default="quantized")
+    parser.add_argument("--retriever", choices=["multi_query", "hybrid"], default="multi_query")
+    parser.add_argument("--expansion", choices=["always", "never", "auto"], default="auto")
+    parser.add_argument("--retrieval-k", type=int, default=4, help="search depth per rephrased query")
+    parser.add_argument("--candidates", type=int, default=12, help="chunks handed to the reranker (dense search depth)")
+    parser.add_argument("--top-n", type=int, default=4)
+    parser.add_argument("--token-budget", type=int, default=1500)
+    parser.add_argument("--dim", type=int, default=256, help="stand-in embedding dimension")
+    parser.add_argument("--llm-ms-per-token", type=float, default=0.0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="earlier --json output to compare against")
+    args = parser.parse_args()
+
+    if args.splitter == "structured" and args.synthetic_docs:
+        parser.error("--splitter structured needs PDFs; synthetic corpora are plain text")
+
+    results = run(args)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    print_report(results, baseline)
+
+
+if __name__ == "__main__":
+    main()
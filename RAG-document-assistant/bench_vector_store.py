@@ -0,0 +1,168 @@
+'''Benchmark vector backends: memory footprint, query latency and recall@k against exact search'''
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from quantized_store import QuantizedVectorStore, normalize
+
+
+class PrecomputedEmbeddings(Embeddings):
+    '''Returns vectors registered up front by text, so no embedding model is needed'''
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def embed_documents(self, texts):
+        return [self.vectors[t].tolist() for t in texts]
+
+    def embed_query(self, text):
+        return self.vectors[text].tolist()
+
+
+def synthetic_corpus(n, dim, clusters, seed=0):
+    '''Clustered unit vectors, closer to real chunk embeddings than uniform noise'''
+
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    assign = rng.integers(0, clusters, n)
+    return normalize(centers[assign] + 0.6 * rng.standard_normal((n, dim)).astype(np.float32))
+
+
+def percentile_ms(samples, q):
+    return round(float(np.percentile(samples, q)) * 1000, 3)
+
+
+def dir_bytes(path):
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, files in os.walk(path)
+        for name in files
+    )
+
+
+def run_queries(search, queries, truth, k):
+    latencies, recalls = [], []
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        docs = search(query, k)
+        latencies.append(time.perf_counter() - start)
+        found = {d.metadata["row"] for d in docs}
+        recalls.append(len(found & expected) / k)
+    return {
+        "p50_ms": percentile_ms(latencies, 50),
+        "p95_ms": percentile_ms(latencies, 95),
+        f"recall@{k}": round(float(np.mean(recalls)), 4),
+    }
+
+
+def bench(n, dim, n_queries, k, clusters, batch_size, workdir):
+    corpus = synthetic_corpus(n, dim, clusters)
+    rng = np.random.default_rng(1)
+    queries = normalize(
+        corpus[rng.integers(0, n, n_queries)] + 0.3 * rng.standard_normal((n_queries, dim)).astype(np.float32)
+    )
+    texts = [f"chunk-{i}" for i in range(n)]
+    metadatas = [{"row": i} for i in range(n)]
+    vectors = {t: v for t, v in zip(texts, corpus)}
+    vectors.update({f"query-{j}": q for j, q in enumerate(queries)})
+    embeddings = PrecomputedEmbeddings(vectors)
+
+    # ground truth: exact float32 search over the whole matrix
+    truth = [set(np.argsort(-(corpus @ q))[:k].tolist()) for q in queries]
+    results = {"chunks": n, "dim": dim, "queries": n_queries, "k": k, "backends": {}}
+
+    def exact_search(query, k):
+        top = np.argsort(-(corpus @ np.asarray(query, dtype=np.float32)))[:k]
+        return [Document(page_content=texts[i], metadata={"row": int(i)}) for i in top]
+
+    results["backends"]["float32-exact"] = {
+        "index_bytes": corpus.nbytes,
+        "disk_bytes": 0,
+        **run_queries(exact_search, queries, truth, k),
+    }
+
+    path = os.path.join(workdir, "quantized")
+    start = time.perf_counter()
+    store = QuantizedVectorStore(embeddings, path)
+    for i in range(0, n, batch_size):
+        store.add_texts(texts[i : i + batch_size], metadatas[i : i + batch_size],
+                        ids=texts[i : i + batch_size])
+    build = time.perf_counter() - start
+    footprint = store.footprint()
+    results["backends"]["quantized-int8"] = {
+        "build_s": round(build, 2),
+        "index_bytes": footprint["codes"] + footprint["scales"],
+        "disk_bytes": dir_bytes(path),
+        **run_queries(store.similarity_search_by_vector, queries, truth, k),
+    }
+
+    try:
+        import chromadb  # noqa: F401
+        from langchain_community.vectorstores import Chroma
+    except ImportError:
+        Chroma = None
+        print("chromadb not installed: skipping the chroma-hnsw baseline")
+    if Chroma is not None:
+        path = os.path.join(workdir, "chroma")
+        start = time.perf_counter()
+        chroma = Chroma(embedding_function=embeddings, collection_name="bench", persist_directory=path)
+        for i in range(0, n, batch_size):
+            chroma.add_texts(texts[i : i + batch_size], metadatas[i : i + batch_size],
+                             ids=texts[i : i + batch_size])
+        build = time.perf_counter() - start
+        # HNSW keeps the float32 vectors plus graph links in memory
+        hnsw = [
+            os.path.join(root, f)
+            for root, _, files in os.walk(path)
+            for f in files
+            if f.endswith(".bin")
+        ]
+        results["backends"]["chroma-hnsw"] = {
+            "build_s": round(build, 2),
+            "index_bytes": sum(os.path.getsize(f) for f in hnsw) or n * dim * 4,
+            "disk_bytes": dir_bytes(path),
+            **run_queries(chroma.similarity_search_by_vector, queries, truth, k),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunks", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=768, help="768 matches nomic-embed-text")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--clusters", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_vector_store_")
+    try:
+        results = bench(args.chunks, args.dim, args.queries, args.k, args.clusters,
+                        args.batch_size, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"{results['chunks']} chunks x {results['dim']} dims, {results['queries']} queries, k={args.k}")
+    print(f"{'backend':<16}{'index MB':>10}{'disk MB':>10}{'p50 ms':>10}{'p95 ms':>10}{'recall':>9}")
+    for name, r in results["backends"].items():
+        print(
+            f"{name:<16}{r['index_bytes'] / 1e6:>10.1f}{r['disk_bytes'] / 1e6:>10.1f}"
+            f"{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r[f'recall@{args.k}']:>9.3f}"
+        )
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
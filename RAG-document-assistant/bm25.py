@@ -0,0 +1,167 @@
+'''Local sparse lexical (BM25) index over the same chunks as the vector store'''
+
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import tempfile
+import threading
+from collections import Counter
+
+from langchain_core.documents import Document
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this "
+    "to was were which with what how why who does do".split()
+)
+
+
+def tokenize(text):
+    return [t for t in re.findall(r"\w+", text.lower()) if t not in STOPWORDS]
+
+
+class BM25Index:
+    '''
+    Okapi BM25 over chunk texts, keyed by the same ids as the vector store so both
+    indexes are updated together during ingestion. Persisted as JSON (texts and
+    metadata); postings are rebuilt on load.
+    '''
+
+    def __init__(self, path=None, k1=1.5, b=0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self.docs = {}  # id -> (text, metadata)
+        self.postings = {}  # term -> {id: term frequency}
+        self.lengths = {}  # id -> token count
+        self.total_length = 0
+        self.corpus_version = None  # manifest corpus version the index was saved at
+        self.dirty = False
+        self._lock = threading.RLock()
+        if path and os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return len(self.docs)
+
+    def add(self, doc_id, text, metadata=None):
+        with self._lock:
+            if doc_id in self.docs:
+                self.remove(doc_id)
+            tokens = tokenize(text)
+            self.docs[doc_id] = (text, dict(metadata or {}))
+            self.lengths[doc_id] = len(tokens)
+            self.total_length += len(tokens)
+            for term, tf in Counter(tokens).items():
+                self.postings.setdefault(term, {})[doc_id] = tf
+            self.dirty = True
+
+    def remove(self, doc_id):
+        with self._lock:
+            entry = self.docs.pop(doc_id, None)
+            if entry is None:
+                return
+            self.total_length -= self.lengths.pop(doc_id, 0)
+            for term in set(tokenize(entry[0])):
+                posting = self.postings.get(term)
+                if posting is not None:
+                    posting.pop(doc_id, None)
+                    if not posting:
+                        del self.postings[term]
+            self.dirty = True
+
+    def search(self, query, k=4):
+        '''Top-k (id, score) pairs for the query'''
+
+        with self._lock:
+            n = len(self.docs)
+            if not n:
+                return []
+            avgdl = self.total_length / n or 1.0
+            scores = {}
+            for term in set(tokenize(query)):
+                posting = self.postings.get(term)
+                if not posting:
+                    continue
+                idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+                for doc_id, tf in posting.items():
+                    norm = tf + self.k1 * (1 - self.b + self.b * self.lengths[doc_id] / avgdl)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+            return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+    def documents(self, query, k=4):
+        '''Top-k chunks as LangChain Documents'''
+
+        with self._lock:
+            return [
+                Document(page_content=self.docs[doc_id][0], metadata=dict(self.docs[doc_id][1]))
+                for doc_id, _ in self.search(query, k)
+            ]
+
+    def rebuild_from(self, vector_db):
+        '''Rebuild from the vector store (missing index, or one out of step with the manifest)'''
+
+        with self._lock:
+            self.docs, self.postings, self.lengths, self.total_length = {}, {}, {}, 0
+        data = vector_db.get(include=["documents", "metadatas"])
+        for doc_id, text, meta in zip(data["ids"], data["documents"], data["metadatas"]):
+            self.add(doc_id, text or "", meta)
+        logging.info(f"BM25 index rebuilt from vector store ({len(self)} chunks)")
+
+    def load(self):
+        with open(self.path) as f:
+            data = json.load(f)
+        for doc_id, (text, meta) in data.get("docs", {}).items():
+            self.add(doc_id, text, meta)
+        self.corpus_version = data.get("corpus_version")
+        self.dirty = False
+        logging.info(f"Loaded BM25 index ({len(self)} chunks)")
+
+    def save(self, corpus_version=None):
+        '''Atomically persist the index if it (or the corpus version) changed'''
+
+        with self._lock:
+            if corpus_version is not None and corpus_version != self.corpus_version:
+                self.corpus_version = corpus_version
+                self.dirty = True
+            if not self.path or not self.dirty:
+                return
+            directory = os.path.dirname(self.path) or "."
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(
+                    {
+                        "corpus_version": self.corpus_version,
+                        "docs": {i: list(v) for i, v in self.docs.items()},
+                    },
+                    f,
+                )
+            os.replace(tmp, self.path)
+            self.dirty = False
+
+
+class MirroredStore:
+    '''
+    Vector store facade used during ingestion: every add/delete is applied to the
+    vector store and mirrored into the BM25 index, so the two never drift apart.
+    '''
+
+    def __init__(self, vector_db, lexical_index):
+        self.vector_db = vector_db
+        self.lexical_index = lexical_index
+
+    def get(self, *args, **kwargs):
+        return self.vector_db.get(*args, **kwargs)
+
+    def add_documents(self, documents, ids):
+        self.vector_db.add_documents(documents, ids=ids)
+        for doc_id, doc in zip(ids, documents):
+            self.lexical_index.add(doc_id, doc.page_content, doc.metadata)
+
+    def delete(self, ids):
+        self.vector_db.delete(ids=ids)
+        for doc_id in ids:
+            self.lexical_index.remove(doc_id)
@@ -0,0 +1,189 @@
+'''Structure-aware PDF chunking: split on section headings with page and section metadata'''
+
+import re
+from collections import Counter
+
+NUMBERED_HEADING = re.compile(r"^(\d+(?:\.\d+)*)\.?\s+\S")
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def _clean(text):
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def extract_blocks(path):
+    '''
+    Text blocks of a PDF in reading order as dicts with page, text, and the heading
+    level (0 for body text). Headings are short, all-bold blocks that are numbered
+    ("3.2 Attention") or set larger than the body font. Bare page numbers are dropped.
+    Returns (page_count, blocks).
+    '''
+
+    import fitz  # PyMuPDF
+
+    raw = []
+    sizes = Counter()
+    with fitz.open(path) as doc:
+        page_count = doc.page_count
+        for page_no, page in enumerate(doc):
+            for block in page.get_text("dict")["blocks"]:
+                if block["type"] != 0:
+                    continue
+                spans = [s for line in block["lines"] for s in line["spans"] if s["text"].strip()]
+                if not spans:
+                    continue
+                text = _clean(" ".join(s["text"] for s in spans))
+                for s in spans:
+                    sizes[round(s["size"])] += len(s["text"])
+                raw.append((page_no, text, spans, len(block["lines"])))
+
+    body_size = sizes.most_common(1)[0][0] if sizes else 10
+    blocks = []
+    for page_no, text, spans, n_lines in raw:
+        if text.isdigit():
+            continue
+        level = 0
+        bold = all(s["flags"] & 16 for s in spans)
+        if bold and n_lines <= 2 and len(text) <= 120:
+            numbered = NUMBERED_HEADING.match(text)
+            if numbered:
+                level = numbered.group(1).count(".") + 1
+            elif spans[0]["size"] > body_size + 0.5:
+                level = 1
+        blocks.append({"page": page_no, "text": text, "level": level})
+    return page_count, blocks
+
+
+class StructuredChunker:
+    '''
+    Groups consecutive paragraphs of one section into chunks of up to `chunk_size`
+    characters. Chunks never cross a heading; within a section, consecutive chunks
+    share only the trailing sentence(s) of the previous chunk, up to
+    `chunk_overlap` characters. Paragraphs longer than `chunk_size` are split on
+    sentence boundaries.
+    '''
+
+    def __init__(self, chunk_size=1000, chunk_overlap=100):
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+
+    def _pieces(self, text):
+        '''Split an over-long paragraph on sentence boundaries (hard-wrap as a last resort)'''
+
+        if len(text) <= self.chunk_size:
+            return [text]
+        pieces, current = [], ""
+        for sentence in SENTENCE_END.split(text):
+            while len(sentence) > self.chunk_size:
+                pieces.append(sentence[: self.chunk_size])
+                sentence = sentence[self.chunk_size :]
+            if current and len(current) + 1 + len(sentence) > self.chunk_size:
+                pieces.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}".strip()
+        if current:
+            pieces.append(current)
+        return pieces
+
+    def _split_at(self, text, limit):
+        '''(leading sentences of text within limit characters, the rest); hard-wraps if none fit'''
+
+        if limit <= 0:
+            return "", text
+        sentences = SENTENCE_END.split(text)
+        head = ""
+        for i, sentence in enumerate(sentences):
+            candidate = f"{head} {sentence}".strip()
+            if len(candidate) > limit:
+                break
+            head = candidate
+        else:
+            return head, ""
+        if not head:
+            return text[:limit], text[limit:]
+        return head, " ".join(sentences[i:])
+
+    def _tail(self, text):
+        '''Trailing whole sentences of text, at most chunk_overlap characters'''
+
+        if self.chunk_overlap <= 0:
+            return ""
+        tail = ""
+        for sentence in reversed(SENTENCE_END.split(text)):
+            candidate = f"{sentence} {tail}".strip()
+            if len(candidate) > self.chunk_overlap:
+                break
+            tail = candidate
+        return tail
+
+    def split_blocks(self, blocks, source):
+        from langchain_core.documents import Document
+
+        chunks = []
+        section_path = []
+        parts, first_page, last_page = [], None, None
+
+        def heading_only():
+            return len(parts) == 1 and bool(section_path) and parts[0] == section_path[-1][1]
+
+        def flush(carry=""):
+            nonlocal parts, first_page, last_page
+            # a heading directly followed by a sub-heading lives on in the section path
+            if parts and not heading_only():
+                text = "\n".join(parts)
+                chunks.append(
+                    Document(
+                        page_content=text,
+                        metadata={
+                            "source": source,
+                            "page": first_page,
+                            "page_end": last_page,
+                            "section": " > ".join(title for _, title in section_path),
+                        },
+                    )
+                )
+                carry = carry and self._tail(text)
+            parts = [carry] if carry else []
+            first_page = last_page if carry else None
+
+        for block in blocks:
+            if block["level"]:
+                flush()
+                section_path = [(lvl, t) for lvl, t in section_path if lvl < block["level"]]
+                section_path.append((block["level"], block["text"]))
+                parts, first_page, last_page = [block["text"]], block["page"], block["page"]
+                continue
+
+            for piece in self._pieces(block["text"]):
+                size = sum(len(p) + 1 for p in parts)
+                if parts and size + len(piece) > self.chunk_size:
+                    if heading_only():
+                        # keep the heading with as many leading sentences as fit
+                        head, piece = self._split_at(piece, self.chunk_size - size)
+                        if not head:
+                            parts.append(piece)
+                            last_page = block["page"]
+                            continue
+                        parts.append(head)
+                        last_page = block["page"]
+                        if not piece:
+                            continue
+                    flush(carry=True)
+                    if parts and len(parts[0]) + 1 + len(piece) > self.chunk_size:
+                        # no room for the overlap tail next to this piece
+                        parts, first_page = [], None
+                if first_page is None:
+                    first_page = block["page"]
+                parts.append(piece)
+                last_page = block["page"]
+        flush()
+        return chunks
+
+
+def load_and_chunk_structured(path, chunk_size=1000, chunk_overlap=100):
+    '''(page_count, chunks) for one PDF using the structure-aware chunker'''
+
+    page_count, blocks = extract_blocks(path)
+    chunker = StructuredChunker(chunk_size, chunk_overlap)
+    return page_count, chunker.split_blocks(blocks, path)
@@ -0,0 +1,116 @@
+'''Compare chunking strategies: chunk count, ingestion time and retrieval quality on the eval questions'''
+
+import argparse
+import json
+import os
+import re
+import time
+
+import numpy as np
+
+from embeddings import HashEmbeddings
+from ingestion import load_and_chunk_pdf
+
+EVAL_QUESTIONS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "eval_questions.json")
+
+STRATEGIES = {
+    "recursive-1000/300": {"splitter": "recursive", "chunk_size": 1000, "chunk_overlap": 300},
+    "structured-1000/100": {"splitter": "structured", "chunk_size": 1000, "chunk_overlap": 100},
+}
+
+
+def squash(text):
+    '''Lowercase with all whitespace removed, so PDF spacing differences don't matter'''
+
+    return re.sub(r"\s+", "", text).lower()
+
+
+def load_eval_questions(path=EVAL_QUESTIONS_PATH):
+    with open(path) as f:
+        return json.load(f)
+
+
+def create_embedder(kind):
+    if kind == "ollama":
+        from langchain_ollama import OllamaEmbeddings
+
+        import rag
+
+        return OllamaEmbeddings(model=rag.embedding_model)
+    return HashEmbeddings(dim=768)
+
+
+def evaluate(chunks, questions, embedder, k):
+    '''Embed the chunks, then hit@k / MRR of the chunk containing each expected answer'''
+
+    start = time.perf_counter()
+    matrix = np.asarray(embedder.embed_documents([c.page_content for c in chunks]), dtype=np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-12
+    embed_seconds = time.perf_counter() - start
+
+    texts = [squash(c.page_content) for c in chunks]
+    hits, reciprocal_ranks, context_chars = [], [], []
+    for item in questions:
+        query = np.asarray(embedder.embed_query(item["question"]), dtype=np.float32)
+        ranked = np.argsort(-(matrix @ query))[:k]
+        answer = squash(item["answer"])
+        rank = next((r for r, i in enumerate(ranked, 1) if answer in texts[i]), None)
+        hits.append(rank is not None)
+        reciprocal_ranks.append(1.0 / rank if rank else 0.0)
+        context_chars.append(sum(len(chunks[i].page_content) for i in ranked))
+    return {
+        "embed_s": round(embed_seconds, 3),
+        f"hit@{k}": round(float(np.mean(hits)), 3),
+        "mrr": round(float(np.mean(reciprocal_ranks)), 3),
+        "context_chars": int(np.mean(context_chars)),
+    }
+
+
+def compare(document, questions, embedder, k, strategies=STRATEGIES):
+    results = {}
+    for name, chunking in strategies.items():
+        start = time.perf_counter()
+        _, pages, chunks = load_and_chunk_pdf(document, chunking)
+        chunk_seconds = time.perf_counter() - start
+        quality = evaluate(chunks, questions, embedder, k)
+        results[name] = {
+            "pages": pages,
+            "chunks": len(chunks),
+            "chars_embedded": sum(len(c.page_content) for c in chunks),
+            "chunk_s": round(chunk_seconds, 3),
+            "ingest_s": round(chunk_seconds + quality["embed_s"], 3),
+            "with_section": sum(1 for c in chunks if c.metadata.get("section")),
+            **quality,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--document", help="PDF to chunk (default: the eval set's document)")
+    parser.add_argument("--embedder", choices=["hash", "ollama"], default="hash",
+                        help="hash: offline stand-in; ollama: the app's embedding model")
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    eval_set = load_eval_questions()
+    document = args.document or os.path.join(os.path.dirname(EVAL_QUESTIONS_PATH), eval_set["document"])
+    results = compare(document, eval_set["questions"], create_embedder(args.embedder), args.k)
+
+    print(f"{os.path.basename(document)}: {len(eval_set['questions'])} questions, "
+          f"{args.embedder} embeddings, k={args.k}")
+    print(f"{'strategy':<22}{'chunks':>8}{'chars':>9}{'ingest s':>10}"
+          f"{'hit@k':>8}{'mrr':>7}{'ctx chars':>11}")
+    for name, r in results.items():
+        print(
+            f"{name:<22}{r['chunks']:>8}{r['chars_embedded']:>9}{r['ingest_s']:>10.2f}"
+            f"{r[f'hit@{args.k}']:>8.3f}{r['mrr']:>7.3f}{r['context_chars']:>11}"
+        )
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
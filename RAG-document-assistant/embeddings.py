@@ -0,0 +1,154 @@
+'''Batched, concurrent and persistently cached embeddings'''
+
+import hashlib
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.embeddings import Embeddings
+
+
+def text_key(text):
+    '''Cache key for a text: SHA-256 of its UTF-8 bytes'''
+
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    '''SQLite store of embeddings keyed by (model, text hash), vectors kept as float32 blobs'''
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            )"""
+        )
+        self._conn.commit()
+
+    def get_many(self, model, keys):
+        '''Return {text_hash: vector} for the keys present in the cache'''
+
+        found = {}
+        keys = list(keys)
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                batch = keys[i : i + 500]
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? "
+                    f"AND text_hash IN ({','.join('?' * len(batch))})",
+                    [model, *batch],
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = array("f", blob).tolist()
+        return found
+
+    def put_many(self, model, items):
+        '''Store {text_hash: vector}'''
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector) VALUES (?, ?, ?)",
+                [(model, key, array("f", vec).tobytes()) for key, vec in items.items()],
+            )
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+
+class CachedEmbeddings(Embeddings):
+    '''
+    Wraps another LangChain embeddings object (e.g. OllamaEmbeddings) so that
+    - texts are sent to the embedding endpoint in batches of `batch_size`,
+      with up to `concurrency` batches in flight,
+    - identical texts are embedded once per call, and
+    - every vector is cached by (model, text hash), so repeated chunks and
+      repeated questions never hit the endpoint twice.
+    '''
+
+    def __init__(self, inner, model_name, cache_path=None, batch_size=32, concurrency=4):
+        self.inner = inner
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.cache = EmbeddingCache(cache_path) if cache_path else None
+        self.stats = {"requested": 0, "cache_hits": 0, "embedded": 0}
+
+    def _embed_missing(self, texts):
+        batches = [texts[i : i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        if len(batches) <= 1 or self.concurrency <= 1:
+            return [vec for batch in batches for vec in self.inner.embed_documents(batch)]
+
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(batches))) as pool:
+            results = pool.map(self.inner.embed_documents, batches)
+            return [vec for batch in results for vec in batch]
+
+    def embed_documents(self, texts):
+        keys = [text_key(t) for t in texts]
+        self.stats["requested"] += len(texts)
+
+        vectors = self.cache.get_many(self.model_name, set(keys)) if self.cache is not None else {}
+        self.stats["cache_hits"] += sum(1 for k in keys if k in vectors)
+
+        # unique texts that still need embedding, in first-seen order
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors and key not in missing:
+                missing[key] = text
+
+        if missing:
+            embedded = dict(zip(missing, self._embed_missing(list(missing.values()))))
+            self.stats["embedded"] += len(embedded)
+            if self.cache is not None:
+                self.cache.put_many(self.model_name, embedded)
+            vectors.update(embedded)
+            logging.info(
+                f"Embedded {len(embedded)} texts ({len(texts) - len(embedded)} served from cache)"
+            )
+
+        return [vectors[k] for k in keys]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+class HashEmbeddings(Embeddings):
+    '''
+    Deterministic local stand-in embedder for tests and benchmarks: hashes word
+    unigrams and bigrams into a fixed-size, L2-normalized vector. No model or
+    network needed, and texts sharing words end up close to each other.
+    '''
+
+    def __init__(self, dim=256):
+        self.dim = dim
+
+    def _embed(self, text):
+        vec = [0.0] * self.dim
+        words = re.findall(r"\w+", text.lower())
+        for gram in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+            h = int.from_bytes(hashlib.md5(gram.encode()).digest()[:8], "little")
+            vec[h % self.dim] += 1.0 if (h >> 63) & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+        return [v / norm for v in vec]
+
+    def embed_documents(self, texts):
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
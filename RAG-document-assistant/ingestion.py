@@ -0,0 +1,344 @@
+'''Incremental, hash-tracked, parallel ingestion of source documents into the vector store'''
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+MANIFEST_NAME = "ingest_manifest.json"
+MANIFEST_VERSION = 1
+EMBED_BATCH_SIZE = 64
+SOURCE_PATTERNS = ("*.pdf",)
+
+
+def discover_sources(path_or_glob, patterns=SOURCE_PATTERNS):
+    '''Expand a directory (searched recursively) or a glob pattern into sorted file paths'''
+
+    if os.path.isdir(path_or_glob):
+        found = set()
+        for pattern in patterns:
+            found.update(glob.glob(os.path.join(path_or_glob, "**", pattern), recursive=True))
+        return sorted(found)
+    return sorted(p for p in glob.glob(path_or_glob, recursive=True) if os.path.isfile(p))
+
+
+def load_and_chunk_pdf(path, chunking):
+    '''
+    Load one PDF and split it into chunks. Runs inside worker processes, so it
+    imports its dependencies lazily and returns (path, page_count, chunks).
+    chunking["splitter"] is "recursive" (fixed-size windows) or "structured"
+    (section-aware, see chunking.py).
+    '''
+
+    if chunking.get("splitter") == "structured":
+        from chunking import load_and_chunk_structured
+
+        pages, chunks = load_and_chunk_structured(
+            path, chunking["chunk_size"], chunking["chunk_overlap"]
+        )
+        return path, pages, chunks
+
+    from langchain_community.document_loaders import PyMuPDFLoader
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    pages = PyMuPDFLoader(path).load()
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunking["chunk_size"], chunk_overlap=chunking["chunk_overlap"]
+    )
+    return path, len(pages), splitter.split_documents(pages)
+
+
+def file_hash(path, block_size=1 << 20):
+    '''SHA-256 of a file's bytes'''
+
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def chunk_ids_for(source, doc_hash, count):
+    '''Stable vector ids for the chunks of one document version'''
+
+    prefix = hashlib.sha1(source.encode()).hexdigest()[:8] + doc_hash[:12]
+    return [f"{prefix}-{i}" for i in range(count)]
+
+
+class IngestManifest:
+    '''
+    Records, per source document, its content hash, the chunking parameters used
+    and the ids of the vectors it produced. Persisted as JSON next to the vector store.
+    '''
+
+    def __init__(self, path, chunking):
+        self.path = path
+        self.chunking = dict(chunking)
+        self.documents = {}
+        self.exists = False
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable ingest manifest {self.path}: {e}")
+            return
+
+        self.exists = True
+        if data.get("version") != MANIFEST_VERSION or data.get("chunking") != self.chunking:
+            # Chunking changed: every document has to be re-chunked and re-embedded,
+            # but keep the old ids so their vectors can be deleted.
+            logging.info("Chunking parameters changed; all documents will be re-ingested")
+            self.documents = {
+                src: {"hash": None, "chunk_ids": entry.get("chunk_ids", [])}
+                for src, entry in data.get("documents", {}).items()
+            }
+        else:
+            self.documents = data.get("documents", {})
+
+    def is_current(self, source, doc_hash):
+        entry = self.documents.get(source)
+        return entry is not None and entry.get("hash") == doc_hash
+
+    def corpus_version(self):
+        '''Fingerprint of the ingested corpus (documents + chunking); changes on any re-ingest'''
+
+        h = hashlib.sha256(json.dumps(self.chunking, sort_keys=True).encode())
+        for source in sorted(self.documents):
+            h.update(source.encode())
+            h.update(str(self.documents[source].get("hash")).encode())
+        return h.hexdigest()[:16]
+
+    def save(self):
+        '''Atomically write the manifest'''
+
+        data = {
+            "version": MANIFEST_VERSION,
+            "chunking": self.chunking,
+            "corpus_version": self.corpus_version(),
+            "documents": self.documents,
+        }
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, self.path)
+        self.exists = True
+
+
+class _BatchWriter:
+    '''
+    Streams chunks to the vector store in fixed-size batches across document
+    boundaries. A document is recorded in the manifest only once all of its
+    chunks have been written.
+    '''
+
+    def __init__(self, vector_db, manifest, batch_size):
+        self.vector_db = vector_db
+        self.manifest = manifest
+        self.batch_size = batch_size
+        self.docs = []
+        self.ids = []
+        self.pending = []  # [source, manifest entry, chunks still buffered]
+
+    def add(self, source, entry, chunks, ids):
+        self.pending.append([source, entry, len(chunks)])
+        self.docs.extend(chunks)
+        self.ids.extend(ids)
+        while len(self.docs) >= self.batch_size:
+            self._flush(self.batch_size)
+        self._commit()
+
+    def close(self):
+        while self.docs:
+            self._flush(self.batch_size)
+        self._commit()
+
+    def _flush(self, n):
+        batch, self.docs = self.docs[:n], self.docs[n:]
+        batch_ids, self.ids = self.ids[:n], self.ids[n:]
+        self.vector_db.add_documents(batch, ids=batch_ids)
+
+        written = len(batch)
+        for doc in self.pending:
+            take = min(doc[2], written)
+            doc[2] -= take
+            written -= take
+            if not written:
+                break
+
+    def _commit(self):
+        done = 0
+        while done < len(self.pending) and self.pending[done][2] == 0:
+            source, entry, _ = self.pending[done]
+            self.manifest.documents[source] = entry
+            done += 1
+        if done:
+            del self.pending[:done]
+            self.manifest.save()
+
+
+def _chunk_documents(sources, chunk_fn, workers):
+    '''
+    Yield (source, page_count, chunks, error) for each source, loading and chunking
+    in a process pool. At most 2 * workers documents are in flight so the corpus is
+    never held in memory at once. Results arrive in completion order. A document
+    that fails to load (corrupt or unreadable file) is yielded with its exception
+    as `error` instead of aborting the rest of the corpus.
+    '''
+
+    if workers <= 1 or len(sources) <= 1:
+        for source in sources:
+            try:
+                _, pages, chunks = chunk_fn(source)
+            except Exception as e:
+                yield source, 0, None, e
+            else:
+                yield source, pages, chunks, None
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        queue = iter(sources)
+        in_flight = {}
+        for source in queue:
+            in_flight[pool.submit(chunk_fn, source)] = source
+            if len(in_flight) >= 2 * workers:
+                break
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                source = in_flight.pop(future)
+                try:
+                    _, pages, chunks = future.result()
+                except Exception as e:
+                    yield source, 0, None, e
+                else:
+                    yield source, pages, chunks, None
+                nxt = next(queue, None)
+                if nxt is not None:
+                    in_flight[pool.submit(chunk_fn, nxt)] = nxt
+
+
+def sync_vector_store(vector_db, sources, chunk_fn, manifest, workers=None,
+                      batch_size=EMBED_BATCH_SIZE):
+    '''
+    Bring the vector store in line with `sources`, embedding only what changed.
+
+    - unchanged documents (same hash + chunking) are skipped
+    - new/changed documents are loaded and chunked in a process pool with
+      chunk_fn(path) -> (path, page_count, chunks); chunk_fn must be picklable
+    - chunks are streamed to the store in batches of `batch_size` with stable ids
+    - vectors of changed or removed documents are deleted by id
+    - documents that can't be read or parsed are logged and listed under "failed";
+      their manifest entry (and vectors) stay as they were, so they're retried next run
+
+    Returns a summary dict of what was done, including pages/sec and chunks/sec.
+    '''
+
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    summary = {"added": [], "updated": [], "removed": [], "unchanged": [], "failed": [],
+               "pages": 0, "chunks_embedded": 0}
+
+    if not manifest.exists:
+        # A store built before the manifest existed has ids we can't track: start clean
+        stale = vector_db.get(include=[])["ids"]
+        if stale:
+            logging.info(f"No ingest manifest found; clearing {len(stale)} untracked vectors")
+            vector_db.delete(ids=stale)
+
+    sources = [os.path.normpath(s) for s in sources]
+    current = set(sources)
+
+    for source in sorted(set(manifest.documents) - current):
+        old_ids = manifest.documents.pop(source).get("chunk_ids", [])
+        if old_ids:
+            vector_db.delete(ids=old_ids)
+        summary["removed"].append(source)
+        logging.info(f"Removed {source} ({len(old_ids)} chunks)")
+    if summary["removed"]:
+        manifest.save()
+
+    hashes = {}
+    for source in sources:
+        try:
+            doc_hash = file_hash(source)
+        except OSError as e:
+            logging.error(f"Skipping unreadable {source}: {e}")
+            summary["failed"].append(source)
+            continue
+        if manifest.is_current(source, doc_hash):
+            summary["unchanged"].append(source)
+        else:
+            hashes[source] = doc_hash
+
+    writer = _BatchWriter(vector_db, manifest, batch_size)
+    for source, pages, chunks, error in _chunk_documents(list(hashes), chunk_fn, workers):
+        if error is not None:
+            logging.error(f"Skipping {source}, failed to load: {error!r}")
+            summary["failed"].append(source)
+            continue
+        doc_hash = hashes[source]
+        chunks = chunks or []
+        ids = chunk_ids_for(source, doc_hash, len(chunks))
+        for i, chunk in enumerate(chunks):
+            chunk.metadata["source_hash"] = doc_hash
+            chunk.metadata["chunk_index"] = i
+
+        old_ids = manifest.documents.get(source, {}).get("chunk_ids", [])
+        if old_ids:
+            vector_db.delete(ids=old_ids)
+
+        summary["updated" if source in manifest.documents else "added"].append(source)
+        summary["pages"] += pages
+        summary["chunks_embedded"] += len(chunks)
+        writer.add(source, {"hash": doc_hash, "chunk_ids": ids}, chunks, ids)
+        logging.info(f"Chunked {source}: {pages} pages, {len(chunks)} chunks")
+    writer.close()
+
+    if not manifest.exists:
+        manifest.save()
+
+    elapsed = time.perf_counter() - started
+    summary["seconds"] = round(elapsed, 3)
+    summary["pages_per_sec"] = round(summary["pages"] / elapsed, 2) if elapsed else 0.0
+    summary["chunks_per_sec"] = round(summary["chunks_embedded"] / elapsed, 2) if elapsed else 0.0
+
+    logging.info(
+        f"Ingestion sync: {len(summary['added'])} added, {len(summary['updated'])} updated, "
+        f"{len(summary['removed'])} removed, {len(summary['unchanged'])} unchanged, "
+        f"{len(summary['failed'])} failed, "
+        f"{summary['chunks_embedded']} chunks embedded in {summary['seconds']}s "
+        f"({summary['pages_per_sec']} pages/s, {summary['chunks_per_sec']} chunks/s)"
+    )
+    return summary
+
+
+def main():
+    '''CLI: python ingestion.py [DIR_OR_GLOB] [--workers N]'''
+
+    import argparse
+    import rag
+
+    parser = argparse.ArgumentParser(description="Incrementally ingest a document corpus")
+    parser.add_argument("corpus", nargs="?", default=rag.data_dir, help="directory or glob of PDFs")
+    parser.add_argument("--workers", type=int, default=None, help="loader/chunker processes")
+    args = parser.parse_args()
+
+    summary = rag.sync_corpus(rag.open_vector_db(), args.corpus, workers=args.workers)
+    if summary is not None:
+        print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+'''Compact vector backend: int8 vectors memory-mapped from disk with an exact float32 rerank'''
+
+import glob
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+
+SCAN_BLOCK_ROWS = 8192
+
+
+def quantize(vectors):
+    '''Symmetric per-row int8 quantization: returns (codes, scales) with v ≈ codes * scale'''
+
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class QuantizedVectorStore(VectorStore):
+    '''
+    Cosine-similarity vector store kept as three append-only files per generation:
+
+    - codes.<gen>.i8    int8 vectors (1 byte per dimension), scanned for the shortlist
+    - scales.<gen>.f32  one float32 scale per row
+    - vectors.<gen>.f32 L2-normalized float32 vectors, read only for the shortlist rerank
+
+    All three are memory-mapped, so the process holds no vector data of its own and
+    the OS page cache keeps only the int8 codes hot. Chunk texts, metadata and the
+    id -> row mapping live in SQLite. Deletes drop the SQLite row and leave a dead
+    row in the files; persist() compacts the files into a new generation once the
+    dead fraction reaches `compact_ratio`.
+    '''
+
+    def __init__(self, embedding_function, persist_directory, oversample=8, min_shortlist=32,
+                 compact_ratio=0.2):
+        self._embedding = embedding_function
+        self.persist_directory = persist_directory
+        self.oversample = oversample
+        self.min_shortlist = min_shortlist
+        self.compact_ratio = compact_ratio
+        os.makedirs(persist_directory, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            os.path.join(persist_directory, "store.sqlite"), check_same_thread=False
+        )
+        self._conn.executescript(
+            """CREATE TABLE IF NOT EXISTS chunks (
+                row INTEGER PRIMARY KEY,
+                id TEXT NOT NULL UNIQUE,
+                text TEXT NOT NULL,
+                metadata TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);"""
+        )
+        self._conn.commit()
+        self.generation = int(self._meta("generation", 0))
+        dim = self._meta("dim")
+        self.dim = int(dim) if dim is not None else None
+        self._remove_stale_generations()
+        self._open_files()
+
+    @property
+    def embeddings(self):
+        return self._embedding
+
+    def _meta(self, key, default=None):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key, value):
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def _path(self, name, generation=None):
+        generation = self.generation if generation is None else generation
+        return os.path.join(self.persist_directory, name.replace(".", f".{generation}.", 1))
+
+    def _remove_stale_generations(self):
+        current = {self._path(n) for n in ("codes.i8", "scales.f32", "vectors.f32")}
+        for pattern in ("codes.*.i8", "scales.*.f32", "vectors.*.f32"):
+            for path in glob.glob(os.path.join(self.persist_directory, pattern)):
+                if path not in current:
+                    os.remove(path)
+
+    def _open_files(self):
+        '''Memory-map the current generation, dropping rows a crash left half-written'''
+
+        self.rows = 0
+        if self.dim:
+            sizes = [
+                os.path.getsize(p) // width if os.path.exists(p) else 0
+                for p, width in (
+                    (self._path("codes.i8"), self.dim),
+                    (self._path("scales.f32"), 4),
+                    (self._path("vectors.f32"), self.dim * 4),
+                )
+            ]
+            self.rows = min(sizes)
+            for name, width in (("codes.i8", self.dim), ("scales.f32", 4), ("vectors.f32", self.dim * 4)):
+                path = self._path(name)
+                if os.path.exists(path) and os.path.getsize(path) != self.rows * width:
+                    os.truncate(path, self.rows * width)
+
+        self._map_files()
+        self._live = np.zeros(self.rows, dtype=bool)
+        live_rows = [r for (r,) in self._conn.execute("SELECT row FROM chunks")]
+        live_rows = [r for r in live_rows if r < self.rows]
+        self._live[live_rows] = True
+        # rows that point past the files (interrupted append) are not searchable
+        self._conn.execute("DELETE FROM chunks WHERE row >= ?", (self.rows,))
+        self._conn.commit()
+
+    def _map_files(self):
+        if self.rows:
+            self._codes = np.memmap(self._path("codes.i8"), np.int8, "r", shape=(self.rows, self.dim))
+            self._scales = np.memmap(self._path("scales.f32"), np.float32, "r", shape=(self.rows,))
+            self._vectors = np.memmap(
+                self._path("vectors.f32"), np.float32, "r", shape=(self.rows, self.dim)
+            )
+        else:
+            self._codes = self._scales = self._vectors = None
+
+    def __len__(self):
+        return int(self._live.sum())
+
+    def add_texts(self, texts, metadatas=None, *, ids=None, **kwargs):
+        texts = list(texts)
+        if not texts:
+            return []
+        metadatas = metadatas or [{} for _ in texts]
+        ids = ids or [os.urandom(16).hex() for _ in texts]
+        vectors = normalize(self._embedding.embed_documents(texts))
+        codes, scales = quantize(vectors)
+
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                self._set_meta("dim", self.dim)
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding dimension {vectors.shape[1]} != store dimension {self.dim}")
+
+            self._delete_ids(ids)
+            start = self.rows
+            # vectors first, then the rows that point at them: a crash in between
+            # leaves unreferenced rows that _open_files trims
+            for name, data in (("codes.i8", codes), ("scales.f32", scales), ("vectors.f32", vectors)):
+                with open(self._path(name), "ab") as f:
+                    f.write(data.tobytes())
+            self._conn.executemany(
+                "INSERT INTO chunks (row, id, text, metadata) VALUES (?, ?, ?, ?)",
+                [
+                    (start + i, doc_id, text, json.dumps(meta or {}))
+                    for i, (doc_id, text, meta) in enumerate(zip(ids, texts, metadatas))
+                ],
+            )
+            self._conn.commit()
+            self.rows += len(texts)
+            self._live = np.concatenate([self._live, np.ones(len(texts), dtype=bool)])
+            self._map_files()
+        return list(ids)
+
+    def _delete_ids(self, ids):
+        rows = []
+        for i in range(0, len(ids), 500):
+            batch = list(ids[i : i + 500])
+            marks = ",".join("?" * len(batch))
+            rows += [r for (r,) in self._conn.execute(f"SELECT row FROM chunks WHERE id IN ({marks})", batch)]
+            self._conn.execute(f"DELETE FROM chunks WHERE id IN ({marks})", batch)
+        if rows:
+            self._live[[r for r in rows if r < len(self._live)]] = False
+        return len(rows)
+
+    def delete(self, ids=None, **kwargs):
+        if not ids:
+            return False
+        with self._lock:
+            deleted = self._delete_ids(list(ids))
+            self._conn.commit()
+        return bool(deleted)
+
+    def get(self, ids=None, include=("documents", "metadatas")):
+        '''Chroma-style get: {"ids": [...], "documents": [...], "metadatas": [...]}'''
+
+        with self._lock:
+            if ids is None:
+                rows = self._conn.execute("SELECT id, text, metadata FROM chunks ORDER BY row").fetchall()
+            else:
+                marks = ",".join("?" * len(ids))
+                rows = self._conn.execute(
+                    f"SELECT id, text, metadata FROM chunks WHERE id IN ({marks}) ORDER BY row", list(ids)
+                ).fetchall() if ids else []
+        result = {"ids": [r[0] for r in rows]}
+        if "documents" in include:
+            result["documents"] = [r[1] for r in rows]
+        if "metadatas" in include:
+            result["metadatas"] = [json.loads(r[2]) for r in rows]
+        return result
+
+    def _shortlist(self, query, size):
+        '''Approximate top rows from the int8 codes, scanned in blocks to bound memory'''
+
+        scores = np.empty(self.rows, dtype=np.float32)
+        for start in range(0, self.rows, SCAN_BLOCK_ROWS):
+            end = min(start + SCAN_BLOCK_ROWS, self.rows)
+            scores[start:end] = (self._codes[start:end].astype(np.float32) @ query) * self._scales[start:end]
+        scores[~self._live] = -np.inf
+        size = min(size, int(self._live.sum()))
+        if size <= 0:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.argpartition(-scores, size - 1)[:size])
+
+    def similarity_search_by_vector_with_score(self, embedding, k=4):
+        query = normalize(embedding)
+        with self._lock:
+            if not self.rows:
+                return []
+            shortlist = self._shortlist(query, max(k * self.oversample, self.min_shortlist))
+            if not len(shortlist):
+                return []
+            exact = self._vectors[shortlist] @ query
+            order = np.argsort(-exact)[:k]
+            hits = [(int(shortlist[i]), float(exact[i])) for i in order]
+            marks = ",".join("?" * len(hits))
+            found = {
+                row: (text, meta)
+                for row, text, meta in self._conn.execute(
+                    f"SELECT row, text, metadata FROM chunks WHERE row IN ({marks})",
+                    [row for row, _ in hits],
+                )
+            }
+        return [
+            (Document(page_content=found[row][0], metadata=json.loads(found[row][1])), score)
+            for row, score in hits
+            if row in found
+        ]
+
+    def similarity_search_with_score(self, query, k=4, **kwargs):
+        return self.similarity_search_by_vector_with_score(self._embedding.embed_query(query), k)
+
+    def similarity_search_by_vector(self, embedding, k=4, **kwargs):
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k)]
+
+    def similarity_search(self, query, k=4, **kwargs):
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    def _select_relevance_score_fn(self):
+        return lambda score: (score + 1.0) / 2.0
+
+    def compact(self):
+        '''Rewrite the live rows into a new file generation and renumber them'''
+
+        with self._lock:
+            live_rows = np.flatnonzero(self._live)
+            if len(live_rows) == self.rows:
+                return 0
+            new_gen = self.generation + 1
+            for name, source in (("codes.i8", self._codes), ("scales.f32", self._scales),
+                                 ("vectors.f32", self._vectors)):
+                with open(self._path(name, new_gen), "wb") as f:
+                    for start in range(0, len(live_rows), SCAN_BLOCK_ROWS):
+                        f.write(np.ascontiguousarray(source[live_rows[start : start + SCAN_BLOCK_ROWS]]).tobytes())
+
+            # ascending order never collides: a row only moves to a lower, already freed number
+            self._conn.executemany(
+                "UPDATE chunks SET row = ? WHERE row = ?",
+                [(new, int(old)) for new, old in enumerate(live_rows) if new != old],
+            )
+            self._set_meta("generation", new_gen)
+            self._conn.commit()
+            dropped = self.rows - len(live_rows)
+            self._codes = self._scales = self._vectors = None
+            self.generation = new_gen
+            self._remove_stale_generations()
+            self._open_files()
+        logging.info(f"Quantized store compacted: dropped {dropped} dead rows, {len(self)} live")
+        return dropped
+
+    def persist(self):
+        '''Compact once enough rows are dead; everything else is already on disk'''
+
+        with self._lock:
+            dead = self.rows - len(self)
+        if self.rows and dead / self.rows >= self.compact_ratio:
+            self.compact()
+
+    def footprint(self):
+        '''Bytes on disk per component; only "codes" + "scales" are scanned per query'''
+
+        sizes = {
+            "codes": self.rows * (self.dim or 0),
+            "scales": self.rows * 4,
+            "vectors": self.rows * (self.dim or 0) * 4,
+            "metadata": os.path.getsize(os.path.join(self.persist_directory, "store.sqlite")),
+        }
+        sizes["total"] = sum(sizes.values())
+        return sizes
+
+    @classmethod
+    def from_texts(cls, texts, embedding, metadatas=None, *, ids=None, persist_directory=None, **kwargs):
+        store = cls(embedding, persist_directory, **kwargs)
+        store.add_texts(texts, metadatas, ids=ids)
+        return store
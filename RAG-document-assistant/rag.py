@@ -1,26 +1,63 @@
 # imports
+import hashlib
+import json
 import logging
 import ollama
 import os
+import time
+from functools import lru_cache, partial
 import streamlit as st
 from langchain_community.document_loaders import PyMuPDFLoader  #Langchain PDF loader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import Chroma 
 from langchain_ollama import OllamaEmbeddings
-from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
-from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import PromptTemplate
 from langchain_ollama import ChatOllama
 from langchain_core.runnables import RunnablePassthrough
-from langchain.retrievers import MultiQueryRetriever
+from embeddings import CachedEmbeddings
+from quantized_store import QuantizedVectorStore
+from answer_cache import AnswerCache
+from bm25 import BM25Index, MirroredStore
+from rerank import ContextReranker, CrossEncoderScorer, LexicalScorer
+from retrieval import FusionRetriever, HybridRetriever
+from answering import ANSWER_TEMPLATE, create_answer_chain, format_docs, retrieve_context, stream_answer
+from ingestion import (
+    IngestManifest,
+    MANIFEST_NAME,
+    discover_sources,
+    load_and_chunk_pdf,
+    sync_vector_store,
+)
 
 
 logging.basicConfig(level=logging.INFO)
 
 doc_path = "./data/1706.03762v7.pdf"
+data_dir = "./data"
 model_name = "llama3.2"
 embedding_model = "nomic-embed-text"
 vector_store_name = "simple-rag"
 persist_directory = "./chroma_db"
+vector_backend = "chroma"  # "chroma" | "quantized" (int8 memory-mapped index + float rerank)
+quantized_store_dir = os.path.join(persist_directory, "quantized")
+chunk_splitter = "recursive"  # "recursive" | "structured" (section-aware, see chunking.py)
+chunk_size = 1000
+chunk_overlap = 300
+structured_chunk_overlap = 100  # structured chunks only overlap by trailing sentences
+embedding_cache_path = os.path.join(persist_directory, "embedding_cache.sqlite")
+embed_batch_size = 32
+embed_concurrency = 4
+retrieval_k = 4  # per-rephrasing search depth when the question is expanded
+rerank_candidates = 12  # chunks handed from the retriever to the reranker (and the dense search depth)
+reranker_kind = "lexical"  # "lexical" | "cross-encoder" (sentence-transformers, local)
+context_top_n = 4
+context_token_budget = 1500
+query_expansion = "auto"  # "always" | "never" | "auto" (skip LLM rephrasing for short questions)
+retriever_mode = "multi_query"  # "multi_query" | "hybrid" (BM25 + vector, no LLM round-trip)
+bm25_index_path = os.path.join(persist_directory, "bm25_index.json")
+answer_cache_path = os.path.join(persist_directory, "answer_cache.sqlite")
+answer_cache_threshold = 0.93  # cosine similarity for a semantic cache hit
+llm_keep_alive = "30m"
 
 def ingest_pdf(doc_path):
     '''Ingesting PDF document'''
@@ -37,52 +74,122 @@ def ingest_pdf(doc_path):
 def split_document_to_chunks(document):
     '''Chunking'''
 
-    text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=300)
+    text_splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
     chunks = text_splitter.split_documents(document)
     logging.info("Documents split into chunks")
     return chunks
+
+def chunking_params():
+    '''Chunking configuration recorded in the ingestion manifest'''
+
+    if chunk_splitter == "structured":
+        return {"splitter": "structured", "chunk_size": chunk_size, "chunk_overlap": structured_chunk_overlap}
+    return {"splitter": "recursive", "chunk_size": chunk_size, "chunk_overlap": chunk_overlap}
+
+def create_embeddings():
+    '''Ollama embeddings behind a batched, persistently cached wrapper'''
+
+    return CachedEmbeddings(
+        OllamaEmbeddings(model=embedding_model),
+        model_name=embedding_model,
+        cache_path=embedding_cache_path,
+        batch_size=embed_batch_size,
+        concurrency=embed_concurrency,
+    )
+
+def store_directory():
+    '''Directory of the configured vector backend; each backend keeps its own manifest'''
+
+    return quantized_store_dir if vector_backend == "quantized" else persist_directory
+
+def manifest_path():
+    return os.path.join(store_directory(), MANIFEST_NAME)
+
+def open_vector_db():
+    '''Open (or create) the persistent vector store for the configured vector_backend'''
+
+    if vector_backend == "quantized":
+        return QuantizedVectorStore(create_embeddings(), quantized_store_dir)
+    return Chroma(
+        embedding_function=create_embeddings(),
+        collection_name=vector_store_name,
+        persist_directory=persist_directory,
+    )
+
+def sync_corpus(vector_db, corpus=data_dir, workers=None):
+    '''Incrementally ingest a directory or glob of documents into vector_db'''
+
+    sources = discover_sources(corpus)
+    if not sources:
+        logging.error(f"No PDF files found in: {corpus}")
+        return None
+
+    manifest = IngestManifest(manifest_path(), chunking_params())
+    lexical_index = load_bm25_index()
+    if manifest.exists and lexical_index.corpus_version != manifest.corpus_version():
+        lexical_index.rebuild_from(vector_db)
+
+    chunk_fn = partial(load_and_chunk_pdf, chunking=chunking_params())
+    store = MirroredStore(vector_db, lexical_index)
+    summary = sync_vector_store(store, sources, chunk_fn, manifest, workers=workers)
+    if summary["chunks_embedded"] or summary["removed"]:
+        vector_db.persist()
+        logging.info("Vector Database updated and persisted")
+    else:
+        logging.info("Loaded existing vector database (no document changes)")
+    lexical_index.save(manifest.corpus_version())
+    return summary
+
+@st.cache_resource
+def load_bm25_index():
+    '''BM25 index persisted alongside the vector store'''
+
+    return BM25Index(bm25_index_path)
+
+@lru_cache(maxsize=None)
+def ensure_model(name):
+    '''Pull an Ollama model only if it isn't available locally (checked once per process)'''
+
+    try:
+        ollama.show(name)
+        return False
+    except ollama.ResponseError:
+        logging.info(f"Pulling missing model: {name}")
+        ollama.pull(name)
+        return True
     
 @st.cache_resource
 def create_vdb():
-    '''Create/Load Vector DB with embeddings'''
-    
-    ollama.pull(embedding_model)
-    embedding = OllamaEmbeddings(model=embedding_model)
-    rebuild_db = False
-    if os.path.exists(persist_directory):
-        try:
-            vector_db = Chroma(
-                embedding_function=embedding,
-                collection_name=vector_store_name,
-                persist_directory=persist_directory,
-            )
-            logging.info("Loaded existing vector database")
-        except Exception as e:
-            logging.warning(f"Failed to load existing DB: {e}")
-            rebuild_db = True
-    else:
-        rebuild_db = True
-
-    if rebuild_db:
-        data = ingest_pdf(doc_path)
-        if data is None:
-            return None
-
-        chunks = split_document_to_chunks(data)
-        vector_db = Chroma.from_documents(
-            documents=chunks,
-            embedding=embedding,
-            collection_name=vector_store_name,
-            persist_directory=persist_directory,
-        )
-        vector_db.persist()
-        logging.info("Vector Database created and persisted")
+    '''
+    Create/Load Vector DB and incrementally sync it with the documents in data_dir.
+    Raises on failure: st.cache_resource doesn't cache exceptions, so the next rerun retries.
+    '''
+
+    ensure_model(embedding_model)
+    try:
+        vector_db = open_vector_db()
+    except Exception as e:
+        logging.error(f"Failed to open vector database: {e}")
+        raise
+
+    if sync_corpus(vector_db) is None:
+        raise FileNotFoundError(f"No PDF files found in: {data_dir}")
 
     return vector_db
 
 
 def create_retriever(vdb,llm):
-    '''Creating a Multi Query Retriever'''
+    '''Creating the retriever for the configured retriever_mode'''
+
+    if retriever_mode == "hybrid":
+        retriever = HybridRetriever(
+            vector_retriever=vdb.as_retriever(search_kwargs={"k": rerank_candidates}),
+            lexical_index=load_bm25_index(),
+            top_k=rerank_candidates,
+            candidates=rerank_candidates,
+        )
+        logging.info("Hybrid Retriever Created")
+        return retriever
 
     query_prompt = PromptTemplate(
     input_variables=["question"],
@@ -96,25 +203,136 @@ def create_retriever(vdb,llm):
     Original questions: {question}
     """
     )   
-    retriever = MultiQueryRetriever.from_llm(vdb.as_retriever(), llm, prompt=query_prompt)
+    retriever = FusionRetriever(
+        base_retriever=vdb.as_retriever(search_kwargs={"k": rerank_candidates}),
+        variant_retriever=vdb.as_retriever(search_kwargs={"k": retrieval_k}),
+        llm=llm,
+        query_prompt=query_prompt,
+        expansion_mode=query_expansion,
+        top_k=rerank_candidates,
+    )
     logging.info("Retriever Created")
     return retriever
 
 def create_chain(retriever, llm):
     '''Creating Chain'''
 
-    template = """Answer the question based ONLY on the following {context}
-    Question: {question}"""
-    prompt = ChatPromptTemplate.from_template(template)
     chain = (
-        {"context": retriever, "question": RunnablePassthrough()}
-        | prompt
-        | llm   
-        | StrOutputParser()
+        {"context": retriever | format_docs, "question": RunnablePassthrough()}
+        | create_answer_chain(llm)
     )
     logging.info("Chain created")
     return chain
 
+def create_reranker():
+    '''Rerank stage that trims retrieved chunks to the top-N within the context token budget'''
+
+    scorer = CrossEncoderScorer() if reranker_kind == "cross-encoder" else LexicalScorer()
+    return ContextReranker(scorer, top_n=context_top_n, token_budget=context_token_budget)
+
+def render_sources(docs):
+    '''Show the retrieved chunks (source, page and a snippet) while the answer is generated'''
+
+    with st.expander(f"Sources ({len(docs)} chunks)"):
+        for doc in docs:
+            meta = doc.metadata or {}
+            source = os.path.basename(str(meta.get("source", "unknown")))
+            page = meta.get("page")
+            label = f"{source} p.{page + 1}" if isinstance(page, int) else source
+            if meta.get("section"):
+                label += f" · {meta['section']}"
+            snippet = " ".join(doc.page_content.split())
+            st.markdown(f"**{label}** — {snippet[:300]}{'…' if len(snippet) > 300 else ''}")
+
+_corpus_version = {}
+
+def current_corpus_version():
+    '''Corpus version from the ingestion manifest, re-read only when the manifest changes'''
+
+    path = manifest_path()
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    if _corpus_version.get("mtime") != mtime:
+        _corpus_version["mtime"] = mtime
+        _corpus_version["version"] = IngestManifest(path, chunking_params()).corpus_version()
+    return _corpus_version["version"]
+
+def answer_cache_version():
+    '''
+    Version key for the answer cache: the corpus version plus every setting that
+    shapes an answer, so changing the model, prompt, retriever or reranker also
+    invalidates cached answers
+    '''
+
+    corpus = current_corpus_version()
+    if corpus is None:
+        return None
+    settings = {
+        "model": model_name,
+        "prompt": ANSWER_TEMPLATE,
+        "retriever_mode": retriever_mode,
+        "query_expansion": query_expansion,
+        "retrieval_k": retrieval_k,
+        "rerank_candidates": rerank_candidates,
+        "reranker_kind": reranker_kind,
+        "context_top_n": context_top_n,
+        "context_token_budget": context_token_budget,
+    }
+    h = hashlib.sha256(json.dumps([corpus, settings], sort_keys=True).encode())
+    return h.hexdigest()[:16]
+
+def warm_up(vector_db):
+    '''Load the chat model, embedding model and vector index into memory ahead of the first question'''
+
+    try:
+        # An empty prompt only loads the model; keep_alive keeps it resident between questions
+        ollama.generate(model=model_name, prompt="", keep_alive=llm_keep_alive)
+        vector_db.similarity_search("warm-up", k=1)
+    except Exception as e:
+        logging.warning(f"Warm-up failed: {e}")
+
+@st.cache_resource
+def load_pipeline():
+    '''LLM client, vector DB, retriever and answer chain, built and warmed up once per process'''
+
+    startup = {}
+    start = time.perf_counter()
+    vector_db = create_vdb()
+    startup["vector_db"] = time.perf_counter() - start
+
+    llm = ChatOllama(model=model_name, keep_alive=llm_keep_alive)
+    retriever = create_retriever(vector_db, llm)
+    answer_chain = create_answer_chain(llm)
+    reranker = create_reranker()
+    answer_cache = AnswerCache(
+        answer_cache_path,
+        vector_db.embeddings,
+        answer_cache_version(),
+        threshold=answer_cache_threshold,
+    )
+
+    step = time.perf_counter()
+    warm_up(vector_db)
+    startup["warm_up"] = time.perf_counter() - step
+    startup["total"] = time.perf_counter() - start
+    logging.info(
+        "Cold start %.2fs (vector db %.2fs, warm-up %.2fs)",
+        startup["total"], startup["vector_db"], startup["warm_up"],
+    )
+
+    return {
+        "llm": llm,
+        "vector_db": vector_db,
+        "retriever": retriever,
+        "answer_chain": answer_chain,
+        "reranker": reranker,
+        "answer_cache": answer_cache,
+        "startup": startup,
+        "first_answer": None,
+    }
+
 # '''Inline version'''
 # def main():
 #     data = ingest_pdf(doc_path)
@@ -136,27 +354,58 @@ def main():
     '''Streamlit Version'''
 
     st.title("Document RAG Assistant")
+
+    try:
+        with st.spinner("Loading models and documents"):
+            pipeline = load_pipeline()
+    except Exception as e:
+        logging.error(f"Failed to load pipeline: {e}", exc_info=True)
+        st.error(f"Failed to load or create vector db: {str(e)}")
+        return
+
     user_input = st.text_input("Enter your question: ")
 
     if user_input:
-        with st.spinner("Generating response"):
-            try:
-                llm = ChatOllama(model=model_name)
-                vector_db = create_vdb()
-                if vector_db is None:
-                    st.error("Failed to load or create vector db")
-                    return 
-                retriever = create_retriever(vector_db, llm)
-                chain = create_chain(retriever, llm)
-
-                res = chain.invoke(input=user_input)
+        try:
+            answer_cache = pipeline["answer_cache"]
+            answer_cache.set_corpus_version(answer_cache_version())
+            cached, tier, lookup_seconds = answer_cache.lookup(user_input)
+            if cached is not None:
                 st.markdown("**Assistant**")
-                st.write(res)
-            except Exception as e:
-                st.error(f"An error occurred: {str(e)}")
+                st.write(cached)
+                st.caption(f"⚡ {tier} cache hit in {lookup_seconds * 1000:.0f} ms")
+            else:
+                question_start = time.perf_counter()
+                with st.spinner("Retrieving context"):
+                    docs, timings = retrieve_context(
+                        pipeline["retriever"], user_input, reranker=pipeline["reranker"]
+                    )
+                render_sources(docs)
+                st.markdown("**Assistant**")
+                res = st.write_stream(
+                    stream_answer(pipeline["answer_chain"], docs, user_input, timings)
+                )
+                answer_cache.store(user_input, res)
+                if pipeline["first_answer"] is None:
+                    pipeline["first_answer"] = time.perf_counter() - question_start
+                    logging.info(f"First answer latency: {pipeline['first_answer']:.2f}s")
+                st.caption(
+                    f"{timings['queries']} queries · expansion {timings['expansion']:.2f}s · "
+                    f"retrieval {timings['retrieval']:.2f}s · rerank {timings.get('rerank', 0.0):.2f}s · "
+                    f"first token {timings['first_token']:.2f}s · "
+                    f"generation {timings['generation']:.2f}s · context tokens "
+                    f"{timings.get('context_tokens_before', 0)} → {timings.get('context_tokens_after', 0)}"
+                )
+        except Exception as e:
+            st.error(f"An error occurred: {str(e)}")
     else:
                 st.info("Please enter a question to get started")
 
+    with st.sidebar:
+        st.caption(f"Cold start: {pipeline['startup']['total']:.2f}s")
+        if pipeline["first_answer"] is not None:
+            st.caption(f"First answer: {pipeline['first_answer']:.2f}s")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,136 @@
+'''Rerank stage between retriever and prompt: score, de-duplicate overlaps, trim to a token budget'''
+
+import logging
+import math
+import time
+from collections import Counter
+from difflib import SequenceMatcher
+
+from langchain_core.documents import Document
+
+from bm25 import tokenize
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+class LexicalScorer:
+    '''BM25 over the candidate set itself, blended with the retriever's own rank'''
+
+    def __init__(self, k1=1.2, b=0.75, rank_weight=0.3):
+        self.k1 = k1
+        self.b = b
+        self.rank_weight = rank_weight
+
+    def score(self, question, docs):
+        terms = set(tokenize(question))
+        doc_terms = [Counter(tokenize(d.page_content)) for d in docs]
+        n = len(docs)
+        avgdl = sum(sum(c.values()) for c in doc_terms) / max(1, n) or 1.0
+
+        lexical = []
+        for counts in doc_terms:
+            dl = sum(counts.values())
+            s = 0.0
+            for term in terms:
+                tf = counts.get(term, 0)
+                if not tf:
+                    continue
+                df = sum(1 for c in doc_terms if term in c)
+                idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+                s += idf * tf * (self.k1 + 1) / (tf + self.k1 * (1 - self.b + self.b * dl / avgdl))
+            lexical.append(s)
+
+        top = max(lexical, default=0.0) or 1.0
+        return [
+            (1 - self.rank_weight) * (s / top) + self.rank_weight / (rank + 1)
+            for rank, s in enumerate(lexical)
+        ]
+
+
+class CrossEncoderScorer:
+    '''Local cross-encoder (sentence-transformers), loaded lazily on first use'''
+
+    def __init__(self, model_name="cross-encoder/ms-marco-MiniLM-L-6-v2"):
+        self.model_name = model_name
+        self._model = None
+
+    def score(self, question, docs):
+        if self._model is None:
+            from sentence_transformers import CrossEncoder
+
+            self._model = CrossEncoder(self.model_name)
+        return [float(s) for s in self._model.predict([(question, d.page_content) for d in docs])]
+
+
+class ContextReranker:
+    '''
+    Orders candidate chunks by relevance, strips text that overlaps an already
+    selected chunk (the splitter's chunk_overlap), drops chunks that are mostly
+    duplicates, and keeps the top_n that fit within token_budget.
+    '''
+
+    def __init__(self, scorer=None, top_n=4, token_budget=1500, min_overlap_chars=80,
+                 duplicate_ratio=0.8):
+        self.scorer = scorer or LexicalScorer()
+        self.top_n = top_n
+        self.token_budget = token_budget
+        self.min_overlap_chars = min_overlap_chars
+        self.duplicate_ratio = duplicate_ratio
+
+    def _strip_overlap(self, text, selected):
+        '''Remove spans of text already present in a selected chunk'''
+
+        for kept in selected:
+            while True:
+                match = SequenceMatcher(None, kept, text, autojunk=False).find_longest_match(
+                    0, len(kept), 0, len(text)
+                )
+                if match.size < self.min_overlap_chars:
+                    break
+                text = (text[: match.b] + " " + text[match.b + match.size :]).strip()
+        return text
+
+    def rerank(self, question, docs):
+        '''Return (selected documents, stats with context tokens before/after)'''
+
+        start = time.perf_counter()
+        tokens_before = sum(estimate_tokens(d.page_content) for d in docs)
+        if not docs:
+            return [], {"rerank": 0.0, "context_tokens_before": 0, "context_tokens_after": 0}
+
+        scores = self.scorer.score(question, docs)
+        ranked = [d for _, d in sorted(zip(scores, docs), key=lambda x: x[0], reverse=True)]
+
+        selected, texts, used = [], [], 0
+        for doc in ranked:
+            if len(selected) >= self.top_n:
+                break
+            original = doc.page_content
+            text = self._strip_overlap(original, texts)
+            if len(text) < (1 - self.duplicate_ratio) * len(original):
+                continue
+            cost = estimate_tokens(text)
+            if used + cost > self.token_budget:
+                if selected:
+                    continue
+                # always keep the best chunk, truncated to the budget
+                text = text[: self.token_budget * CHARS_PER_TOKEN]
+                cost = estimate_tokens(text)
+            selected.append(Document(page_content=text, metadata=dict(doc.metadata)))
+            texts.append(original)
+            used += cost
+
+        stats = {
+            "rerank": time.perf_counter() - start,
+            "context_tokens_before": tokens_before,
+            "context_tokens_after": used,
+        }
+        logging.info(
+            f"Reranked {len(docs)} -> {len(selected)} chunks, context tokens "
+            f"{tokens_before} -> {used} ({stats['rerank'] * 1000:.0f} ms)"
+        )
+        return selected, stats
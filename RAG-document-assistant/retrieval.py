@@ -0,0 +1,184 @@
+'''Retrieval stages: parallel multi-query expansion, hybrid BM25 + vector search, rank fusion'''
+
+import hashlib
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional
+
+from langchain_core.documents import Document
+from langchain_core.language_models import BaseLanguageModel
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import BasePromptTemplate
+from langchain_core.retrievers import BaseRetriever
+
+# Query expansion modes
+EXPAND_ALWAYS = "always"
+EXPAND_NEVER = "never"
+EXPAND_AUTO = "auto"
+
+
+def doc_key(doc):
+    '''Identity of a chunk for de-duplication across result lists'''
+
+    meta = doc.metadata or {}
+    digest = hashlib.sha1(doc.page_content.encode("utf-8")).hexdigest()
+    return (meta.get("source"), meta.get("page"), digest)
+
+
+def reciprocal_rank_fusion(result_lists, k=60, limit=None, weights=None):
+    '''
+    Fuse ranked document lists: score(d) = sum over lists of weight / (k + rank).
+    Duplicates across lists are merged; returns documents by descending score.
+    '''
+
+    scores = {}
+    docs = {}
+    weights = weights or [1.0] * len(result_lists)
+    for results, weight in zip(result_lists, weights):
+        for rank, doc in enumerate(results):
+            key = doc_key(doc)
+            docs.setdefault(key, doc)
+            scores[key] = scores.get(key, 0.0) + weight / (k + rank + 1)
+
+    fused = sorted(scores, key=scores.get, reverse=True)
+    if limit is not None:
+        fused = fused[:limit]
+    return [docs[key] for key in fused]
+
+
+def parse_query_lines(text, limit):
+    '''Split LLM output into clean, unique alternative questions'''
+
+    queries = []
+    for line in text.splitlines():
+        line = re.sub(r"^\s*(?:[-*•]|\d+[.)])\s*", "", line).strip()
+        if line and line.lower() not in (q.lower() for q in queries):
+            queries.append(line)
+    return queries[:limit]
+
+
+class FusionRetriever(BaseRetriever):
+    '''
+    Multi-query retriever that runs the per-query vector searches concurrently and
+    merges them with reciprocal-rank fusion.
+
+    expansion_mode:
+      "always" - ask the LLM for `n_queries` rephrasings (like MultiQueryRetriever)
+      "never"  - search with the original question only
+      "auto"   - skip the LLM round-trip for short/specific questions
+
+    The original question is searched with base_retriever, which should return as
+    many candidates as the reranker takes; rephrasings use variant_retriever (a
+    shallower search, defaults to base_retriever) since fusion pools their results.
+    '''
+
+    base_retriever: BaseRetriever
+    variant_retriever: Optional[BaseRetriever] = None
+    llm: Optional[BaseLanguageModel] = None
+    query_prompt: Optional[BasePromptTemplate] = None
+    n_queries: int = 5
+    expansion_mode: str = EXPAND_AUTO
+    short_question_words: int = 8
+    top_k: int = 6
+    rrf_k: int = 60
+    max_workers: int = 6
+    include_original: bool = True
+
+    def should_expand(self, question):
+        if self.llm is None or self.query_prompt is None or self.expansion_mode == EXPAND_NEVER:
+            return False
+        if self.expansion_mode == EXPAND_ALWAYS:
+            return True
+        words = re.findall(r"\w+", question)
+        # Short questions, or ones pinned to exact terms (quotes), search well as-is
+        return len(words) > self.short_question_words and '"' not in question
+
+    def expand(self, question):
+        '''Alternative phrasings of the question, generated by the LLM'''
+
+        chain = self.query_prompt | self.llm | StrOutputParser()
+        return parse_query_lines(chain.invoke({"question": question}), self.n_queries)
+
+    def retrieve_with_timings(self, question):
+        '''Return (documents, timings) where timings has expansion/retrieval seconds'''
+
+        timings = {"expansion": 0.0, "retrieval": 0.0, "queries": 1}
+
+        start = time.perf_counter()
+        queries = []
+        if self.should_expand(question):
+            try:
+                queries = self.expand(question)
+            except Exception as e:
+                logging.warning(f"Query expansion failed, using the original question: {e}")
+        if self.include_original or not queries:
+            queries = [question] + [q for q in queries if q.lower() != question.lower()]
+        timings["expansion"] = time.perf_counter() - start
+        timings["queries"] = len(queries)
+
+        start = time.perf_counter()
+        if len(queries) == 1:
+            result_lists = [self.base_retriever.invoke(queries[0])]
+        else:
+            variant = self.variant_retriever or self.base_retriever
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(queries))) as pool:
+                result_lists = list(pool.map(
+                    lambda q: (self.base_retriever if q == question else variant).invoke(q), queries
+                ))
+        docs = reciprocal_rank_fusion(result_lists, k=self.rrf_k, limit=self.top_k)
+        timings["retrieval"] = time.perf_counter() - start
+
+        logging.info(
+            f"Retrieved {len(docs)} chunks for {len(queries)} queries "
+            f"(expansion {timings['expansion']:.2f}s, retrieval {timings['retrieval']:.2f}s)"
+        )
+        return docs, timings
+
+    def _get_relevant_documents(self, query: str, *, run_manager: Any = None) -> List[Document]:
+        docs, _ = self.retrieve_with_timings(query)
+        return docs
+
+
+class HybridRetriever(BaseRetriever):
+    '''
+    Sparse + dense retrieval without any LLM round-trip: BM25 over the chunk texts
+    and vector similarity search run concurrently and are merged with weighted
+    reciprocal-rank fusion.
+    '''
+
+    vector_retriever: BaseRetriever
+    lexical_index: Any
+    top_k: int = 6
+    candidates: int = 10
+    rrf_k: int = 60
+    lexical_weight: float = 1.0
+    vector_weight: float = 1.0
+
+    def retrieve_with_timings(self, question):
+        '''Return (documents, timings); expansion is always 0 in this mode'''
+
+        timings = {"expansion": 0.0, "retrieval": 0.0, "queries": 1}
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            dense = pool.submit(self.vector_retriever.invoke, question)
+            sparse = pool.submit(self.lexical_index.documents, question, self.candidates)
+            dense_docs, sparse_docs = dense.result(), sparse.result()
+
+        docs = reciprocal_rank_fusion(
+            [dense_docs, sparse_docs],
+            k=self.rrf_k,
+            limit=self.top_k,
+            weights=[self.vector_weight, self.lexical_weight],
+        )
+        timings["retrieval"] = time.perf_counter() - start
+        logging.info(
+            f"Hybrid retrieval: {len(dense_docs)} dense + {len(sparse_docs)} sparse -> "
+            f"{len(docs)} chunks in {timings['retrieval']:.2f}s"
+        )
+        return docs, timings
+
+    def _get_relevant_documents(self, query: str, *, run_manager: Any = None) -> List[Document]:
+        docs, _ = self.retrieve_with_timings(query)
+        return docs